@@ -20,6 +20,7 @@ STALE_SECONDS_ALLOWED_ACCOUNT_SUMMARY = 600
 
 IB_ERROR__NO_MARKET_PERMISSIONS = 10187
 IB_ERROR__INVALID_CONTRACT      = 200
+IB_ERROR__HISTORICAL_DATA_SERVICE = 162
 
 IB_ERROR_TYPES = {IB_ERROR__INVALID_CONTRACT: "invalid_contract", IB_ERROR__NO_MARKET_PERMISSIONS: "no market permissions"}
 IB_IS_ERROR = [IB_ERROR__INVALID_CONTRACT, IB_ERROR__NO_MARKET_PERMISSIONS]
@@ -91,6 +92,10 @@ class ibClient(object):
         self._log = log
         self.log.label(clientid=ibconnection.client_id())
         self._last_errors = dict()
+        # only recorded while async historical data requests are in flight, see
+        # start_recording_errors_by_reqid
+        self._last_errors_by_reqid = dict()
+        self._requests_recording_errors_by_reqid = 0
 
     @property
     def ib_connection(self) -> connectionIB:
@@ -130,6 +135,9 @@ class ibClient(object):
             )
             self._last_errors[contract.conId] = error_code
 
+        if self._requests_recording_errors_by_reqid > 0:
+            self._last_errors_by_reqid[reqid] = (error_code, error_string)
+
         msg = "Reqid %d: %d %s %s" % (reqid, error_code, error_string, contract_str)
 
         iserror = error_code in IB_IS_ERROR
@@ -149,6 +157,21 @@ class ibClient(object):
         else:
             return None
 
+    def start_recording_errors_by_reqid(self):
+        # we don't know the reqid until the request has finished, so record errors for
+        # every reqid while any request wants them
+        self._requests_recording_errors_by_reqid += 1
+
+    def stop_recording_errors_by_reqid(self):
+        self._requests_recording_errors_by_reqid -= 1
+        if self._requests_recording_errors_by_reqid == 0:
+            # errors for other requests won't be asked for
+            self._last_errors_by_reqid.clear()
+
+    def get_last_error_for_reqid(self, reqid: int) -> tuple:
+        # (error_code, error_string), or None
+        return self._last_errors_by_reqid.pop(reqid, None)
+
     def broker_error(self, msg, myerror_type):
         self.log.warn(msg)
 
@@ -0,0 +1,140 @@
+"""
+A token bucket model of IB's pacing rules for historical data requests, so we can have
+several requests in flight at once without pacing violations
+
+See https://interactivebrokers.github.io/tws-api/historical_limitations.html#pacing_violations
+
+For bar sizes of less than 1 minute there must be no more than 60 requests in any ten
+minute period. For larger bar sizes the limits are soft, so we just limit the average
+rate to what we used to get by waiting PACING_INTERVAL_SECONDS between requests.
+
+A token bucket with capacity C refilled at R tokens per second allows at most C + R*T
+requests in any T seconds, so we split the hard limit between the two.
+"""
+
+import asyncio
+import time
+
+from syscore.dateutils import Frequency
+from syscore.objects import named_object
+from sysbrokers.IB.client.ib_client import PACING_INTERVAL_SECONDS
+
+pacing_violation = named_object("pacing violation")
+
+MAX_SMALL_BAR_REQUESTS_IN_PERIOD = 60
+SMALL_BAR_PERIOD_SECONDS = 600
+SMALL_BAR_FREQUENCIES = [Frequency.Second, Frequency.Seconds_10]
+
+BURST_OF_REQUESTS = 10
+
+# IB allow 50, but we don't want to hog the gateway
+DEFAULT_REQUESTS_IN_FLIGHT = 6
+
+# if we get a pacing violation anyway, nothing is sent for a while
+SECONDS_TO_PAUSE_AFTER_PACING_VIOLATION = 10.0
+
+
+class tokenBucket(object):
+    """
+    Each request takes a token. Tokens are added at tokens_per_second, up to capacity.
+    """
+
+    def __init__(self, capacity: float, tokens_per_second: float, clock=time.monotonic):
+        self._capacity = capacity
+        self._tokens_per_second = tokens_per_second
+        self._clock = clock
+
+        self._tokens = capacity
+        self._last_refill_time = clock()
+
+    def __repr__(self):
+        self._refill()
+        return "Token bucket %.2f/%.2f tokens, %.3f tokens per second" % (
+            self._tokens,
+            self._capacity,
+            self._tokens_per_second,
+        )
+
+    def seconds_until_token_available(self) -> float:
+        self._refill()
+        if self._tokens >= 1.0:
+            return 0.0
+
+        return (1.0 - self._tokens) / self._tokens_per_second
+
+    def take_token(self):
+        self._refill()
+        self._tokens = self._tokens - 1.0
+
+    def empty(self, seconds_until_refill_starts: float = 0.0):
+        self._refill()
+        self._tokens = min(
+            self._tokens, -seconds_until_refill_starts * self._tokens_per_second
+        )
+
+    def _refill(self):
+        now = self._clock()
+        time_since_refill = now - self._last_refill_time
+        self._tokens = min(
+            self._capacity, self._tokens + time_since_refill * self._tokens_per_second
+        )
+        self._last_refill_time = now
+
+
+class ibHistoricalDataPacing(object):
+    """
+    All the historical data requests on a connection should share one of these
+    """
+
+    def __init__(
+        self,
+        burst_of_requests: int = BURST_OF_REQUESTS,
+        seconds_between_requests: float = PACING_INTERVAL_SECONDS,
+        seconds_to_pause_after_violation: float = SECONDS_TO_PAUSE_AFTER_PACING_VIOLATION,
+        clock=time.monotonic,
+    ):
+        half_of_small_bar_requests = MAX_SMALL_BAR_REQUESTS_IN_PERIOD / 2.0
+        self._small_bar_bucket = tokenBucket(
+            capacity=half_of_small_bar_requests,
+            tokens_per_second=half_of_small_bar_requests / SMALL_BAR_PERIOD_SECONDS,
+            clock=clock,
+        )
+        self._all_requests_bucket = tokenBucket(
+            capacity=burst_of_requests,
+            tokens_per_second=1.0 / seconds_between_requests,
+            clock=clock,
+        )
+        self._seconds_to_pause_after_violation = seconds_to_pause_after_violation
+
+    async def wait_to_request(self, bar_freq: Frequency):
+        """
+        Returns when we can make a request for bar_freq without a pacing violation,
+        and takes the tokens for it
+        """
+        seconds_to_wait = self.seconds_until_request_allowed(bar_freq)
+        while seconds_to_wait > 0:
+            await asyncio.sleep(seconds_to_wait)
+            seconds_to_wait = self.seconds_until_request_allowed(bar_freq)
+
+        for bucket in self._buckets_for_frequency(bar_freq):
+            bucket.take_token()
+
+    def seconds_until_request_allowed(self, bar_freq: Frequency) -> float:
+        return max(
+            [
+                bucket.seconds_until_token_available()
+                for bucket in self._buckets_for_frequency(bar_freq)
+            ]
+        )
+
+    def pacing_violation(self):
+        for bucket in [self._all_requests_bucket, self._small_bar_bucket]:
+            bucket.empty(
+                seconds_until_refill_starts=self._seconds_to_pause_after_violation
+            )
+
+    def _buckets_for_frequency(self, bar_freq: Frequency) -> list:
+        if bar_freq in SMALL_BAR_FREQUENCIES:
+            return [self._all_requests_bucket, self._small_bar_bucket]
+        else:
+            return [self._all_requests_bucket]
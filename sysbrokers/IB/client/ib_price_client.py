@@ -6,8 +6,9 @@ import pandas as pd
 from ib_insync import Contract as ibContract
 from ib_insync import util
 
-from sysbrokers.IB.client.ib_client import reconnect, IB_ERROR_TYPES, PACING_INTERVAL_SECONDS, IB_ERROR__NO_MARKET_PERMISSIONS
+from sysbrokers.IB.client.ib_client import reconnect, IB_ERROR_TYPES, PACING_INTERVAL_SECONDS, IB_ERROR__NO_MARKET_PERMISSIONS, IB_ERROR__HISTORICAL_DATA_SERVICE
 from sysbrokers.IB.client.ib_contracts_client import ibContractsClient
+from sysbrokers.IB.client.ib_pacing import pacing_violation
 from sysbrokers.IB.ib_positions import resolveBS_for_list
 
 from syscore.objects import missing_contract, missing_data, no_market_permissions
@@ -66,6 +67,49 @@ class ibPriceClient(ibContractsClient):
 
         return price_data
 
+    async def broker_get_historical_futures_data_for_ibcontract_async(
+        self,
+        ibcontract: ibContract,
+        bar_freq: Frequency = DAILY_PRICE_FREQ,
+        log: logger = None,
+    ) -> pd.DataFrame:
+        """
+        Get historical data without blocking, so several requests can be in flight
+
+        Pacing is up to the caller; if IB say we've broken their pacing rules we
+        return pacing_violation
+
+        :param ibcontract: already resolved, eg with ib_futures_contract
+        :param freq: str; one of D, H, 5M, M, 10S, S
+        :return: pd.DataFrame, missing_data or pacing_violation
+        """
+        if log is None:
+            log = self.log
+
+        try:
+            barSizeSetting, durationStr = _get_barsize_and_duration_from_frequency(
+                bar_freq
+            )
+        except Exception as exception:
+            log.warn(exception)
+            return missing_data
+
+        price_data_raw = await self._ib_get_historical_data_of_duration_and_barSize_async(
+            ibcontract,
+            durationStr=durationStr,
+            barSizeSetting=barSizeSetting,
+            whatToShow="TRADES",
+        )
+        if price_data_raw is pacing_violation:
+            log.warn("Pacing violation getting historical data")
+            return pacing_violation
+
+        price_data_as_df = self._raw_ib_data_to_df(
+            price_data_raw=price_data_raw, log=log
+        )
+
+        return price_data_as_df
+
     @reconnect
     def get_ticker_object(
         self,
@@ -288,6 +332,48 @@ class ibPriceClient(ibContractsClient):
 
         return df
 
+    async def _ib_get_historical_data_of_duration_and_barSize_async(
+        self,
+        ibcontract: ibContract,
+        durationStr: str = "1 Y",
+        barSizeSetting: str = "1 day",
+        whatToShow="TRADES",
+    ) -> pd.DataFrame:
+        # no pacing or reconnection here, unlike _ib_get_historical_data_of_duration_and_barSize
+        self.start_recording_errors_by_reqid()
+        try:
+            bars = await self.ib.reqHistoricalDataAsync(
+                ibcontract,
+                endDateTime="",
+                durationStr=durationStr,
+                barSizeSetting=barSizeSetting,
+                whatToShow=whatToShow,
+                useRTH=True,
+                formatDate=2,
+            )
+            # errors end the request with no bars
+            last_error = self.get_last_error_for_reqid(bars.reqId)
+        finally:
+            self.stop_recording_errors_by_reqid()
+
+        if len(bars) == 0 and _is_pacing_violation(last_error):
+            return pacing_violation
+
+        df = util.df(bars)
+
+        return df
+
+
+def _is_pacing_violation(error: tuple) -> bool:
+    if error is None:
+        return False
+    error_code, error_string = error
+
+    return (
+        error_code == IB_ERROR__HISTORICAL_DATA_SERVICE
+        and "pacing violation" in error_string.lower()
+    )
+
 
 def _get_barsize_and_duration_from_frequency(bar_freq: Frequency) -> (str, str):
 
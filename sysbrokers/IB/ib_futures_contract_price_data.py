@@ -6,6 +6,7 @@ from sysbrokers.IB.ib_instruments_data import ibFuturesInstrumentData
 from sysbrokers.IB.ib_translate_broker_order_objects import sign_from_BS, ibBrokerOrder
 from sysbrokers.IB.ib_connection import connectionIB
 from sysbrokers.IB.client.ib_price_client import tickerWithBS, ibPriceClient
+from sysbrokers.IB.client.ib_pacing import pacing_violation
 from sysbrokers.broker_futures_contract_price_data import brokerFuturesContractPriceData
 
 
@@ -213,14 +214,85 @@ class ibFuturesContractPriceData(brokerFuturesContractPriceData):
         allow_expired: bool = False,
     ) -> futuresContractPrices:
 
-        new_log = contract_object_with_ib_broker_config.log(self.log)
-
         price_data = self.ib_client.broker_get_historical_futures_data_for_contract(
             contract_object_with_ib_broker_config,
             bar_freq=freq,
             allow_expired=allow_expired,
         )
 
+        price_data = self._clean_price_data(
+            price_data, contract_object_with_ib_broker_config
+        )
+
+        return price_data
+
+    def get_ibcontract_for_contract_object(self, contract_object: futuresContract):
+        """
+        Resolve the IB contract now, so we can get prices later with
+        get_prices_at_frequency_for_ibcontract_async
+
+        :param contract_object:  futuresContract
+        :return: (contract_object_with_ib_broker_config, ibcontract) or missing_contract
+        """
+        new_log = contract_object.log(self.log)
+
+        contract_object_with_ib_broker_config = (
+            self.futures_contract_data.get_contract_object_with_IB_data(
+                contract_object
+            )
+        )
+        if contract_object_with_ib_broker_config is missing_contract:
+            new_log.warn("Can't get data for %s" % str(contract_object))
+            return missing_contract
+
+        ibcontract = self.ib_client.ib_futures_contract(
+            contract_object_with_ib_broker_config
+        )
+        if ibcontract is missing_contract:
+            new_log.warn(
+                "Can't resolve IB contract %s"
+                % str(contract_object_with_ib_broker_config)
+            )
+            return missing_contract
+
+        return contract_object_with_ib_broker_config, ibcontract
+
+    async def get_prices_at_frequency_for_ibcontract_async(
+        self,
+        contract_object_with_ib_broker_config: futuresContract,
+        ibcontract,
+        freq: Frequency,
+    ) -> futuresContractPrices:
+        """
+        As get_prices_at_frequency_for_contract_object, but without blocking so
+        several requests can be in flight. Pacing is up to the caller.
+
+        :param contract_object_with_ib_broker_config: from get_ibcontract_for_contract_object
+        :param ibcontract: from get_ibcontract_for_contract_object
+        :param freq: str; one of D, H, 15M, 5M, M, 10S, S
+        :return: data, or pacing_violation
+        """
+        new_log = contract_object_with_ib_broker_config.log(self.log)
+
+        price_data = (
+            await self.ib_client.broker_get_historical_futures_data_for_ibcontract_async(
+                ibcontract, bar_freq=freq, log=new_log
+            )
+        )
+        if price_data is pacing_violation:
+            return pacing_violation
+
+        price_data = self._clean_price_data(
+            price_data, contract_object_with_ib_broker_config
+        )
+
+        return price_data
+
+    def _clean_price_data(
+        self, price_data, contract_object_with_ib_broker_config: futuresContract
+    ) -> futuresContractPrices:
+        new_log = contract_object_with_ib_broker_config.log(self.log)
+
         if price_data is missing_data:
             new_log.warn(
                 "Something went wrong getting IB price data for %s"
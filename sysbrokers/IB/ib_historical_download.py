@@ -0,0 +1,249 @@
+"""
+Download historical prices for many contracts from IB with several requests in flight
+at once, within our model of IB's pacing rules, while a separate worker thread writes
+the prices we already have to the database
+"""
+
+import asyncio
+import queue
+import threading
+
+from ib_insync import util
+
+from syscore.dateutils import Frequency
+from syscore.objects import failure, missing_contract, arg_not_supplied
+from sysbrokers.IB.client.ib_pacing import (
+    ibHistoricalDataPacing,
+    pacing_violation,
+    DEFAULT_REQUESTS_IN_FLIGHT,
+)
+from sysbrokers.IB.ib_futures_contract_price_data import ibFuturesContractPriceData
+from sysobjects.contracts import futuresContract
+from sysobjects.futures_per_contract_prices import futuresContractPrices
+from syslogdiag.log_to_screen import logtoscreen
+
+MAX_ATTEMPTS_FOR_EACH_REQUEST = 3
+
+
+class contractDownload(object):
+    """
+    The frequencies to get for a contract, in the order they are written; if writing
+    one fails we don't write the rest
+    """
+
+    def __init__(self, contract_object: futuresContract, list_of_frequencies: list):
+        self._contract_object = contract_object
+        self._list_of_frequencies = list_of_frequencies
+
+    def __repr__(self):
+        return "%s at %s" % (
+            str(self.contract_object),
+            ", ".join([str(frequency) for frequency in self.list_of_frequencies]),
+        )
+
+    @property
+    def contract_object(self) -> futuresContract:
+        return self._contract_object
+
+    @property
+    def list_of_frequencies(self) -> list:
+        return self._list_of_frequencies
+
+
+class ibHistoricalDownloadScheduler(object):
+    def __init__(
+        self,
+        broker_price_data: ibFuturesContractPriceData,
+        write_prices_func,
+        requests_in_flight: int = DEFAULT_REQUESTS_IN_FLIGHT,
+        pacing: ibHistoricalDataPacing = arg_not_supplied,
+        log=logtoscreen("ibHistoricalDownloadScheduler"),
+    ):
+        """
+        :param broker_price_data: ibFuturesContractPriceData
+        :param write_prices_func: function (contract_object, frequency, prices) returning
+            success or failure. Called on the worker thread.
+        :param requests_in_flight: int, most historical data requests at once
+        """
+        if pacing is arg_not_supplied:
+            pacing = ibHistoricalDataPacing()
+
+        self._broker_price_data = broker_price_data
+        self._write_prices_func = write_prices_func
+        self._requests_in_flight = requests_in_flight
+        self._pacing = pacing
+        self._log = log
+
+    @property
+    def broker_price_data(self) -> ibFuturesContractPriceData:
+        return self._broker_price_data
+
+    @property
+    def pacing(self) -> ibHistoricalDataPacing:
+        return self._pacing
+
+    @property
+    def log(self):
+        return self._log
+
+    def download_and_write(self, list_of_contract_downloads: list):
+        """
+        Returns when all the prices have been written
+
+        :param list_of_contract_downloads: list of contractDownload
+        """
+        # resolving contracts blocks, so we do it before we start the event loop
+        list_of_resolved_contracts = [
+            self.broker_price_data.get_ibcontract_for_contract_object(
+                contract_download.contract_object
+            )
+            for contract_download in list_of_contract_downloads
+        ]
+
+        writer = pricesWriterThread(self._write_prices_func, log=self.log)
+        writer.start()
+        try:
+            util.run(
+                self._download_all(
+                    list_of_contract_downloads, list_of_resolved_contracts, writer
+                )
+            )
+        finally:
+            writer.finish()
+
+    async def _download_all(
+        self,
+        list_of_contract_downloads: list,
+        list_of_resolved_contracts: list,
+        writer: "pricesWriterThread",
+    ):
+        in_flight = asyncio.Semaphore(self._requests_in_flight)
+        await asyncio.gather(
+            *[
+                self._download_contract(
+                    contract_download, resolved_contract, in_flight, writer
+                )
+                for contract_download, resolved_contract in zip(
+                    list_of_contract_downloads, list_of_resolved_contracts
+                )
+            ]
+        )
+
+    async def _download_contract(
+        self,
+        contract_download: contractDownload,
+        resolved_contract,
+        in_flight: asyncio.Semaphore,
+        writer: "pricesWriterThread",
+    ):
+        if resolved_contract is missing_contract:
+            # written anyway, so it's reported as having no prices
+            list_of_prices = [
+                futuresContractPrices.create_empty()
+                for _ in contract_download.list_of_frequencies
+            ]
+        else:
+            contract_object_with_ib_broker_config, ibcontract = resolved_contract
+            list_of_prices = await asyncio.gather(
+                *[
+                    self._download_prices_for_frequency(
+                        contract_object_with_ib_broker_config,
+                        ibcontract,
+                        frequency,
+                        in_flight,
+                    )
+                    for frequency in contract_download.list_of_frequencies
+                ]
+            )
+
+        writer.add(contract_download, list_of_prices)
+
+    async def _download_prices_for_frequency(
+        self,
+        contract_object_with_ib_broker_config: futuresContract,
+        ibcontract,
+        frequency: Frequency,
+        in_flight: asyncio.Semaphore,
+    ) -> futuresContractPrices:
+        for attempt in range(MAX_ATTEMPTS_FOR_EACH_REQUEST):
+            async with in_flight:
+                await self.pacing.wait_to_request(frequency)
+                prices = await self.broker_price_data.get_prices_at_frequency_for_ibcontract_async(
+                    contract_object_with_ib_broker_config, ibcontract, frequency
+                )
+            if prices is not pacing_violation:
+                return prices
+
+            self.pacing.pacing_violation()
+
+        contract_object_with_ib_broker_config.log(self.log).warn(
+            "Giving up getting %s prices for %s after %d pacing violations"
+            % (
+                str(frequency),
+                str(contract_object_with_ib_broker_config),
+                MAX_ATTEMPTS_FOR_EACH_REQUEST,
+            )
+        )
+
+        return futuresContractPrices.create_empty()
+
+
+class pricesWriterThread(object):
+    """
+    Writes prices in the order they are added, on its own thread
+
+    If writing raises an exception nothing else is written, and finish re-raises it
+    """
+
+    def __init__(self, write_prices_func, log=logtoscreen("pricesWriterThread")):
+        self._write_prices_func = write_prices_func
+        self._log = log
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_until_finished, daemon=True)
+        self._exception = None
+
+    def start(self):
+        self._thread.start()
+
+    def add(self, contract_download: contractDownload, list_of_prices: list):
+        self._queue.put((contract_download, list_of_prices))
+
+    def finish(self):
+        """
+        Returns when everything added has been written
+        """
+        self._queue.put(None)
+        self._thread.join()
+        if self._exception is not None:
+            raise self._exception
+
+    def _write_until_finished(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._exception is not None:
+                continue
+
+            contract_download, list_of_prices = item
+            try:
+                self._write_prices_for_contract(contract_download, list_of_prices)
+            except Exception as exception:
+                self._log.warn(
+                    "Error writing prices for %s: %s"
+                    % (str(contract_download.contract_object), str(exception))
+                )
+                self._exception = exception
+
+    def _write_prices_for_contract(
+        self, contract_download: contractDownload, list_of_prices: list
+    ):
+        for frequency, prices in zip(
+            contract_download.list_of_frequencies, list_of_prices
+        ):
+            result = self._write_prices_func(
+                contract_download.contract_object, frequency, prices
+            )
+            if result is failure:
+                # eg no intraday prices, so we don't want daily prices either
+                return
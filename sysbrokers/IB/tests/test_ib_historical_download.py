@@ -0,0 +1,287 @@
+import asyncio
+import datetime
+import threading
+import time
+
+import pytest
+from eventkit import Event
+from ib_insync import BarData, BarDataList, Contract
+
+from syscore.dateutils import Frequency
+from syscore.objects import success, failure, missing_contract
+from sysbrokers.IB import ib_historical_download
+from sysbrokers.IB.client.ib_pacing import ibHistoricalDataPacing, tokenBucket
+from sysbrokers.IB.ib_futures_contract_price_data import ibFuturesContractPriceData
+from sysbrokers.IB.ib_historical_download import (
+    ibHistoricalDownloadScheduler,
+    contractDownload,
+)
+from sysobjects.contracts import futuresContract
+from syslogdiag.log_to_screen import logtoscreen
+
+LATENCY = 0.02
+
+
+class fakeIB(object):
+    """
+    Enough of ib_insync.IB for historical data requests. Each takes LATENCY seconds,
+    and if more than max_requests_in_flight are made at once we get a pacing
+    violation, as we would from IB if we made too many requests.
+    """
+
+    def __init__(self, max_requests_in_flight: int):
+        self.errorEvent = Event("errorEvent")
+        self._max_requests_in_flight = max_requests_in_flight
+        self._next_reqid = 0
+        self.requests_in_flight = 0
+        self.most_requests_in_flight = 0
+        self.requests = 0
+        self.pacing_violations = 0
+
+    def isConnected(self):
+        return True
+
+    async def reqHistoricalDataAsync(
+        self,
+        contract: Contract,
+        endDateTime,
+        durationStr: str,
+        barSizeSetting: str,
+        whatToShow: str,
+        useRTH: bool,
+        formatDate: int = 1,
+    ) -> BarDataList:
+        self._next_reqid += 1
+        bars = BarDataList()
+        bars.reqId = self._next_reqid
+
+        self.requests += 1
+        self.requests_in_flight += 1
+        self.most_requests_in_flight = max(
+            self.most_requests_in_flight, self.requests_in_flight
+        )
+        try:
+            await asyncio.sleep(LATENCY)
+            if self.requests_in_flight > self._max_requests_in_flight:
+                self.pacing_violations += 1
+                self.errorEvent.emit(
+                    bars.reqId,
+                    162,
+                    "Historical Market Data Service error message:Historical data request pacing violation",
+                    contract,
+                )
+                return bars
+        finally:
+            self.requests_in_flight -= 1
+
+        bars += _bars(contract.conId, barSizeSetting)
+
+        return bars
+
+
+class fakeConnection(object):
+    def __init__(self, ib: fakeIB):
+        self.ib = ib
+
+    def client_id(self):
+        return 1
+
+
+def _bars(conId: int, barSizeSetting: str) -> list:
+    if barSizeSetting == "1 day":
+        dates = [datetime.date(2021, 1, day) for day in range(4, 9)]
+    else:
+        dates = [
+            datetime.datetime(2021, 1, 4, hour, tzinfo=datetime.timezone.utc)
+            for hour in range(10, 15)
+        ]
+
+    return [
+        BarData(
+            date=date,
+            open=conId + day_number,
+            high=conId + day_number + 1.0,
+            low=conId + day_number - 1.0,
+            close=conId + day_number + 0.5,
+            volume=10,
+        )
+        for day_number, date in enumerate(dates)
+    ]
+
+
+def _contract(contract_number: int) -> futuresContract:
+    return futuresContract("CORN", "2021%02d" % contract_number)
+
+
+def _broker_price_data(ib: fakeIB) -> ibFuturesContractPriceData:
+    broker_price_data = ibFuturesContractPriceData(
+        fakeConnection(ib), log=logtoscreen("test")
+    )
+
+    def _resolve(contract_object):
+        if contract_object.date_str == "20210900":
+            return missing_contract
+        return (
+            contract_object,
+            Contract(symbol="ZC", conId=int(contract_object.date_str[4:6]) * 100),
+        )
+
+    broker_price_data.get_ibcontract_for_contract_object = _resolve
+
+    return broker_price_data
+
+
+class pricesWriter(object):
+    def __init__(self, failure_for: tuple = None, exception_for: tuple = None):
+        self.written = []
+        self.threads = set()
+        self._failure_for = failure_for
+        self._exception_for = exception_for
+
+    def write(self, contract_object, frequency, prices):
+        self.threads.add(threading.get_ident())
+        key = (contract_object.date_str, frequency)
+        if key == self._exception_for:
+            raise Exception("Database has gone away")
+        self.written.append((key, prices))
+        if key == self._failure_for or len(prices) == 0:
+            return failure
+
+        return success
+
+
+def _scheduler(ib, writer, requests_in_flight: int) -> ibHistoricalDownloadScheduler:
+    return ibHistoricalDownloadScheduler(
+        _broker_price_data(ib),
+        write_prices_func=writer.write,
+        requests_in_flight=requests_in_flight,
+        pacing=ibHistoricalDataPacing(
+            burst_of_requests=100,
+            seconds_between_requests=0.001,
+            seconds_to_pause_after_violation=LATENCY,
+        ),
+        log=logtoscreen("test"),
+    )
+
+
+def _downloads(count: int) -> list:
+    return [
+        contractDownload(_contract(contract_number), [Frequency.Hour, Frequency.Day])
+        for contract_number in range(1, count + 1)
+    ]
+
+
+def test_requests_in_flight_at_once():
+    ib = fakeIB(max_requests_in_flight=4)
+    writer = pricesWriter()
+    start = time.time()
+    _scheduler(ib, writer, requests_in_flight=4).download_and_write(_downloads(8))
+    time_taken = time.time() - start
+
+    assert ib.requests == 16
+    assert ib.most_requests_in_flight == 4
+    assert ib.pacing_violations == 0
+    assert time_taken < 16 * LATENCY
+    assert threading.get_ident() not in writer.threads
+
+    # written in order for each contract
+    written_keys = [key for key, _ in writer.written]
+    assert len(written_keys) == 16
+    assert set(written_keys) == set(
+        [
+            (_contract(number).date_str, frequency)
+            for number in range(1, 9)
+            for frequency in [Frequency.Hour, Frequency.Day]
+        ]
+    )
+    for number in range(1, 9):
+        date_str = _contract(number).date_str
+        assert written_keys.index((date_str, Frequency.Hour)) < written_keys.index(
+            (date_str, Frequency.Day)
+        )
+
+    for (date_str, frequency), prices in writer.written:
+        assert len(prices) == 5
+        assert prices.OPEN.iloc[0] == int(date_str[4:6]) * 100
+        if frequency is Frequency.Day:
+            assert (prices.index.hour == 23).all()
+
+
+def test_retry_after_pacing_violations(monkeypatch):
+    monkeypatch.setattr(ib_historical_download, "MAX_ATTEMPTS_FOR_EACH_REQUEST", 50)
+    ib = fakeIB(max_requests_in_flight=3)
+    writer = pricesWriter()
+    _scheduler(ib, writer, requests_in_flight=6).download_and_write(_downloads(6))
+
+    assert ib.pacing_violations > 0
+    assert len(writer.written) == 12
+    assert all([len(prices) == 5 for _, prices in writer.written])
+
+
+def test_errors_by_reqid_not_kept(monkeypatch):
+    monkeypatch.setattr(ib_historical_download, "MAX_ATTEMPTS_FOR_EACH_REQUEST", 50)
+    ib = fakeIB(max_requests_in_flight=1)
+    scheduler = _scheduler(ib, pricesWriter(), requests_in_flight=2)
+    scheduler.download_and_write(_downloads(2))
+    assert ib.pacing_violations > 0
+
+    # not from a historical data request
+    ib.errorEvent.emit(999, 200, "No security definition has been found", None)
+
+    ib_client = scheduler.broker_price_data.ib_client
+    assert ib_client._last_errors_by_reqid == dict()
+
+
+def test_give_up_after_pacing_violations(monkeypatch):
+    monkeypatch.setattr(ib_historical_download, "MAX_ATTEMPTS_FOR_EACH_REQUEST", 2)
+    ib = fakeIB(max_requests_in_flight=0)
+    writer = pricesWriter()
+    _scheduler(ib, writer, requests_in_flight=2).download_and_write(_downloads(2))
+
+    assert ib.pacing_violations == 8
+    # no intraday prices, so daily prices aren't written
+    assert [(key, len(prices)) for key, prices in writer.written] == [
+        (("20210100", Frequency.Hour), 0),
+        (("20210200", Frequency.Hour), 0),
+    ]
+
+
+def test_writing_failures_and_exceptions():
+    ib = fakeIB(max_requests_in_flight=4)
+    writer = pricesWriter(failure_for=("20210200", Frequency.Hour))
+    downloads = _downloads(3) + [
+        contractDownload(_contract(9), [Frequency.Hour, Frequency.Day])
+    ]
+    _scheduler(ib, writer, requests_in_flight=4).download_and_write(downloads)
+
+    written_keys = [key for key, _ in writer.written]
+    assert ("20210200", Frequency.Hour) in written_keys
+    assert ("20210200", Frequency.Day) not in written_keys
+    assert ("20210300", Frequency.Day) in written_keys
+    # can't resolve, so no prices
+    assert ("20210900", Frequency.Hour) in written_keys
+    assert ("20210900", Frequency.Day) not in written_keys
+
+    writer = pricesWriter(exception_for=("20210100", Frequency.Hour))
+    with pytest.raises(Exception):
+        _scheduler(ib, writer, requests_in_flight=4).download_and_write(_downloads(3))
+    assert len(writer.written) == 0
+
+
+def test_token_bucket():
+    now = [0.0]
+    bucket = tokenBucket(capacity=2, tokens_per_second=0.5, clock=lambda: now[0])
+
+    bucket.take_token()
+    bucket.take_token()
+    assert bucket.seconds_until_token_available() == 2.0
+
+    now[0] = 1.0
+    assert bucket.seconds_until_token_available() == 1.0
+
+    now[0] = 100.0
+    assert bucket.seconds_until_token_available() == 0.0
+    bucket.take_token()
+    bucket.take_token()
+    bucket.empty(seconds_until_refill_starts=10.0)
+    assert bucket.seconds_until_token_available() == 12.0
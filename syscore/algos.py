@@ -134,6 +134,77 @@ def apply_buffer(
     :returns: pd.Series
     """
 
+    return apply_buffer_to_list_of_positions(
+        [optimal_position],
+        [pos_buffers],
+        trade_to_edge=trade_to_edge,
+        roundpositions=roundpositions,
+    )[0]
+
+
+def apply_buffer_to_list_of_positions(
+    list_of_optimal_positions: list,
+    list_of_pos_buffers: list,
+    trade_to_edge: bool = False,
+    roundpositions: bool = False,
+) -> list:
+    """
+    Apply buffers to the positions of several instruments at once; same as calling
+    apply_buffer for each
+
+    :param list_of_optimal_positions: list of pd.Series, can have different indices
+    :param list_of_pos_buffers: list of Tx2 pd.DataFrame, top_pos and bot_pos; each
+       the same length as the matching optimal position
+
+    :returns: list of pd.Series
+    """
+
+    list_of_inputs = [
+        _buffer_inputs_as_arrays(optimal_position, pos_buffers, roundpositions)
+        for optimal_position, pos_buffers in zip(
+            list_of_optimal_positions, list_of_pos_buffers
+        )
+    ]
+
+    # instruments go in columns, padded at the end with nan, which leaves the
+    # position unchanged
+    max_length = max(
+        [len(optimal_position) for optimal_position, _, _ in list_of_inputs]
+    )
+    optimal_position, top_pos, bot_pos = [
+        _stack_columns_padded_with_nan(
+            [inputs[which_input] for inputs in list_of_inputs], max_length
+        )
+        for which_input in range(3)
+    ]
+
+    buffered_position_array = apply_buffer_to_arrays(
+        optimal_position, top_pos, bot_pos, trade_to_edge=trade_to_edge
+    )
+
+    list_of_buffered_positions = [
+        pd.Series(
+            buffered_position_array[: len(original_position.index), column_number],
+            index=original_position.index,
+        )
+        for column_number, original_position in enumerate(list_of_optimal_positions)
+    ]
+
+    return list_of_buffered_positions
+
+
+def _apply_buffer_with_loop(
+    optimal_position: pd.Series,
+    pos_buffers: pd.DataFrame,
+    trade_to_edge: bool = False,
+    roundpositions: bool = False,
+) -> pd.Series:
+    """
+    Apply a buffer to a position, one date at a time
+
+    This is the original, slow, implementation; kept as a reference for apply_buffer
+    """
+
     pos_buffers = pos_buffers.ffill()
     use_optimal_position = optimal_position.ffill()
 
@@ -166,6 +237,165 @@ def apply_buffer(
     return buffered_position
 
 
+def _buffer_inputs_as_arrays(
+    optimal_position: pd.Series, pos_buffers: pd.DataFrame, roundpositions: bool
+) -> tuple:
+    pos_buffers = pos_buffers.ffill()
+    use_optimal_position = optimal_position.ffill()
+
+    top_pos = pos_buffers.top_pos
+    bot_pos = pos_buffers.bot_pos
+
+    if roundpositions:
+        use_optimal_position = use_optimal_position.round()
+        top_pos = top_pos.round()
+        bot_pos = bot_pos.round()
+
+    return (
+        use_optimal_position.values.astype(float),
+        top_pos.values.astype(float),
+        bot_pos.values.astype(float),
+    )
+
+
+def _stack_columns_padded_with_nan(list_of_arrays: list, length: int) -> np.array:
+    stacked = np.full((length, len(list_of_arrays)), np.nan)
+    for column_number, some_array in enumerate(list_of_arrays):
+        stacked[: len(some_array), column_number] = some_array[:length]
+
+    return stacked
+
+
+# With fewer instruments than this, it's quicker to skip from trade to trade for
+# each instrument in turn, than to step through every date for all of them
+MIN_INSTRUMENTS_TO_BUFFER_DATE_BY_DATE = 8
+
+# how many dates ahead we look for the next trade when skipping from trade to trade
+DATES_TO_LOOK_AHEAD_FOR_TRADE = 32
+
+
+def apply_buffer_to_arrays(
+    optimal_position: np.array,
+    top_pos: np.array,
+    bot_pos: np.array,
+    trade_to_edge: bool = False,
+) -> np.array:
+    """
+    Apply buffers to T x N arrays, one column per instrument, as
+    apply_buffer_single_period on each date in turn
+
+    The first position is the first optimal position, or zero if that is nan
+
+    :returns: T x N array of buffered positions
+    """
+
+    # no trade is possible if anything is missing
+    no_data = np.isnan(optimal_position) | np.isnan(top_pos) | np.isnan(bot_pos)
+    top_pos_or_inf = np.where(no_data, np.inf, top_pos)
+    bot_pos_or_minus_inf = np.where(no_data, -np.inf, bot_pos)
+
+    if trade_to_edge:
+        position_if_above = top_pos
+        position_if_below = bot_pos
+    else:
+        position_if_above = position_if_below = optimal_position
+
+    first_position = np.nan_to_num(optimal_position[:1], nan=0.0)
+
+    number_of_instruments = optimal_position.shape[1]
+    if number_of_instruments >= MIN_INSTRUMENTS_TO_BUFFER_DATE_BY_DATE:
+        return _apply_buffer_date_by_date(
+            first_position,
+            top_pos_or_inf,
+            bot_pos_or_minus_inf,
+            position_if_above,
+            position_if_below,
+        )
+
+    buffered_position = np.empty(optimal_position.shape)
+    for column in range(number_of_instruments):
+        instrument_only = slice(column, column + 1)
+        buffered_position[:, instrument_only] = _apply_buffer_trade_by_trade(
+            first_position[:, instrument_only],
+            top_pos_or_inf[:, instrument_only],
+            bot_pos_or_minus_inf[:, instrument_only],
+            position_if_above[:, instrument_only],
+            position_if_below[:, instrument_only],
+        )
+
+    return buffered_position
+
+
+def _apply_buffer_date_by_date(
+    first_position: np.array,
+    top_pos: np.array,
+    bot_pos: np.array,
+    position_if_above: np.array,
+    position_if_below: np.array,
+) -> np.array:
+
+    buffered_position = np.empty(top_pos.shape)
+    current_position = first_position[0].copy()
+    buffered_position[0] = current_position
+
+    number_of_instruments = top_pos.shape[1]
+    above = np.empty(number_of_instruments, dtype=bool)
+    below = np.empty(number_of_instruments, dtype=bool)
+    for idx in range(1, len(top_pos)):
+        np.greater(current_position, top_pos[idx], out=above)
+        np.less(current_position, bot_pos[idx], out=below)
+        np.copyto(current_position, position_if_above[idx], where=above)
+        np.copyto(current_position, position_if_below[idx], where=below)
+        buffered_position[idx] = current_position
+
+    return buffered_position
+
+
+def _apply_buffer_trade_by_trade(
+    first_position: np.array,
+    top_pos: np.array,
+    bot_pos: np.array,
+    position_if_above: np.array,
+    position_if_below: np.array,
+) -> np.array:
+    # position only changes when it is outside the buffer, so we look ahead for
+    # the next date when that happens, and hold the position until then
+
+    length = len(top_pos)
+    buffered_position = np.empty(top_pos.shape)
+    current_position = first_position[0]
+    buffered_position[0] = current_position
+
+    idx = 1
+    while idx < length:
+        look_ahead_end = min(idx + DATES_TO_LOOK_AHEAD_FOR_TRADE, length)
+        outside_buffer = (current_position > top_pos[idx:look_ahead_end]) | (
+            current_position < bot_pos[idx:look_ahead_end]
+        )
+        dates_with_trade = np.flatnonzero(outside_buffer.any(axis=1))
+        if len(dates_with_trade) == 0:
+            buffered_position[idx:look_ahead_end] = current_position
+            idx = look_ahead_end
+            continue
+
+        trade_idx = idx + dates_with_trade[0]
+        buffered_position[idx:trade_idx] = current_position
+
+        current_position = np.where(
+            current_position > top_pos[trade_idx],
+            position_if_above[trade_idx],
+            np.where(
+                current_position < bot_pos[trade_idx],
+                position_if_below[trade_idx],
+                current_position,
+            ),
+        )
+        buffered_position[trade_idx] = current_position
+        idx = trade_idx + 1
+
+    return buffered_position
+
+
 def return_mapping_params(a_param):
     """
     The process of non-linear mapping is designed to ensure that we can still trade with small account sizes
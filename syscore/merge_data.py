@@ -1,10 +1,12 @@
 ## Merge series together
 from copy import copy
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 import datetime
 
 from syscore.dateutils import SECONDS_PER_DAY
-from syscore.objects import arg_not_supplied, named_object
+from syscore.objects import arg_not_supplied, named_object, missing_data
 from sysdata.config.production_config import get_production_config
 
 
@@ -23,6 +25,13 @@ status_merged_data = mergeStatus("Merged_data")
 no_spike = object()
 spike_in_data = object()
 
+# for the average absolute change in the spike check
+SPAN_FOR_AVERAGE_CHANGE = 500
+# how pandas ewm(span=SPAN_FOR_AVERAGE_CHANGE) shrinks the weight of older rows
+OLD_WEIGHT_FACTOR_FOR_AVERAGE_CHANGE = 1.0 - 1.0 / (
+    1.0 + (SPAN_FOR_AVERAGE_CHANGE - 1.0) / 2.0
+)
+
 
 class mergingDataWithStatus(object):
     def __init__(
@@ -221,7 +230,7 @@ def _calculate_change_in_avg_units(data_to_check: pd.Series) -> pd.Series:
 
     # hard to know what span to use here as could be daily, intraday or a
     # mixture
-    avg_abs_change = abs_change_pd.ewm(span=500).mean()
+    avg_abs_change = abs_change_pd.ewm(span=SPAN_FOR_AVERAGE_CHANGE).mean()
 
     change_in_avg_units = abs_change_pd / avg_abs_change
 
@@ -272,6 +281,262 @@ def _check_for_spikes_in_change_in_avg_units(change_in_avg_units_to_check: pd.Se
     return first_spike
 
 
+class spikeCheckState(object):
+    """
+    What the spike check needs to know about existing data to check new rows added
+    after it: the last row, and the state of the exponentially weighted average of
+    absolute changes in _calculate_change_in_avg_units
+
+    Checking new rows with this gives the same answer as checking the merged data,
+    but without needing the existing data
+    """
+
+    def __init__(
+        self,
+        last_date: datetime.datetime = None,
+        last_value: float = np.nan,
+        avg_abs_change: float = np.nan,
+        weight_of_avg: float = 1.0,
+    ):
+        self._last_date = last_date
+        self._last_value = last_value
+        self._avg_abs_change = avg_abs_change
+        self._weight_of_avg = weight_of_avg
+
+    def __repr__(self):
+        return "Spike check state at %s: last value %f, average abs change %f" % (
+            str(self.last_date),
+            self.last_value,
+            self.avg_abs_change,
+        )
+
+    @property
+    def last_date(self) -> datetime.datetime:
+        return self._last_date
+
+    @property
+    def last_value(self) -> float:
+        return self._last_value
+
+    @property
+    def avg_abs_change(self) -> float:
+        return self._avg_abs_change
+
+    @property
+    def weight_of_avg(self) -> float:
+        return self._weight_of_avg
+
+    @property
+    def no_existing_data(self) -> bool:
+        return self.last_date is None
+
+    @classmethod
+    def from_data(spikeCheckState, data_to_check: pd.Series):
+        if len(data_to_check) == 0:
+            return spikeCheckState()
+
+        # pandas does the same as the row by row update in
+        # _change_in_avg_units_given_spike_check_state, but much more quickly
+        abs_change = average_change_per_day(data_to_check).abs()
+        avg_abs_change = abs_change.ewm(span=SPAN_FOR_AVERAGE_CHANGE).mean()
+        if len(avg_abs_change) == 0:
+            last_avg_abs_change = np.nan
+        else:
+            last_avg_abs_change = avg_abs_change.values[-1]
+
+        return spikeCheckState(
+            last_date=data_to_check.index[-1],
+            last_value=data_to_check.values[-1],
+            avg_abs_change=last_avg_abs_change,
+            weight_of_avg=_weight_of_avg_abs_change(abs_change),
+        )
+
+    def as_dict(self) -> dict:
+        return dict(
+            last_date=self.last_date,
+            last_value=float(self.last_value),
+            avg_abs_change=float(self.avg_abs_change),
+            weight_of_avg=float(self.weight_of_avg),
+        )
+
+    @classmethod
+    def from_dict(spikeCheckState, spike_check_state_as_dict: dict):
+        return spikeCheckState(**spike_check_state_as_dict)
+
+
+def merge_newer_data_given_spike_check_state(
+    new_data,
+    spike_check_state: spikeCheckState,
+    check_for_spike=True,
+    column_to_check=arg_not_supplied,
+):
+    """
+    As merge_newer_data, but with a spikeCheckState in place of the old data
+
+    :param new_data: pd.Series or DataFrame
+    :param spike_check_state: spikeCheckState for the old data
+    :param check_for_spike: bool
+    :param column_to_check: column name to check for spike
+
+    :return: tuple: rows of new_data to add after the old data (or spike_in_data), and
+       spikeCheckState for the merged data
+    """
+    if spike_check_state.no_existing_data:
+        actually_new_data = new_data
+    else:
+        actually_new_data = new_data[new_data.index > spike_check_state.last_date]
+        actually_new_data = actually_new_data.sort_index()
+        actually_new_data = actually_new_data[
+            ~actually_new_data.index.duplicated(keep="first")
+        ]
+
+    if len(actually_new_data.index) == 0:
+        return actually_new_data, spike_check_state
+
+    data_to_check = _get_data_to_check(
+        actually_new_data, column_to_check=column_to_check
+    )
+    (
+        change_in_avg_units,
+        updated_spike_check_state,
+    ) = _change_in_avg_units_given_spike_check_state(data_to_check, spike_check_state)
+
+    if check_for_spike:
+        first_spike = _check_for_spikes_in_change_in_avg_units(change_in_avg_units)
+        if first_spike is not no_spike:
+            return spike_in_data, spike_check_state
+
+    return actually_new_data, updated_spike_check_state
+
+
+def _change_in_avg_units_given_spike_check_state(
+    data_to_check: pd.Series, spike_check_state: spikeCheckState
+) -> tuple:
+    """
+    _calculate_change_in_avg_units for data_to_check added after the data in
+    spike_check_state; also returns the updated state
+
+    The average is updated row by row exactly as pandas does for ewm(span=500).mean(),
+    so we get identical values
+    """
+    list_of_dates = list(data_to_check.index)
+    list_of_values = list(data_to_check.values)
+    if spike_check_state.no_existing_data:
+        # no change for the first row
+        spike_check_state = spikeCheckState(
+            last_date=list_of_dates.pop(0),
+            last_value=list_of_values.pop(0),
+        )
+
+    dates_with_previous = [spike_check_state.last_date] + list_of_dates
+    values_with_previous = pd.Series(
+        [spike_check_state.last_value] + list_of_values,
+        index=dates_with_previous,
+    )
+    abs_change = average_change_per_day(values_with_previous).abs()
+
+    old_weight_factor = OLD_WEIGHT_FACTOR_FOR_AVERAGE_CHANGE
+    avg_abs_change = spike_check_state.avg_abs_change
+    weight_of_avg = spike_check_state.weight_of_avg
+    list_of_avg_abs_change = []
+    for this_abs_change in abs_change.values:
+        is_observation = this_abs_change == this_abs_change
+        if avg_abs_change == avg_abs_change:
+            weight_of_avg *= old_weight_factor
+            if is_observation:
+                if avg_abs_change != this_abs_change:
+                    avg_abs_change = (
+                        weight_of_avg * avg_abs_change + this_abs_change
+                    ) / (weight_of_avg + 1.0)
+                weight_of_avg += 1.0
+        elif is_observation:
+            avg_abs_change = this_abs_change
+        list_of_avg_abs_change.append(avg_abs_change)
+
+    change_in_avg_units = abs_change / np.array(list_of_avg_abs_change, dtype=float)
+
+    if len(list_of_dates) > 0:
+        updated_spike_check_state = spikeCheckState(
+            last_date=list_of_dates[-1],
+            last_value=list_of_values[-1],
+            avg_abs_change=avg_abs_change,
+            weight_of_avg=weight_of_avg,
+        )
+    else:
+        updated_spike_check_state = spike_check_state
+
+    return change_in_avg_units, updated_spike_check_state
+
+
+def _weight_of_avg_abs_change(abs_change: pd.Series) -> float:
+    """
+    Total weight of the observations in the average at the last row, as
+    _change_in_avg_units_given_spike_check_state would work it out: each observation
+    adds 1.0, and every later row (observation or not) shrinks that by
+    OLD_WEIGHT_FACTOR_FOR_AVERAGE_CHANGE
+    """
+    rows_with_observations = np.flatnonzero(abs_change.notna().values)
+    if len(rows_with_observations) == 0:
+        return 1.0
+
+    rows_since_observation = len(abs_change) - 1 - rows_with_observations
+
+    return float(
+        np.sum(OLD_WEIGHT_FACTOR_FOR_AVERAGE_CHANGE ** rows_since_observation)
+    )
+
+
+def rows_added_after_end_of_existing_data(existing_data, updated_data):
+    """
+    If the only difference between existing_data and updated_data is rows added after
+    the end of existing_data, return those rows, so they can be appended rather than
+    rewriting everything
+
+    :param existing_data: pd.Series or DataFrame
+    :param updated_data: pd.Series or DataFrame
+
+    :return: pd.Series or DataFrame, possibly empty; or missing_data if anything
+       else has changed
+    """
+    number_of_existing_rows = len(existing_data.index)
+    if number_of_existing_rows == 0:
+        return missing_data
+
+    existing_part_of_updated_data = updated_data.iloc[:number_of_existing_rows]
+    if not existing_part_of_updated_data.index.equals(existing_data.index):
+        return missing_data
+
+    if not _same_values(existing_data, existing_part_of_updated_data):
+        return missing_data
+
+    return updated_data.iloc[number_of_existing_rows:]
+
+
+def _same_values(existing_data, updated_data) -> bool:
+    existing_data = pd.DataFrame(existing_data)
+    updated_data = pd.DataFrame(updated_data)
+    if list(existing_data.columns) != list(updated_data.columns):
+        return False
+
+    for column_name in existing_data.columns:
+        existing_column = existing_data[column_name]
+        updated_column = updated_data[column_name]
+        if is_numeric_dtype(existing_column) and is_numeric_dtype(updated_column):
+            same = np.array_equal(
+                existing_column.values.astype(float),
+                updated_column.values.astype(float),
+                equal_nan=True,
+            )
+        else:
+            # eg contract ids, which might be int or str
+            same = existing_column.astype(str).equals(updated_column.astype(str))
+
+        if not same:
+            return False
+
+    return True
+
+
 def full_merge_of_existing_data(
     old_data,
     new_data,
@@ -0,0 +1,71 @@
+"""
+Run independent pieces of work in a pool of worker processes, or threads
+
+Process workers are forked, so they inherit the state of the parent process (eg a
+System with its data and cache) without it being pickled. Where fork isn't available
+(Windows) everything runs serially in this process instead.
+
+Threads only help when the work is mostly waiting, eg reading from a database or files.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def can_use_process_pool() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def map_in_process_pool(
+    func, list_of_args: list, workers: int = 1, initializer=None, initargs=()
+) -> list:
+    """
+    Returns [func(*args) for args in list_of_args], in the same order
+
+    :param func: module level function; it and its return values must pickle
+    :param list_of_args: list of tuples of positional arguments
+    :param workers: number of processes; 1 or less runs serially in this process
+    :param initializer: optional function called once in each worker before any work
+    :param initargs: arguments for initializer; these are inherited, not pickled
+    :return: list of results
+    """
+    use_pool = workers > 1 and len(list_of_args) > 1 and can_use_process_pool()
+
+    if not use_pool:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(*args) for args in list_of_args]
+
+    workers = min(workers, len(list_of_args))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=initializer,
+        initargs=initargs,
+    ) as executor:
+        list_of_futures = [executor.submit(func, *args) for args in list_of_args]
+        results = [future.result() for future in list_of_futures]
+
+    return results
+
+
+def map_in_thread_pool(func, list_of_args: list, workers: int = 1) -> list:
+    """
+    Returns [func(*args) for args in list_of_args], in the same order
+
+    :param func: must be safe to call from several threads at once
+    :param list_of_args: list of tuples of positional arguments
+    :param workers: number of threads; 1 or less runs serially in this thread
+    :return: list of results
+    """
+    use_pool = workers > 1 and len(list_of_args) > 1
+
+    if not use_pool:
+        return [func(*args) for args in list_of_args]
+
+    workers = min(workers, len(list_of_args))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list_of_futures = [executor.submit(func, *args) for args in list_of_args]
+        results = [future.result() for future in list_of_futures]
+
+    return results
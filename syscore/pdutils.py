@@ -273,6 +273,42 @@ def pd_readcsv(
     return new_ans
 
 
+def pd_appendcsv(
+    data: pd.DataFrame,
+    filename: str,
+    date_index_name: str = "DATETIME",
+    date_format: str = DEFAULT_DATE_FORMAT,
+) -> bool:
+    """
+    Add rows to the end of a .csv file written by data.to_csv, without rewriting it
+
+    :param data: rows to add; same columns as the file, in any order
+    :param filename: Filename with extension; must already exist
+    :param date_index_name: Column name of date index in the file
+    :param date_format: Format of dates in the file; the writer should use the same one
+
+    :returns: bool, False if the columns in the file don't match so nothing was added
+    """
+    with open(filename, "r") as csv_file:
+        header = csv_file.readline()
+
+    columns_in_file = header.strip().split(",")
+    if columns_in_file[0] != date_index_name:
+        return False
+
+    columns_in_file = columns_in_file[1:]
+    if sorted(columns_in_file) != sorted([str(column) for column in data.columns]):
+        return False
+
+    data = data.copy()
+    data.columns = [str(column) for column in data.columns]
+    data[columns_in_file].to_csv(
+        filename, mode="a", header=False, date_format=date_format
+    )
+
+    return True
+
+
 def fix_weights_vs_position_or_forecast(
     weights: pd.DataFrame, position_or_forecast: pd.DataFrame
 ):
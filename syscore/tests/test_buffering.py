@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from syscore import algos
+from syscore.algos import (
+    apply_buffer,
+    apply_buffer_to_list_of_positions,
+    _apply_buffer_with_loop,
+)
+
+
+def _position_and_buffers(seed: int, length: int) -> tuple:
+    random_state = np.random.RandomState(seed)
+    dates = pd.bdate_range("2000-01-03", periods=length)
+    optimal_position = pd.Series(
+        random_state.normal(size=length).cumsum() * 0.3, index=dates
+    )
+    buffer = 0.5 + random_state.rand(length)
+    pos_buffers = pd.DataFrame(
+        dict(top_pos=optimal_position + buffer, bot_pos=optimal_position - buffer),
+        index=dates,
+    )
+
+    # missing data at the start, and some gaps
+    optimal_position[: seed * 10] = np.nan
+    optimal_position[random_state.rand(length) < 0.05] = np.nan
+    pos_buffers[random_state.rand(length, 2) < 0.05] = np.nan
+
+    return optimal_position, pos_buffers
+
+
+@pytest.mark.parametrize("trade_to_edge", [True, False])
+@pytest.mark.parametrize("roundpositions", [True, False])
+@pytest.mark.parametrize("date_by_date", [True, False])
+def test_same_as_loop(monkeypatch, trade_to_edge, roundpositions, date_by_date):
+    if date_by_date:
+        monkeypatch.setattr(algos, "MIN_INSTRUMENTS_TO_BUFFER_DATE_BY_DATE", 1)
+    list_of_inputs = [
+        _position_and_buffers(seed, length)
+        for seed, length in enumerate([500, 300, 650, 1])
+    ]
+
+    list_of_buffered_positions = apply_buffer_to_list_of_positions(
+        [optimal_position for optimal_position, _ in list_of_inputs],
+        [pos_buffers for _, pos_buffers in list_of_inputs],
+        trade_to_edge=trade_to_edge,
+        roundpositions=roundpositions,
+    )
+
+    for (optimal_position, pos_buffers), buffered_position in zip(
+        list_of_inputs, list_of_buffered_positions
+    ):
+        expected = _apply_buffer_with_loop(
+            optimal_position,
+            pos_buffers,
+            trade_to_edge=trade_to_edge,
+            roundpositions=roundpositions,
+        )
+        pd.testing.assert_series_equal(buffered_position, expected)
+        pd.testing.assert_series_equal(
+            apply_buffer(
+                optimal_position,
+                pos_buffers,
+                trade_to_edge=trade_to_edge,
+                roundpositions=roundpositions,
+            ),
+            expected,
+        )
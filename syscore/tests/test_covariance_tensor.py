@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from sysquant.estimators import covariance_tensor
+from sysquant.estimators.correlations import (
+    CorrelationList,
+    correlationEstimate,
+    create_boring_corr_matrix,
+)
+from sysquant.estimators.covariance import covariance_from_stdev_and_correlation
+from sysquant.estimators.covariance_tensor import covarianceTensor
+from sysquant.estimators.stdev_estimator import stdevEstimates
+from sysquant.fitting_dates import fitDates, listOfFittingDates
+
+
+def _returns() -> pd.DataFrame:
+    random_state = np.random.RandomState(42)
+    dates = pd.bdate_range("2015-01-01", periods=1000)
+    returns = pd.DataFrame(
+        random_state.normal(0, 0.01, size=(len(dates), 3)),
+        index=dates,
+        columns=["US10", "EDOLLAR", "CORN"],
+    )
+    # starts later
+    returns.iloc[:400, 2] = np.nan
+
+    return returns
+
+
+def _correlation_list(returns: pd.DataFrame) -> CorrelationList:
+    # correlations of all the data up to the start of each year
+    columns = list(returns.columns)
+    list_of_period_starts = [pd.Timestamp("2016-01-01"), pd.Timestamp("2017-01-01")]
+    fit_dates = listOfFittingDates(
+        [
+            fitDates(
+                fit_start=returns.index[0],
+                fit_end=period_start,
+                period_start=period_start,
+                period_end=period_start + pd.DateOffset(years=1),
+            )
+            for period_start in list_of_period_starts
+        ]
+    )
+    corr_list = [
+        correlationEstimate(returns[:period_start].corr(min_periods=50))
+        for period_start in list_of_period_starts
+    ]
+
+    return CorrelationList(corr_list=corr_list, column_names=columns, fit_dates=fit_dates)
+
+
+def _expected_covariance(stdev: pd.DataFrame, correlation_list, relevant_date):
+    # as portfolioWeightsStage.calculate_covariance_matrix
+    try:
+        correlation = correlation_list.most_recent_correlation_before_date(
+            relevant_date
+        )
+    except:
+        correlation = create_boring_corr_matrix(
+            len(stdev.columns), columns=list(stdev.columns), offdiag=0.0
+        )
+    stdev_on_date = stdevEstimates(stdev.loc[relevant_date].to_dict())
+    covariance = covariance_from_stdev_and_correlation(correlation, stdev_on_date)
+
+    return covariance.as_pd().loc[stdev.columns, stdev.columns].values.astype(float)
+
+
+def test_same_as_covariance_from_stdev_and_correlation():
+    returns = _returns()
+    stdev = returns.ewm(span=35, min_periods=10).std()
+    correlation_list = _correlation_list(returns)
+    # no correlations yet for CORN in the first period
+    assert np.isnan(correlation_list.corr_list[0].values[2]).all()
+
+    tensor = covarianceTensor.from_stdev_and_correlations(stdev, correlation_list)
+
+    assert tensor.values.shape == (1000, 3, 3)
+    for relevant_date in stdev.index[::7]:
+        assert np.array_equal(
+            tensor.covariance_on_date(relevant_date).as_np(),
+            _expected_covariance(stdev, correlation_list, relevant_date),
+            equal_nan=True,
+        )
+
+
+def test_lookup_and_memory_mapping(monkeypatch):
+    returns = _returns()
+    in_memory = covarianceTensor.from_returns(returns, span=50)
+
+    monkeypatch.setattr(covariance_tensor, "MAX_BYTES_IN_MEMORY", 0)
+    memory_mapped = covarianceTensor.from_returns(returns, span=50)
+
+    assert not in_memory.is_memory_mapped
+    assert memory_mapped.is_memory_mapped
+    assert np.array_equal(in_memory.values, memory_mapped.values, equal_nan=True)
+
+    # between dates we get the most recent
+    relevant_date = returns.index[500]
+    assert np.array_equal(
+        in_memory.values_on_date(relevant_date + pd.Timedelta(hours=12)),
+        returns.ewm(span=50, min_periods=20).cov().loc[relevant_date].values,
+    )
+    assert np.array_equal(
+        in_memory.values_on_date(), in_memory.values[-1], equal_nan=True
+    )
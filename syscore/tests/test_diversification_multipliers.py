@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from sysquant.estimators.correlations import CorrelationList, correlationEstimate
+from sysquant.estimators.diversification_multipliers import (
+    diversification_mult_for_each_period,
+    diversification_mult_single_period,
+)
+from sysquant.fitting_dates import fitDates, listOfFittingDates
+from sysquant.optimisation.weights import portfolioWeights
+
+COLUMNS = ["US10", "EDOLLAR", "CORN", "GOLD"]
+
+
+def _correlation_list() -> CorrelationList:
+    random_state = np.random.RandomState(11)
+    period_starts = pd.date_range("2000-01-01", periods=12, freq="AS")
+    list_of_correlations = []
+    for period_number in range(len(period_starts)):
+        returns = random_state.normal(size=(100, len(COLUMNS)))
+        values = np.corrcoef(returns, rowvar=False)
+        if period_number < 4:
+            # no data for GOLD yet
+            values[3, :] = values[:, 3] = np.nan
+        columns = COLUMNS
+        if period_number % 3 == 0:
+            # different order
+            columns = COLUMNS[::-1]
+            values = values[::-1, ::-1]
+        list_of_correlations.append(correlationEstimate(values, columns=columns))
+
+    fit_dates = listOfFittingDates(
+        [
+            fitDates(
+                fit_start=period_starts[0],
+                fit_end=period_start,
+                period_start=period_start,
+                period_end=period_start + pd.DateOffset(years=1),
+            )
+            for period_start in period_starts
+        ]
+    )
+
+    return CorrelationList(
+        corr_list=list_of_correlations, column_names=COLUMNS, fit_dates=fit_dates
+    )
+
+
+def _weight_df() -> pd.DataFrame:
+    random_state = np.random.RandomState(12)
+    dates = pd.bdate_range("2002-06-01", "2011-12-31")
+    weight_df = pd.DataFrame(
+        random_state.uniform(size=(len(dates), len(COLUMNS))),
+        index=dates,
+        columns=COLUMNS,
+    )
+    weight_df.iloc[:300, 2] = np.nan
+    # zero risk at some point
+    weight_df.loc["2008-01-01":"2008-12-31"] = 0.0
+
+    return weight_df
+
+
+def _expected_div_mult(correlation_list, weight_df, dm_max) -> list:
+    # one period at a time
+    expected = []
+    for corrmatrix, fit_period in zip(
+        correlation_list.corr_list, correlation_list.fit_dates
+    ):
+        weight_slice = weight_df[: fit_period.period_start]
+        if weight_slice.shape[0] == 0:
+            expected.append(1.0)
+            continue
+        weights = portfolioWeights(weight_slice.iloc[-1].to_dict())
+        expected.append(
+            diversification_mult_single_period(corrmatrix, weights, dm_max=dm_max)
+        )
+
+    return expected
+
+
+def test_same_as_one_period_at_a_time():
+    correlation_list = _correlation_list()
+    weight_df = _weight_df()
+
+    for dm_max in [2.5, 1.2]:
+        div_mult = diversification_mult_for_each_period(
+            correlation_list, weight_df, dm_max=dm_max
+        )
+        expected = _expected_div_mult(correlation_list, weight_df, dm_max=dm_max)
+
+        np.testing.assert_allclose(div_mult, expected, rtol=1e-12)
+        assert div_mult[0] == 1.0
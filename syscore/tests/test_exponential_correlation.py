@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sysquant.estimators.correlations import correlationEstimate
+from sysquant.estimators.exponential_correlation import exponentialCorrelationResults
+
+
+def _returns() -> pd.DataFrame:
+    random_state = np.random.RandomState(3)
+    dates = pd.date_range("2000-01-01", periods=600, freq="W")
+    returns = pd.DataFrame(
+        random_state.normal(size=(len(dates), 5)),
+        index=dates,
+        columns=["US10", "EDOLLAR", "CORN", "SP500", "GOLD"],
+    )
+    # different starts, and some gaps
+    for column_number in range(5):
+        returns.iloc[: 50 * column_number, column_number] = np.nan
+    returns[random_state.rand(*returns.shape) < 0.05] = np.nan
+
+    return returns
+
+
+def _stacked_correlations(returns: pd.DataFrame) -> pd.DataFrame:
+    return returns.ewm(span=100, min_periods=20, ignore_na=True).corr(pairwise=True)
+
+
+def _last_valid_cor_matrix_for_date(
+    stacked_correlations: pd.DataFrame, columns: list, date_point
+) -> correlationEstimate:
+    # how it was done before exponentialCorrelationResults
+    size_of_matrix = len(columns)
+    corr_matrix_values = (
+        stacked_correlations[
+            stacked_correlations.index.get_level_values(0) < date_point
+        ]
+        .tail(size_of_matrix)
+        .values
+    )
+
+    return correlationEstimate(values=corr_matrix_values, columns=columns)
+
+
+def _dates_to_check(returns: pd.DataFrame) -> list:
+    return list(returns.index[::25]) + [
+        returns.index[-1] + pd.Timedelta(days=3),
+        pd.Timestamp("1999-01-01"),
+    ]
+
+
+def test_same_as_stacked_dataframe():
+    returns = _returns()
+    stacked_correlations = _stacked_correlations(returns)
+    results = exponentialCorrelationResults(returns, ew_lookback=100, min_periods=20)
+
+    assert results.raw_correlations.equals(stacked_correlations)
+    for date_point in _dates_to_check(returns):
+        expected = _last_valid_cor_matrix_for_date(
+            stacked_correlations, columns=returns.columns, date_point=date_point
+        )
+        result = results.last_valid_cor_matrix_for_date(date_point)
+        assert result.values.shape == expected.values.shape
+        assert np.array_equal(result.values, expected.values, equal_nan=True)
+
+
+def test_only_keep_some_dates():
+    returns = _returns()
+    stacked_correlations = _stacked_correlations(returns)
+    dates_to_keep = _dates_to_check(returns)
+    results = exponentialCorrelationResults(
+        returns, ew_lookback=100, min_periods=20, dates_to_keep=dates_to_keep
+    )
+
+    for date_point in dates_to_keep:
+        expected = _last_valid_cor_matrix_for_date(
+            stacked_correlations, columns=returns.columns, date_point=date_point
+        )
+        result = results.last_valid_cor_matrix_for_date(date_point)
+        assert np.array_equal(result.values, expected.values, equal_nan=True)
+
+    with pytest.raises(Exception):
+        results.last_valid_cor_matrix_for_date(returns.index[3])
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from sysquant.estimators import forecast_scalar as forecast_scalar_module
+from sysquant.estimators.forecast_scalar import (
+    forecast_scalar,
+    forecast_scalars_for_dict_of_rules,
+)
+
+
+def _cs_forecasts(random_state, dates, instrument_codes) -> pd.DataFrame:
+    cs_forecasts = pd.DataFrame(
+        random_state.normal(0, 5, size=(len(dates), len(instrument_codes))),
+        index=dates,
+        columns=instrument_codes,
+    )
+    # different starts, gaps and zeros
+    for column_number in range(len(instrument_codes)):
+        cs_forecasts.iloc[: 40 * column_number, column_number] = np.nan
+    cs_forecasts[random_state.rand(*cs_forecasts.shape) < 0.05] = np.nan
+    cs_forecasts[random_state.rand(*cs_forecasts.shape) < 0.02] = 0.0
+
+    return cs_forecasts
+
+
+def _dict_of_cs_forecasts() -> dict:
+    random_state = np.random.RandomState(7)
+    dates = pd.bdate_range("2010-01-01", periods=800)
+
+    return dict(
+        ewmac8=_cs_forecasts(random_state, dates, ["US10", "EDOLLAR", "CORN"]),
+        # fewer dates and different instruments
+        carry=_cs_forecasts(random_state, dates[100:][::2], ["GOLD", "CORN"]),
+        # one instrument, so no forward filling
+        momentum=_cs_forecasts(random_state, dates[50:], ["SP500"]),
+    )
+
+
+def test_same_as_forecast_scalar_for_each_rule():
+    dict_of_cs_forecasts = _dict_of_cs_forecasts()
+
+    for kwargs in [dict(), dict(window=100, min_periods=20, backfill=False)]:
+        scaling_factors = forecast_scalars_for_dict_of_rules(
+            dict_of_cs_forecasts, target_abs_forecast=10.0, **kwargs
+        )
+
+        assert list(scaling_factors.keys()) == list(dict_of_cs_forecasts.keys())
+        for rule_name, cs_forecasts in dict_of_cs_forecasts.items():
+            expected = forecast_scalar(cs_forecasts, target_abs_forecast=10.0, **kwargs)
+            pd.testing.assert_series_equal(
+                scaling_factors[rule_name], expected, rtol=1e-10
+            )
+
+
+def test_same_in_chunks(monkeypatch):
+    dict_of_cs_forecasts = _dict_of_cs_forecasts()
+    kwargs = dict(window=100, min_periods=20)
+    all_at_once = forecast_scalars_for_dict_of_rules(dict_of_cs_forecasts, **kwargs)
+
+    monkeypatch.setattr(forecast_scalar_module, "MAX_BYTES_PER_CHUNK", 0)
+    one_rule_at_a_time = forecast_scalars_for_dict_of_rules(
+        dict_of_cs_forecasts, **kwargs
+    )
+
+    for rule_name in dict_of_cs_forecasts.keys():
+        pd.testing.assert_series_equal(
+            all_at_once[rule_name], one_rule_at_a_time[rule_name]
+        )
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from syscore.fileutils import get_filename_for_package
+from syscore.pdutils import pd_readcsv
+from sysquant.estimators.online import (
+    onlineEWMAMean,
+    onlineEWMAStd,
+    onlineRobustVol,
+    onlineMixedVol,
+    onlineRollingQuantile,
+)
+from sysquant.estimators.vol import robust_vol_calc, mixed_vol_calc
+from systems.provided.futures_chapter15.rules import ewmac, ewmac_calc_vol, carry2
+from systems.provided.online_rules import (
+    onlineEWMAC,
+    onlineEWMACCalcVol,
+    onlineCarry,
+    onlineBreakout,
+)
+from systems.provided.rob_system.rules import breakout
+
+
+def _prices() -> pd.Series:
+    # has gaps at the start, and in the middle
+    prices = pd_readcsv(get_filename_for_package("syscore.tests.pricetestdata.csv"))
+    prices = prices.ADJ.copy()
+    prices.iloc[200:205] = np.nan
+
+    return prices
+
+
+def _assert_identical(online_result: pd.Series, batch_result: pd.Series):
+    assert np.array_equal(online_result.values, batch_result.values, equal_nan=True)
+
+
+def test_ewma_mean_and_std():
+    prices = _prices()
+    returns = prices.diff()
+
+    _assert_identical(
+        onlineEWMAMean(span=32).update_with_series(prices), prices.ewm(span=32).mean()
+    )
+    _assert_identical(
+        onlineEWMAMean(com=10, min_periods=5).update_with_series(prices),
+        prices.ewm(com=10, min_periods=5).mean(),
+    )
+    _assert_identical(
+        onlineEWMAStd(span=35, min_periods=10).update_with_series(returns),
+        returns.ewm(span=35, min_periods=10).std(),
+    )
+
+
+def test_rolling_quantile():
+    returns = _prices().diff()
+    _assert_identical(
+        onlineRollingQuantile(50, quantile=0.05, min_periods=20).update_with_series(
+            returns
+        ),
+        returns.rolling(50, min_periods=20).quantile(0.05),
+    )
+
+
+def test_vol():
+    returns = _prices().diff()
+    _assert_identical(
+        onlineRobustVol(floor_days=100, floor_min_periods=20).update_with_series(
+            returns
+        ),
+        robust_vol_calc(returns.copy(), floor_days=100, floor_min_periods=20),
+    )
+    _assert_identical(
+        onlineMixedVol(slow_vol_years=1).update_with_series(returns),
+        mixed_vol_calc(returns.copy(), slow_vol_years=1),
+    )
+
+
+def test_rules():
+    prices = _prices()
+    vol = robust_vol_calc(prices.diff())
+
+    _assert_identical(
+        onlineEWMAC(8, 32).update_with_series(prices, vol), ewmac(prices, vol, 8, 32)
+    )
+    _assert_identical(
+        onlineEWMACCalcVol(8, 32).update_with_series(prices),
+        ewmac_calc_vol(prices, 8, 32),
+    )
+    _assert_identical(
+        onlineCarry(smooth_days=30).update_with_series(prices.pct_change()),
+        carry2(prices.pct_change(), smooth_days=30),
+    )
+    _assert_identical(
+        onlineBreakout(lookback=20).update_with_series(prices),
+        breakout(prices, lookback=20),
+    )
+
+
+def test_update_continues_from_history():
+    prices = _prices()
+    history = prices.iloc[:-10]
+    new_prices = prices.iloc[-10:]
+
+    estimator = onlineEWMAC(8, 32)
+    vol = robust_vol_calc(prices.diff())
+    estimator.update_with_series(history, vol.iloc[:-10])
+    for price, vol_today in zip(new_prices.values, vol.iloc[-10:].values):
+        estimator.update(price, vol_today)
+
+    assert estimator.value == ewmac(prices, vol, 8, 32).iloc[-1]
@@ -0,0 +1,40 @@
+from copy import copy
+
+import numpy as np
+import pandas as pd
+
+from sysdata.config.defaults import get_system_defaults_dict
+from sysquant.optimisation.optimise_over_time import optimiseWeightsOverTime
+from sysquant.returns import returnsForOptimisation
+
+
+def _returns() -> returnsForOptimisation:
+    random_state = np.random.RandomState(7)
+    dates = pd.date_range("2010-01-01", periods=400, freq="W")
+    returns = pd.DataFrame(
+        random_state.normal(0.001, 0.02, size=(len(dates), 4)),
+        index=dates,
+        columns=["ewmac8", "ewmac32", "carry", "breakout"],
+    )
+    # starts later
+    returns.iloc[:150, 3] = np.nan
+
+    return returnsForOptimisation(returns, frequency="W")
+
+
+def _weights(workers: int, method: str) -> pd.DataFrame:
+    weighting_params = copy(get_system_defaults_dict()["forecast_weight_estimate"])
+    weighting_params.pop("func")
+    weighting_params["method"] = method
+    weighting_params["workers"] = workers
+
+    return optimiseWeightsOverTime(_returns(), **weighting_params).weights()
+
+
+def test_process_pool_gives_same_weights():
+    for method in ["handcraft", "shrinkage"]:
+        serial_weights = _weights(workers=1, method=method)
+        pool_weights = _weights(workers=3, method=method)
+
+        assert len(serial_weights.index) > 5
+        assert serial_weights.equals(pool_weights)
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from syscore import merge_data
+from syscore.merge_data import (
+    merge_newer_data,
+    merge_newer_data_given_spike_check_state,
+    spikeCheckState,
+    spike_in_data,
+    _calculate_change_in_avg_units,
+)
+
+
+def _prices(length: int = 3000) -> pd.DataFrame:
+    random_state = np.random.RandomState(11)
+    # daily, then intraday
+    dates = pd.bdate_range("2010-01-01", periods=length // 2).append(
+        pd.date_range("2022-01-03 09:00", periods=length - length // 2, freq="H")
+    )
+    final = 100 + random_state.normal(size=length).cumsum()
+    final[random_state.rand(length) < 0.05] = np.nan
+    final[:3] = np.nan
+
+    return pd.DataFrame(dict(OPEN=final + 0.5, FINAL=final), index=dates)
+
+
+def _assert_same_state(spike_check_state, expected_spike_check_state):
+    # from_data works out the weight in one go, so it can differ in the last place
+    state_as_dict = spike_check_state.as_dict()
+    expected_state_as_dict = expected_spike_check_state.as_dict()
+    assert state_as_dict.pop("weight_of_avg") == pytest.approx(
+        expected_state_as_dict.pop("weight_of_avg"), rel=1e-12
+    )
+    assert state_as_dict == expected_state_as_dict
+
+
+def test_state_gives_same_change_in_avg_units():
+    prices = _prices()
+    expected = _calculate_change_in_avg_units(prices.FINAL)
+
+    spike_check_state = spikeCheckState()
+    list_of_change_in_avg_units = []
+    chunk_starts = [0, 1, 2, 1000, 1001, 2999]
+    for chunk_start, chunk_end in zip(chunk_starts, chunk_starts[1:] + [None]):
+        chunk = prices.FINAL.iloc[chunk_start:chunk_end]
+        change_in_avg_units, spike_check_state = (
+            merge_data._change_in_avg_units_given_spike_check_state(
+                chunk, spike_check_state
+            )
+        )
+        list_of_change_in_avg_units.append(change_in_avg_units)
+
+    result = pd.concat(list_of_change_in_avg_units)
+    pd.testing.assert_series_equal(result, expected, check_exact=True)
+
+    from_data = spikeCheckState.from_data(prices.FINAL)
+    _assert_same_state(from_data, spike_check_state)
+    assert spikeCheckState.from_dict(from_data.as_dict()).as_dict() == (
+        from_data.as_dict()
+    )
+
+
+@pytest.mark.parametrize("spike_position", [None, 1, 50])
+def test_same_decisions_as_merge_newer_data(monkeypatch, spike_position):
+    monkeypatch.setattr(merge_data, "max_spike", 8.0)
+    prices = _prices()
+    old_prices = prices.iloc[:2900]
+    new_prices = prices.iloc[2850:].copy()
+    if spike_position is not None:
+        new_prices.iloc[spike_position + 50, 1] += 100.0
+
+    expected = merge_newer_data(old_prices, new_prices, column_to_check="FINAL")
+    spike_check_state = spikeCheckState.from_data(old_prices.FINAL)
+    result, updated_spike_check_state = merge_newer_data_given_spike_check_state(
+        new_prices, spike_check_state, column_to_check="FINAL"
+    )
+
+    if spike_position is None:
+        pd.testing.assert_frame_equal(result, expected.iloc[2900:], check_exact=True)
+        _assert_same_state(
+            updated_spike_check_state, spikeCheckState.from_data(expected.FINAL)
+        )
+    else:
+        assert expected is spike_in_data
+        assert result is spike_in_data
+        assert updated_spike_check_state is spike_check_state
+
+    result, _ = merge_newer_data_given_spike_check_state(
+        new_prices, spike_check_state, check_for_spike=False, column_to_check="FINAL"
+    )
+    assert len(result) == 100
+
+
+def test_no_existing_data(monkeypatch):
+    monkeypatch.setattr(merge_data, "max_spike", 8.0)
+    prices = _prices(500)
+    prices.iloc[200, 1] += 100.0
+
+    result, _ = merge_newer_data_given_spike_check_state(
+        prices, spikeCheckState(), column_to_check="FINAL"
+    )
+    assert result is spike_in_data
+
+    result, spike_check_state = merge_newer_data_given_spike_check_state(
+        prices.iloc[:150], spikeCheckState(), column_to_check="FINAL"
+    )
+    pd.testing.assert_frame_equal(result, prices.iloc[:150])
+    assert spike_check_state.last_date == prices.index[149]
+
+
+@pytest.mark.parametrize("length", [1, 2, 5])
+def test_from_data_for_short_data(length):
+    # the first few prices are missing
+    prices = _prices(length + 3).FINAL.iloc[3:]
+    _, expected = merge_data._change_in_avg_units_given_spike_check_state(
+        prices, spikeCheckState()
+    )
+
+    spike_check_state = spikeCheckState.from_data(prices)
+    assert spike_check_state.as_dict() == expected.as_dict()
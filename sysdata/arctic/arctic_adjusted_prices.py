@@ -60,3 +60,17 @@ class arcticFuturesAdjustedPricesData(futuresAdjustedPricesData):
             % (len(adjusted_price_data), instrument_code, str(self)),
             instrument_code=instrument_code,
         )
+
+    def _append_adjusted_prices_without_checking(
+        self, instrument_code: str, new_adjusted_price_data: futuresAdjustedPrices
+    ):
+        adjusted_price_data_aspd = pd.DataFrame(new_adjusted_price_data)
+        adjusted_price_data_aspd.columns = ["price"]
+        adjusted_price_data_aspd = adjusted_price_data_aspd.astype(float)
+
+        self.arctic.append(instrument_code, adjusted_price_data_aspd)
+        self.log.msg(
+            "Appended %s lines of prices for %s to %s"
+            % (len(new_adjusted_price_data), instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
@@ -48,6 +48,19 @@ class arcticData(object):
     def write(self, ident: str, data: pd.DataFrame):
         self.library.write(ident, data)
 
+    def append(self, ident: str, data: pd.DataFrame, metadata: dict = None):
+        # only the new rows are written; they must be after the existing data
+        # if metadata is None, the existing metadata is kept
+        self.library.append(ident, data, metadata=metadata)
+
+    def read_metadata(self, ident: str) -> dict:
+        # None if there isn't any
+        return self.library.read_metadata(ident).metadata
+
+    def write_metadata(self, ident: str, metadata: dict):
+        # the data isn't rewritten
+        self.library.write_metadata(ident, metadata)
+
     def get_keynames(self) -> list:
         return self.library.list_symbols()
 
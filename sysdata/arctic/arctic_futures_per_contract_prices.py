@@ -3,6 +3,8 @@ Read and write data from mongodb for individual futures contracts
 
 """
 
+from syscore.merge_data import spikeCheckState
+from syscore.objects import missing_data
 from sysdata.arctic.arctic_connection import arcticData
 from sysdata.futures.futures_per_contract_prices import (
     futuresContractPriceData,
@@ -16,6 +18,9 @@ import pandas as pd
 
 CONTRACT_COLLECTION = "futures_contract_prices"
 
+SPIKE_CHECK_STATE_KEY = "spike_check_state"
+NO_SPIKE_CHECK_STATE = dict()
+
 
 class arcticFuturesContractPriceData(futuresContractPriceData):
     """
@@ -54,6 +59,11 @@ class arcticFuturesContractPriceData(futuresContractPriceData):
 
         return futuresContractPrices(data)
 
+    def _get_prices_for_contract_list_no_checking(
+        self, list_of_contracts: listOfFuturesContracts
+    ) -> list:
+        return self._get_prices_for_contract_list_in_threads(list_of_contracts)
+
     def _write_prices_for_contract_object_no_checking(
         self,
         futures_contract_object: futuresContract,
@@ -79,6 +89,64 @@ class arcticFuturesContractPriceData(futuresContractPriceData):
             % (len(futures_price_data), str(futures_contract_object.key), str(self))
         )
 
+    def _append_prices_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        new_futures_price_data: futuresContractPrices,
+    ):
+        """
+        Add prices after the end of the existing prices, without rewriting them
+
+        :param futures_contract_object: futuresContract
+        :param new_futures_price_data: futuresContractPriceData
+        :return: None
+        """
+
+        log = futures_contract_object.log(self.log)
+        ident = from_contract_to_key(futures_contract_object)
+        new_futures_price_data_as_pd = pd.DataFrame(new_futures_price_data)
+
+        # the spike check state we stored is now out of date
+        self.arctic_connection.append(
+            ident, new_futures_price_data_as_pd, metadata=NO_SPIKE_CHECK_STATE
+        )
+
+        log.msg(
+            "Appended %s lines of prices for %s to %s"
+            % (len(new_futures_price_data), str(futures_contract_object.key), str(self))
+        )
+
+    def _get_spike_check_state_for_contract_object_no_checking(
+        self, futures_contract_object: futuresContract
+    ) -> spikeCheckState:
+        """
+        Stored as metadata with the prices; writing prices removes it, so it can't be
+        out of date
+
+        :param futures_contract_object: futuresContract
+        :return: spikeCheckState or missing_data
+        """
+        ident = from_contract_to_key(futures_contract_object)
+        metadata = self.arctic_connection.read_metadata(ident)
+        if metadata is None:
+            return missing_data
+
+        spike_check_state_as_dict = metadata.get(SPIKE_CHECK_STATE_KEY, None)
+        if spike_check_state_as_dict is None:
+            return missing_data
+
+        return spikeCheckState.from_dict(spike_check_state_as_dict)
+
+    def _write_spike_check_state_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        spike_check_state: spikeCheckState,
+    ):
+        ident = from_contract_to_key(futures_contract_object)
+        self.arctic_connection.write_metadata(
+            ident, {SPIKE_CHECK_STATE_KEY: spike_check_state.as_dict()}
+        )
+
     def get_contracts_with_price_data(self) -> listOfFuturesContracts:
         """
 
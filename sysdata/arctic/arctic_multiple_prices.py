@@ -70,6 +70,20 @@ class arcticFuturesMultiplePricesData(futuresMultiplePricesData):
             instrument_code=instrument_code,
         )
 
+    def _append_multiple_prices_without_checking(
+        self, instrument_code: str, new_multiple_price_data: futuresMultiplePrices
+    ):
+
+        multiple_price_data_aspd = pd.DataFrame(new_multiple_price_data)
+        multiple_price_data_aspd = _change_contracts_to_str(multiple_price_data_aspd)
+
+        self.arctic.append(instrument_code, multiple_price_data_aspd)
+        self.log.msg(
+            "Appended %s lines of prices for %s to %s"
+            % (len(multiple_price_data_aspd), instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
+
 
 def _change_contracts_to_str(multiple_price_data_aspd):
     for price_column in list_of_price_column_names:
@@ -6,6 +6,7 @@ from sysdata.futures.adjusted_prices import (
 from sysobjects.adjusted_prices import futuresAdjustedPrices
 from sysdata.csv.parametric_csv_database import parametricCsvDatabase, ConfigCsvFuturesPrices
 from syscore.objects import arg_not_supplied, missing_data
+from syscore.pdutils import pd_appendcsv, DEFAULT_DATE_FORMAT
 from syslogdiag.log_to_screen import logtoscreen
 from sysobjects.futures_per_contract_prices import FINAL_COLUMN
 
@@ -104,5 +105,28 @@ class csvFuturesAdjustedPricesData(futuresAdjustedPricesData):
         adjusted_price_data_as_dataframe.columns = ["price"]
 
         filename = self.db.filename_given_instrument_code(instrument_code)
-        adjusted_price_data_as_dataframe.to_csv(filename, index_label=DATE_INDEX_NAME)
+        # same date format as appended rows
+        adjusted_price_data_as_dataframe.to_csv(
+            filename, index_label=DATE_INDEX_NAME, date_format=DEFAULT_DATE_FORMAT
+        )
+
+    def _append_adjusted_prices_without_checking(
+        self, instrument_code: str, new_adjusted_price_data: futuresAdjustedPrices
+    ):
+        new_adjusted_price_data_as_dataframe = pd.DataFrame(new_adjusted_price_data)
+        new_adjusted_price_data_as_dataframe.columns = ["price"]
 
+        filename = self.db.filename_given_instrument_code(instrument_code)
+        appended = False
+        if self.db.files_are_in_the_format_we_write():
+            appended = pd_appendcsv(
+                new_adjusted_price_data_as_dataframe,
+                filename,
+                date_index_name=DATE_INDEX_NAME,
+                date_format=DEFAULT_DATE_FORMAT,
+            )
+
+        if not appended:
+            super()._append_adjusted_prices_without_checking(
+                instrument_code, new_adjusted_price_data
+            )
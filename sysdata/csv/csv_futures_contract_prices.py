@@ -6,6 +6,7 @@ from sysobjects.contracts import futuresContract, listOfFuturesContracts
 from syslogdiag.log_to_screen import logtoscreen
 from syscore.objects import arg_not_supplied, missing_instrument
 from syscore.dateutils import DAILY_PRICE_FREQ, Frequency
+from syscore.pdutils import pd_appendcsv
 import datetime
 from sysdata.csv.parametric_csv_database import parametricCsvDatabase, ConfigCsvFuturesPrices
 
@@ -85,6 +86,11 @@ class csvFuturesContractPriceData(futuresContractPriceData):
 
         return instrpricedata
 
+    def _get_prices_for_contract_list_no_checking(
+        self, list_of_contracts: listOfFuturesContracts
+    ) -> list:
+        return self._get_prices_for_contract_list_in_threads(list_of_contracts)
+
     def _write_prices_for_contract_object_no_checking(
         self,
         futures_contract_object: futuresContract,
@@ -100,11 +106,43 @@ class csvFuturesContractPriceData(futuresContractPriceData):
         """
         keyname = self._keyname_given_contract_object(futures_contract_object)
         filename = self.db.filename_given_key_name(keyname)
+        # in the format we read, which is also used for appended rows
         futures_price_data.to_csv(
-            filename, index_label=self.config.input_date_index_name
+            filename,
+            index_label=self.config.input_date_index_name,
+            date_format=self.config.input_date_format,
         )
 
 
+    def _append_prices_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        new_futures_price_data: futuresContractPrices,
+    ):
+        """
+        Add prices to the end of the file, if it's in the format we write
+
+        :param futures_contract_object: futuresContract
+        :param new_futures_price_data: futuresContractPriceData
+        :return: None
+        """
+        keyname = self._keyname_given_contract_object(futures_contract_object)
+        filename = self.db.filename_given_key_name(keyname)
+
+        appended = False
+        if self.db.files_are_in_the_format_we_write():
+            appended = pd_appendcsv(
+                new_futures_price_data,
+                filename,
+                date_index_name=self.config.input_date_index_name,
+                date_format=self.config.input_date_format,
+            )
+
+        if not appended:
+            super()._append_prices_for_contract_object_no_checking(
+                futures_contract_object, new_futures_price_data
+            )
+
     def _delete_prices_for_contract_object_with_no_checks_be_careful(
         self, futures_contract_object: futuresContract
     ):
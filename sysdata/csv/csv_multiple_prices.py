@@ -8,7 +8,7 @@ from sysobjects.multiple_prices import (
 )
 
 from syscore.fileutils import get_filename_for_package, files_with_extension_in_pathname
-from syscore.pdutils import pd_readcsv
+from syscore.pdutils import pd_readcsv, pd_appendcsv, DEFAULT_DATE_FORMAT
 from syscore.genutils import str_of_int
 from syscore.objects import arg_not_supplied
 from syslogdiag.log_to_screen import logtoscreen
@@ -70,13 +70,37 @@ class csvFuturesMultiplePricesData(futuresMultiplePricesData):
     ):
 
         filename = self._filename_given_instrument_code(instrument_code)
-        multiple_price_data.to_csv(filename, index_label=DATE_INDEX_NAME)
+        # same date format as appended rows
+        multiple_price_data.to_csv(
+            filename, index_label=DATE_INDEX_NAME, date_format=DEFAULT_DATE_FORMAT
+        )
 
         self.log.msg(
             "Written multiple prices for %s to %s" % (instrument_code, filename),
             instrument_code=instrument_code,
         )
 
+    def _append_multiple_prices_without_checking(
+        self, instrument_code: str, new_multiple_price_data: futuresMultiplePrices
+    ):
+        filename = self._filename_given_instrument_code(instrument_code)
+        appended = pd_appendcsv(
+            new_multiple_price_data,
+            filename,
+            date_index_name=DATE_INDEX_NAME,
+            date_format=DEFAULT_DATE_FORMAT,
+        )
+        if not appended:
+            super()._append_multiple_prices_without_checking(
+                instrument_code, new_multiple_price_data
+            )
+            return None
+
+        self.log.msg(
+            "Appended multiple prices for %s to %s" % (instrument_code, filename),
+            instrument_code=instrument_code,
+        )
+
     def _read_instrument_prices(self, instrument_code: str) -> pd.DataFrame:
         filename = self._filename_given_instrument_code(instrument_code)
 
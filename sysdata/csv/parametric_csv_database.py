@@ -437,6 +437,18 @@ class parametricCsvDatabase(baseData):
 
         return list_of_instrument_codes
 
+    def files_are_in_the_format_we_write(self) -> bool:
+        # if so we can add rows to the end of a file without rewriting it
+        config = self.config
+
+        return (
+            config.input_column_mapping is None
+            and config.input_date_format == DEFAULT_DATE_FORMAT
+            and config.input_skiprows == 0
+            and config.input_skipfooter == 0
+            and config.instrument_price_multiplier is arg_not_supplied
+        )
+
     def load_and_process_prices(self, filename:str, instrument_code:str) -> DataFrame:
         config = self.config
 
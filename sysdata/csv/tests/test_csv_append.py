@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_futures_contract_prices import csvFuturesContractPriceData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysobjects.contracts import futuresContract
+from sysobjects.futures_per_contract_prices import futuresContractPrices
+
+INSTRUMENT_CODE = "US10"
+
+
+def _dont_rewrite(*args, **kwargs):
+    raise Exception("Should have appended, not rewritten everything")
+
+
+def _contract_prices(dates: pd.DatetimeIndex) -> futuresContractPrices:
+    random_state = np.random.RandomState(len(dates))
+    final = 100 + random_state.normal(size=len(dates)).cumsum() * 0.1
+    prices = pd.DataFrame(
+        dict(
+            OPEN=final,
+            HIGH=final + 0.5,
+            LOW=final - 0.5,
+            FINAL=final,
+            VOLUME=np.full(len(dates), 10.0),
+        ),
+        index=dates,
+    )
+
+    return futuresContractPrices(prices)
+
+
+class TestCsvAppend:
+    def test_update_prices_for_contract(self, tmp_path, monkeypatch):
+        price_data = csvFuturesContractPriceData(datapath=str(tmp_path))
+        contract = futuresContract(INSTRUMENT_CODE, "20220300")
+        dates = pd.date_range("2021-01-04 09:00", periods=300, freq="h")
+        all_prices = _contract_prices(dates)
+
+        price_data.write_prices_for_contract_object(contract, all_prices[:200])
+        monkeypatch.setattr(
+            price_data, "_write_prices_for_contract_object_no_checking", _dont_rewrite
+        )
+        # overlapping new prices; only the rows after the existing ones are added
+        rows_added = price_data.update_prices_for_contract(
+            contract, all_prices[150:], check_for_spike=False
+        )
+
+        assert rows_added == 100
+        pd.testing.assert_frame_equal(
+            price_data.get_prices_for_contract_object(contract),
+            all_prices,
+            check_freq=False,
+            check_names=False,
+        )
+
+    def test_update_multiple_prices(self, tmp_path, monkeypatch):
+        multiple_price_data = csvFuturesMultiplePricesData(datapath=str(tmp_path))
+        all_multiple_prices = csvFuturesMultiplePricesData().get_multiple_prices(
+            INSTRUMENT_CODE
+        )[-300:]
+        existing_multiple_prices = all_multiple_prices[:-50]
+        multiple_price_data.add_multiple_prices(
+            INSTRUMENT_CODE, existing_multiple_prices
+        )
+
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                multiple_price_data,
+                "_add_multiple_prices_without_checking_for_existing_entry",
+                _dont_rewrite,
+            )
+            multiple_price_data.update_multiple_prices(
+                INSTRUMENT_CODE,
+                all_multiple_prices,
+                existing_multiple_prices=existing_multiple_prices,
+            )
+        pd.testing.assert_frame_equal(
+            multiple_price_data.get_multiple_prices(INSTRUMENT_CODE),
+            all_multiple_prices,
+        )
+
+        # an earlier row has changed, so we have to rewrite everything
+        changed_multiple_prices = all_multiple_prices.copy()
+        changed_multiple_prices.iloc[10, 0] = 999.0
+        multiple_price_data.update_multiple_prices(
+            INSTRUMENT_CODE,
+            changed_multiple_prices,
+            existing_multiple_prices=all_multiple_prices,
+        )
+        pd.testing.assert_frame_equal(
+            multiple_price_data.get_multiple_prices(INSTRUMENT_CODE),
+            changed_multiple_prices,
+        )
+
+    def test_update_adjusted_prices(self, tmp_path, monkeypatch):
+        adjusted_price_data = csvFuturesAdjustedPricesData(datapath=str(tmp_path))
+        all_adjusted_prices = csvFuturesAdjustedPricesData().get_adjusted_prices(
+            INSTRUMENT_CODE
+        )[-300:]
+        existing_adjusted_prices = all_adjusted_prices[:-50]
+        adjusted_price_data.add_adjusted_prices(
+            INSTRUMENT_CODE, existing_adjusted_prices
+        )
+
+        monkeypatch.setattr(
+            adjusted_price_data,
+            "_add_adjusted_prices_without_checking_for_existing_entry",
+            _dont_rewrite,
+        )
+        adjusted_price_data.update_adjusted_prices(
+            INSTRUMENT_CODE,
+            all_adjusted_prices,
+            existing_adjusted_prices=existing_adjusted_prices,
+        )
+
+        pd.testing.assert_series_equal(
+            adjusted_price_data.get_adjusted_prices(INSTRUMENT_CODE),
+            all_adjusted_prices,
+            check_names=False,
+            check_series_type=False,
+        )
+
+    def test_appended_dates_in_same_format(self, tmp_path):
+        price_data = csvFuturesContractPriceData(datapath=str(tmp_path))
+        contract = futuresContract(INSTRUMENT_CODE, "20220300")
+        # all at midnight, which pandas would write without the time
+        dates = pd.bdate_range("2021-01-04", periods=20)
+        all_prices = _contract_prices(dates)
+
+        price_data.write_prices_for_contract_object(contract, all_prices[:10])
+        price_data.update_prices_for_contract(
+            contract, all_prices[10:], check_for_spike=False
+        )
+
+        filename = price_data.db.filename_given_key_name(
+            price_data._keyname_given_contract_object(contract)
+        )
+        with open(filename, "r") as csv_file:
+            dates_in_file = [line.split(",")[0] for line in csv_file.readlines()[1:]]
+        assert dates_in_file == [date.strftime("%Y-%m-%d %H:%M:%S") for date in dates]
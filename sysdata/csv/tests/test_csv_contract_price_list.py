@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from sysdata.csv.csv_futures_contract_prices import csvFuturesContractPriceData
+from sysdata.futures import futures_per_contract_prices
+from sysobjects.contracts import futuresContract, listOfFuturesContracts
+from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractPrices
+from sysobjects.futures_per_contract_prices import futuresContractPrices
+
+INSTRUMENT_CODE = "US10"
+
+
+def _contract_prices(seed: int) -> futuresContractPrices:
+    random_state = np.random.RandomState(seed)
+    dates = pd.bdate_range("2021-01-04", periods=100 + seed)
+    final = 100 + random_state.normal(size=len(dates)).cumsum() * 0.1
+    prices = pd.DataFrame(
+        dict(
+            OPEN=final,
+            HIGH=final + 0.5,
+            LOW=final - 0.5,
+            FINAL=final,
+            VOLUME=np.full(len(dates), 10.0),
+        ),
+        index=dates,
+    )
+
+    return futuresContractPrices(prices)
+
+
+def _price_data_with_contracts(tmp_path) -> csvFuturesContractPriceData:
+    price_data = csvFuturesContractPriceData(datapath=str(tmp_path))
+    for seed, date_str in enumerate(["20210300", "20210600", "20210900"]):
+        price_data.write_prices_for_contract_object(
+            futuresContract(INSTRUMENT_CODE, date_str), _contract_prices(seed)
+        )
+
+    return price_data
+
+
+class TestCsvContractPriceList:
+    def test_get_prices_for_contract_list(self, tmp_path, monkeypatch):
+        # so we use more than one thread
+        monkeypatch.setattr(
+            futures_per_contract_prices, "THREADS_FOR_READING_PRICES", 2
+        )
+        price_data = _price_data_with_contracts(tmp_path)
+        list_of_contracts = listOfFuturesContracts(
+            [
+                futuresContract(INSTRUMENT_CODE, date_str)
+                for date_str in ["20210900", "20210300", "20211200"]
+            ]
+        )
+
+        dict_of_prices = price_data.get_prices_for_contract_list(list_of_contracts)
+
+        assert type(dict_of_prices) is dictFuturesContractPrices
+        assert sorted(dict_of_prices.keys()) == ["20210300", "20210900", "20211200"]
+        for contract in list_of_contracts:
+            pd.testing.assert_frame_equal(
+                dict_of_prices[contract.date_str],
+                price_data.get_prices_for_contract_object(contract),
+            )
+        # no prices for this one
+        assert len(dict_of_prices["20211200"]) == 0
+
+    def test_get_all_prices_for_instrument(self, tmp_path):
+        price_data = _price_data_with_contracts(tmp_path)
+
+        dict_of_prices = price_data.get_all_prices_for_instrument(INSTRUMENT_CODE)
+
+        assert sorted(dict_of_prices.keys()) == ["20210300", "20210600", "20210900"]
+        for date_str, prices in dict_of_prices.items():
+            pd.testing.assert_frame_equal(
+                prices,
+                price_data.get_prices_for_contract_object(
+                    futuresContract(INSTRUMENT_CODE, date_str)
+                ),
+            )
@@ -18,6 +18,7 @@ class dataBlob(object):
         log_name: str = "",
         csv_data_paths: dict = arg_not_supplied,
         csv_configs: dict = arg_not_supplied,
+        parquet_store_path: str = arg_not_supplied,
         ib_conn: connectionIB = arg_not_supplied,
         ib_alt_conn: connectionIB=arg_not_supplied,
         mongo_db: mongoDb = arg_not_supplied,
@@ -28,7 +29,7 @@ class dataBlob(object):
         Set up of a data pipeline with standard attribute names, logging, links to DB etc
 
         Class names we know how to handle are:
-        'ib*', 'mongo*', 'arctic*', 'csv*', 'norgate*'
+        'ib*', 'mongo*', 'arctic*', 'csv*', 'norgate*', 'parquet*'
 
             data = dataBlob([ibFuturesContractPriceData, arcticFuturesContractPriceData, mongoFuturesContractData])
 
@@ -67,6 +68,7 @@ class dataBlob(object):
         self._log_name = log_name
         self._csv_data_paths = csv_data_paths
         self._csv_configs = csv_configs
+        self._parquet_store_path = parquet_store_path
         self._keep_original_prefix = keep_original_prefix
 
         self._attr_list = []
@@ -106,7 +108,8 @@ class dataBlob(object):
             csv=self._add_csv_class,
             arctic=self._add_arctic_class,
             mongo=self._add_mongo_class,
-            norgate = self._add_norgate_class
+            norgate = self._add_norgate_class,
+            parquet=self._add_parquet_class,
         )
 
         method_to_add_with = class_dict.get(prefix, None)
@@ -194,6 +197,24 @@ class dataBlob(object):
 
         return resolved_instance
 
+    def _add_parquet_class(self, class_object):
+        log = self._get_specific_logger(class_object)
+        try:
+            resolved_instance = class_object(
+                parquet_store_path=self.parquet_store_path, log=log
+            )
+        except Exception as e:
+            class_name = get_class_name(class_object)
+            msg = (
+                "Error %s couldn't evaluate %s(parquet_store_path=self.parquet_store_path, log = self.log.setup(component = %s)) \
+                        This might be because pyarrow isn't installed\
+                         or arguments don't follow pattern"
+                % (str(e), class_name, class_name)
+            )
+            self._raise_and_log_error(msg)
+
+        return resolved_instance
+
     def _add_csv_class(self, class_object):
         datapath = self._get_csv_paths_for_class(class_object)
         config = self._get_csv_configs_for_class(class_object)
@@ -265,6 +286,19 @@ class dataBlob(object):
         return csv_configs
 
 
+    @property
+    def parquet_store_path(self) -> str:
+        # if not passed in, from 'parquet_store' in private_config.yaml; if that isn't
+        # set the data objects use their default
+        parquet_store_path = getattr(self, "_parquet_store_path", arg_not_supplied)
+        if parquet_store_path is arg_not_supplied:
+            parquet_store_path = self.config.get_element_or_arg_not_supplied(
+                "parquet_store"
+            )
+            self._parquet_store_path = parquet_store_path
+
+        return parquet_store_path
+
     def _get_specific_logger(self, class_object):
         class_name = get_class_name(class_object)
         log = self.log.setup(component=class_name)
@@ -441,7 +475,9 @@ class dataBlob(object):
         return log_name
 
 
-source_dict = dict(arctic="db", mongo="db", csv="db", ib="broker", norgate="broker")
+source_dict = dict(
+    arctic="db", mongo="db", csv="db", parquet="db", ib="broker", norgate="broker"
+)
 
 
 def identifying_name(split_up_name: list, keep_original_prefix=False) -> str:
@@ -455,7 +491,7 @@ def identifying_name(split_up_name: list, keep_original_prefix=False) -> str:
     data_label = lower_split_up_name.pop(-1)  # always 'data'
     original_source_label = lower_split_up_name.pop(
         0
-    )  # always the source, eg csv, ib, mongo or arctic
+    )  # always the source, eg csv, ib, mongo, arctic or parquet
 
     try:
         assert data_label == "data"
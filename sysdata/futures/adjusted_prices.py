@@ -6,6 +6,10 @@ Adjusted prices:
 
 """
 
+import pandas as pd
+
+from syscore.merge_data import rows_added_after_end_of_existing_data
+from syscore.objects import missing_data
 from sysdata.base_data import baseData
 from sysobjects.adjusted_prices import futuresAdjustedPrices
 
@@ -99,6 +103,57 @@ class futuresAdjustedPricesData(baseData):
     ):
         raise NotImplementedError(USE_CHILD_CLASS_ERROR)
 
+    def update_adjusted_prices(
+        self,
+        instrument_code: str,
+        updated_adjusted_prices: futuresAdjustedPrices,
+        existing_adjusted_prices: futuresAdjustedPrices,
+    ):
+        """
+        Replace existing_adjusted_prices, which must be what is currently stored, with
+        updated_adjusted_prices
+
+        If all that has changed is prices added at the end, only those are written
+        """
+        new_prices = rows_added_after_end_of_existing_data(
+            existing_adjusted_prices, updated_adjusted_prices
+        )
+        if new_prices is missing_data or not self.is_code_in_data(instrument_code):
+            self.add_adjusted_prices(
+                instrument_code, updated_adjusted_prices, ignore_duplication=True
+            )
+            return None
+
+        if len(new_prices) == 0:
+            self.log.msg(
+                "No new adjusted prices for %s" % instrument_code,
+                instrument_code=instrument_code,
+            )
+            return None
+
+        self._append_adjusted_prices_without_checking(
+            instrument_code, futuresAdjustedPrices(new_prices)
+        )
+
+        self.log.terse(
+            "Added %d prices for instrument %s" % (len(new_prices), instrument_code),
+            instrument_code=instrument_code,
+        )
+
+    def _append_adjusted_prices_without_checking(
+        self, instrument_code: str, new_adjusted_price_data: futuresAdjustedPrices
+    ):
+        # override if the data source can add rows without rewriting everything
+        existing_adjusted_prices = self._get_adjusted_prices_without_checking(
+            instrument_code
+        )
+        all_adjusted_prices = futuresAdjustedPrices(
+            pd.concat([existing_adjusted_prices, new_adjusted_price_data], axis=0)
+        )
+        self._add_adjusted_prices_without_checking_for_existing_entry(
+            instrument_code, all_adjusted_prices
+        )
+
     def get_list_of_instruments(self) -> list:
         raise NotImplementedError(USE_CHILD_CLASS_ERROR)
 
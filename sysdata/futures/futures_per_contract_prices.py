@@ -1,15 +1,26 @@
+import pandas as pd
+
 from syscore.dateutils import Frequency, DAILY_PRICE_FREQ
-from syscore.merge_data import spike_in_data
+from syscore.merge_data import (
+    spike_in_data,
+    spikeCheckState,
+    merge_newer_data_given_spike_check_state,
+)
+from syscore.objects import missing_data
+from syscore.parallel import map_in_thread_pool
 
 from sysdata.base_data import baseData
 
 from sysobjects.contracts import futuresContract, listOfFuturesContracts
 from sysobjects.contract_dates_and_expiries import listOfContractDateStr
-from sysobjects.futures_per_contract_prices import futuresContractPrices
+from sysobjects.futures_per_contract_prices import futuresContractPrices, FINAL_COLUMN
 from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractPrices
 
 from syslogdiag.log_to_screen import logtoscreen
 
+# for data sources which can read several contracts at once
+THREADS_FOR_READING_PRICES = 8
+
 BASE_CLASS_ERROR = "You have used a base class for futures price data; you need to use a class that inherits with a specific data source"
 
 
@@ -117,13 +128,50 @@ class futuresContractPriceData(baseData):
         list_of_contracts = self.contracts_with_price_data_for_instrument_code(
             instrument_code
         )
-        dict_of_prices = dictFuturesContractPrices(
+        dict_of_prices = self._get_dict_of_prices_for_contracts_with_price_data(
+            list_of_contracts
+        )
+
+        return dict_of_prices
+
+    def get_prices_for_contract_list(
+        self, list_of_contracts: listOfFuturesContracts
+    ) -> dictFuturesContractPrices:
+        """
+        Get prices for several contracts of the same instrument at once, returned as
+        dict keyed by date_str. Empty prices for contracts without any.
+
+        :param list_of_contracts: list of futuresContract
+        :return: dictFuturesContractPrices
+        """
+
+        list_of_contracts_with_price_data = listOfFuturesContracts(
             [
-                (
-                    contract.date_str,
-                    self.get_prices_for_contract_object(contract),
-                )
+                contract
                 for contract in list_of_contracts
+                if self.has_data_for_contract(contract)
+            ]
+        )
+        dict_of_prices = self._get_dict_of_prices_for_contracts_with_price_data(
+            list_of_contracts_with_price_data
+        )
+
+        for contract in list_of_contracts:
+            if contract.date_str not in dict_of_prices:
+                dict_of_prices[contract.date_str] = futuresContractPrices.create_empty()
+
+        return dict_of_prices
+
+    def _get_dict_of_prices_for_contracts_with_price_data(
+        self, list_of_contracts: listOfFuturesContracts
+    ) -> dictFuturesContractPrices:
+        list_of_prices = self._get_prices_for_contract_list_no_checking(
+            list_of_contracts
+        )
+        dict_of_prices = dictFuturesContractPrices(
+            [
+                (contract.date_str, prices)
+                for contract, prices in zip(list_of_contracts, list_of_prices)
             ]
         )
 
@@ -197,7 +245,10 @@ class futuresContractPriceData(baseData):
         check_for_spike: bool = True,
     ) -> int:
         """
-        Reads existing data, merges with new_futures_prices, writes merged data
+        Adds any rows of new_futures_prices after the existing data
+
+        If the data source stores the spike check state of the existing data, we don't
+        need to read the existing data at all
 
         :param new_futures_prices:
         :return: int, number of rows
@@ -208,40 +259,68 @@ class futuresContractPriceData(baseData):
             new_log.msg("No new data")
             return 0
 
-        old_prices = self.get_prices_for_contract_object(contract_object)
-        merged_prices = old_prices.add_rows_to_existing_data(
-            new_futures_per_contract_prices, check_for_spike=check_for_spike
+        spike_check_state = self._get_spike_check_state_for_contract(contract_object)
+        new_prices, updated_spike_check_state = (
+            merge_newer_data_given_spike_check_state(
+                pd.DataFrame(new_futures_per_contract_prices),
+                spike_check_state,
+                check_for_spike=check_for_spike,
+                column_to_check=FINAL_COLUMN,
+            )
         )
 
-        if merged_prices is spike_in_data:
+        if new_prices is spike_in_data:
             new_log.msg(
                 "Price has moved too much - will need to manually check - no price updated done"
             )
             return spike_in_data
 
-        rows_added = len(merged_prices) - len(old_prices)
-
-        if rows_added < 0:
-            new_log.critical("Can't remove prices something gone wrong!")
-            return 0
+        rows_added = len(new_prices)
 
-        elif rows_added == 0:
-            if len(old_prices) == 0:
+        if rows_added == 0:
+            if spike_check_state.no_existing_data:
                 new_log.msg("No existing or additional data")
-                return 0
             else:
-                new_log.msg("No additional data since %s " % str(old_prices.index[-1]))
+                new_log.msg(
+                    "No additional data since %s " % str(spike_check_state.last_date)
+                )
             return 0
 
-        # We have guaranteed no duplication
-        self.write_prices_for_contract_object(
-            contract_object, merged_prices, ignore_duplication=True
+        new_prices = futuresContractPrices(new_prices)
+        if spike_check_state.no_existing_data:
+            # We have guaranteed no duplication
+            self.write_prices_for_contract_object(
+                contract_object, new_prices, ignore_duplication=True
+            )
+        else:
+            self._append_prices_for_contract_object_no_checking(
+                contract_object, new_prices
+            )
+
+        self._write_spike_check_state_for_contract_object_no_checking(
+            contract_object, updated_spike_check_state
         )
 
         new_log.msg("Added %d additional rows of data" % rows_added)
 
         return rows_added
 
+    def _get_spike_check_state_for_contract(
+        self, contract_object: futuresContract
+    ) -> spikeCheckState:
+        if not self.has_data_for_contract(contract_object):
+            return spikeCheckState()
+
+        spike_check_state = self._get_spike_check_state_for_contract_object_no_checking(
+            contract_object
+        )
+        if spike_check_state is missing_data:
+            # not stored, so we have to work it out from all the existing data
+            prices = self._get_prices_for_contract_object_no_checking(contract_object)
+            spike_check_state = spikeCheckState.from_data(prices[FINAL_COLUMN])
+
+        return spike_check_state
+
     def delete_prices_for_contract_object(
         self, futures_contract_object: futuresContract, areyousure=False
     ):
@@ -299,6 +378,55 @@ class futuresContractPriceData(baseData):
 
         raise NotImplementedError(BASE_CLASS_ERROR)
 
+    def _get_spike_check_state_for_contract_object_no_checking(
+        self, contract_object: futuresContract
+    ) -> spikeCheckState:
+        # override if the data source can store the spike check state of the prices;
+        # it must not return a state which is out of date with the prices
+        return missing_data
+
+    def _write_spike_check_state_for_contract_object_no_checking(
+        self, contract_object: futuresContract, spike_check_state: spikeCheckState
+    ):
+        # override if the data source can store the spike check state of the prices
+        pass
+
+    def _append_prices_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        new_futures_price_data: futuresContractPrices,
+    ):
+        # override if the data source can add rows without rewriting everything
+        existing_prices = self._get_prices_for_contract_object_no_checking(
+            futures_contract_object
+        )
+        all_prices = futuresContractPrices(
+            pd.concat([existing_prices, new_futures_price_data], axis=0)
+        )
+        self._write_prices_for_contract_object_no_checking(
+            futures_contract_object, all_prices
+        )
+
+    def _get_prices_for_contract_list_no_checking(
+        self, list_of_contracts: listOfFuturesContracts
+    ) -> list:
+        # override if the data source can read several contracts at once, eg
+        # with _get_prices_for_contract_list_in_threads
+        return [
+            self._get_prices_for_contract_object_no_checking(contract)
+            for contract in list_of_contracts
+        ]
+
+    def _get_prices_for_contract_list_in_threads(
+        self, list_of_contracts: listOfFuturesContracts
+    ) -> list:
+        # for data sources where reading is mostly waiting, so reads can overlap
+        return map_in_thread_pool(
+            self._get_prices_for_contract_object_no_checking,
+            [(contract,) for contract in list_of_contracts],
+            workers=THREADS_FOR_READING_PRICES,
+        )
+
     def _get_prices_at_frequency_for_contract_object_no_checking(
         self, contract_object: futuresContract, freq: Frequency
     ) -> futuresContractPrices:
@@ -10,8 +10,11 @@ We require these to calculate back adjusted prices and also to work out carry
 They can be stored, or worked out 'on the fly'
 """
 
+import pandas as pd
+
 from sysdata.base_data import baseData
-from syscore.objects import success, failure, status
+from syscore.merge_data import rows_added_after_end_of_existing_data
+from syscore.objects import success, failure, status, missing_data
 
 # These are used when inferring prices in an incomplete series
 from sysobjects.multiple_prices import futuresMultiplePrices
@@ -107,6 +110,55 @@ class futuresMultiplePricesData(baseData):
     ):
         raise NotImplementedError(USE_CHILD_CLASS_ERROR)
 
+    def update_multiple_prices(
+        self,
+        instrument_code: str,
+        updated_multiple_prices: futuresMultiplePrices,
+        existing_multiple_prices: futuresMultiplePrices,
+    ) -> status:
+        """
+        Replace existing_multiple_prices, which must be what is currently stored, with
+        updated_multiple_prices
+
+        If all that has changed is rows added at the end, only those are written
+        """
+        log = self.log.setup(instrument_code=instrument_code)
+        new_rows = rows_added_after_end_of_existing_data(
+            existing_multiple_prices, updated_multiple_prices
+        )
+        if new_rows is missing_data or not self.is_code_in_data(instrument_code):
+            return self.add_multiple_prices(
+                instrument_code, updated_multiple_prices, ignore_duplication=True
+            )
+
+        if len(new_rows) == 0:
+            log.msg("No new multiple prices for %s" % instrument_code)
+            return success
+
+        self._append_multiple_prices_without_checking(
+            instrument_code, futuresMultiplePrices(new_rows)
+        )
+
+        log.terse(
+            "Added %d rows of data for instrument %s" % (len(new_rows), instrument_code)
+        )
+
+        return success
+
+    def _append_multiple_prices_without_checking(
+        self, instrument_code: str, new_multiple_price_data: futuresMultiplePrices
+    ):
+        # override if the data source can add rows without rewriting everything
+        existing_multiple_prices = self._get_multiple_prices_without_checking(
+            instrument_code
+        )
+        all_multiple_prices = futuresMultiplePrices(
+            pd.concat([existing_multiple_prices, new_multiple_price_data], axis=0)
+        )
+        self._add_multiple_prices_without_checking_for_existing_entry(
+            instrument_code, all_multiple_prices
+        )
+
     def get_list_of_instruments(self) -> list:
         raise NotImplementedError(USE_CHILD_CLASS_ERROR)
 
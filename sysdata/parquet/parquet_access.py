@@ -0,0 +1,138 @@
+"""
+Time series stored as Parquet files: a directory for each collection, with a file for
+each key in it, eg ~/pysystemtrade_parquet/futures_adjusted_prices/SOFR.parquet
+
+Needs pyarrow, which isn't installed with pysystemtrade: pip install pyarrow
+
+Nothing needs to be running, unlike Arctic which needs mongo DB, and reads only load the
+columns asked for.
+
+Writes go to a temporary file which is then renamed over the existing file, so a
+reader never sees half a file. Parquet files can't be added to, so appending reads and
+rewrites the file; for a single price series that is still quick.
+"""
+
+import json
+import os
+import threading
+
+import pandas as pd
+
+from syscore.fileutils import file_in_home_dir, get_resolved_pathname
+from syscore.objects import arg_not_supplied
+
+DEFAULT_PARQUET_STORE_PATH = file_in_home_dir("pysystemtrade_parquet")
+
+PARQUET_ENGINE = "pyarrow"
+PARQUET_EXTENSION = ".parquet"
+METADATA_EXTENSION = ".metadata.json"
+
+
+class parquetData(object):
+    """
+    All of our Parquet time series use this class; it has the same methods as arcticData
+    """
+
+    def __init__(
+        self, collection_name: str, parquet_store_path: str = arg_not_supplied
+    ):
+        if parquet_store_path is arg_not_supplied:
+            parquet_store_path = DEFAULT_PARQUET_STORE_PATH
+
+        self.collection_name = collection_name
+        self.parquet_store_path = get_resolved_pathname(parquet_store_path)
+        self.collection_path = os.path.join(self.parquet_store_path, collection_name)
+
+    def __repr__(self):
+        return "Parquet files in %s" % self.collection_path
+
+    def read(self, ident: str, columns: list = None) -> pd.DataFrame:
+        """
+        :param columns: list of column names to read, or None for all of them
+        """
+        return pd.read_parquet(
+            self._filename(ident), engine=PARQUET_ENGINE, columns=columns
+        )
+
+    def write(self, ident: str, data: pd.DataFrame):
+        # any metadata is removed first, so it can't be out of date with the data
+        self._delete_metadata(ident)
+        self._write_atomically(
+            self._filename(ident),
+            lambda temp_filename: data.to_parquet(temp_filename, engine=PARQUET_ENGINE),
+        )
+
+    def append(self, ident: str, data: pd.DataFrame):
+        # the new rows must be after the existing data; any metadata is removed
+        existing_data = self.read(ident)
+        all_data = pd.concat([existing_data, data], axis=0)
+        self.write(ident, all_data)
+
+    def read_metadata(self, ident: str) -> dict:
+        # None if there isn't any
+        try:
+            with open(self._metadata_filename(ident), "r") as metadata_file:
+                metadata = json.load(metadata_file)
+        except FileNotFoundError:
+            return None
+
+        return metadata
+
+    def write_metadata(self, ident: str, metadata: dict):
+        # the data isn't rewritten
+        self._write_atomically(
+            self._metadata_filename(ident),
+            lambda temp_filename: _write_json(temp_filename, metadata),
+        )
+
+    def get_keynames(self) -> list:
+        try:
+            all_filenames = os.listdir(self.collection_path)
+        except FileNotFoundError:
+            return []
+
+        return [
+            filename[: -len(PARQUET_EXTENSION)]
+            for filename in all_filenames
+            if filename.endswith(PARQUET_EXTENSION)
+        ]
+
+    def has_keyname(self, keyname: str) -> bool:
+        return os.path.exists(self._filename(keyname))
+
+    def delete(self, ident: str):
+        self._delete_metadata(ident)
+        os.remove(self._filename(ident))
+
+    def _delete_metadata(self, ident: str):
+        try:
+            os.remove(self._metadata_filename(ident))
+        except FileNotFoundError:
+            pass
+
+    def _write_atomically(self, filename: str, write_func):
+        os.makedirs(self.collection_path, exist_ok=True)
+
+        # write then rename, so a reader never sees half a file
+        temp_filename = "%s.%d.%d.tmp" % (
+            filename,
+            os.getpid(),
+            threading.get_ident(),
+        )
+        try:
+            write_func(temp_filename)
+            os.replace(temp_filename, filename)
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+
+    def _filename(self, ident: str) -> str:
+        return os.path.join(self.collection_path, ident + PARQUET_EXTENSION)
+
+    def _metadata_filename(self, ident: str) -> str:
+        return os.path.join(self.collection_path, ident + METADATA_EXTENSION)
+
+
+def _write_json(filename: str, data: dict):
+    with open(filename, "w") as json_file:
+        json.dump(data, json_file)
@@ -0,0 +1,86 @@
+from syscore.objects import arg_not_supplied
+from sysdata.futures.adjusted_prices import (
+    futuresAdjustedPricesData,
+)
+from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysdata.parquet.parquet_access import parquetData
+from syslogdiag.log_to_screen import logtoscreen
+import pandas as pd
+
+ADJPRICE_COLLECTION = "futures_adjusted_prices"
+PRICE_COLUMN_NAME = "price"
+
+
+class parquetFuturesAdjustedPricesData(futuresAdjustedPricesData):
+    """
+    Class to read / write adjusted futures price data to and from Parquet files
+    """
+
+    def __init__(
+        self,
+        parquet_store_path: str = arg_not_supplied,
+        log=logtoscreen("parquetFuturesAdjustedPrices"),
+    ):
+
+        super().__init__(log=log)
+
+        self._parquet = parquetData(
+            ADJPRICE_COLLECTION, parquet_store_path=parquet_store_path
+        )
+
+    def __repr__(self):
+        return repr(self._parquet)
+
+    @property
+    def parquet(self):
+        return self._parquet
+
+    def get_list_of_instruments(self) -> list:
+        return self.parquet.get_keynames()
+
+    def _get_adjusted_prices_without_checking(
+        self, instrument_code: str
+    ) -> futuresAdjustedPrices:
+        data = self.parquet.read(instrument_code, columns=[PRICE_COLUMN_NAME])
+
+        instrpricedata = futuresAdjustedPrices(data[PRICE_COLUMN_NAME])
+
+        return instrpricedata
+
+    def _delete_adjusted_prices_without_any_warning_be_careful(
+        self, instrument_code: str
+    ):
+        self.parquet.delete(instrument_code)
+        self.log.msg(
+            "Deleted adjusted prices for %s from %s" % (instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
+
+    def _add_adjusted_prices_without_checking_for_existing_entry(
+        self, instrument_code: str, adjusted_price_data: futuresAdjustedPrices
+    ):
+        adjusted_price_data_aspd = _adjusted_prices_as_pd(adjusted_price_data)
+        self.parquet.write(instrument_code, adjusted_price_data_aspd)
+        self.log.msg(
+            "Wrote %s lines of prices for %s to %s"
+            % (len(adjusted_price_data), instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
+
+    def _append_adjusted_prices_without_checking(
+        self, instrument_code: str, new_adjusted_price_data: futuresAdjustedPrices
+    ):
+        adjusted_price_data_aspd = _adjusted_prices_as_pd(new_adjusted_price_data)
+        self.parquet.append(instrument_code, adjusted_price_data_aspd)
+        self.log.msg(
+            "Appended %s lines of prices for %s to %s"
+            % (len(new_adjusted_price_data), instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
+
+
+def _adjusted_prices_as_pd(adjusted_price_data: futuresAdjustedPrices) -> pd.DataFrame:
+    adjusted_price_data_aspd = pd.DataFrame(adjusted_price_data)
+    adjusted_price_data_aspd.columns = [PRICE_COLUMN_NAME]
+
+    return adjusted_price_data_aspd.astype(float)
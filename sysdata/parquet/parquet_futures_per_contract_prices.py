@@ -0,0 +1,176 @@
+"""
+Read and write prices for individual futures contracts as Parquet files
+
+"""
+
+import pandas as pd
+
+from syscore.merge_data import spikeCheckState
+from syscore.objects import arg_not_supplied, missing_data
+from sysdata.parquet.parquet_access import parquetData
+from sysdata.futures.futures_per_contract_prices import (
+    futuresContractPriceData,
+    listOfFuturesContracts,
+)
+from sysobjects.futures_per_contract_prices import futuresContractPrices
+from sysobjects.contracts import futuresContract
+from syslogdiag.log_to_screen import logtoscreen
+
+CONTRACT_COLLECTION = "futures_contract_prices"
+
+SPIKE_CHECK_STATE_KEY = "spike_check_state"
+
+
+class parquetFuturesContractPriceData(futuresContractPriceData):
+    """
+    Class to read / write futures price data to and from Parquet files
+    """
+
+    def __init__(
+        self,
+        parquet_store_path: str = arg_not_supplied,
+        log=logtoscreen("parquetFuturesContractPriceData"),
+    ):
+
+        super().__init__(log=log)
+
+        self._parquet = parquetData(
+            CONTRACT_COLLECTION, parquet_store_path=parquet_store_path
+        )
+
+    def __repr__(self):
+        return repr(self._parquet)
+
+    @property
+    def parquet(self):
+        return self._parquet
+
+    def _get_prices_for_contract_object_no_checking(
+        self, futures_contract_object: futuresContract
+    ) -> futuresContractPrices:
+        ident = from_contract_to_key(futures_contract_object)
+        data = self.parquet.read(ident)
+
+        return futuresContractPrices(data)
+
+    def _get_prices_for_contract_list_no_checking(
+        self, list_of_contracts: listOfFuturesContracts
+    ) -> list:
+        return self._get_prices_for_contract_list_in_threads(list_of_contracts)
+
+    def _write_prices_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        futures_price_data: futuresContractPrices,
+    ):
+        log = futures_contract_object.log(self.log)
+        ident = from_contract_to_key(futures_contract_object)
+        futures_price_data_as_pd = pd.DataFrame(futures_price_data)
+
+        self.parquet.write(ident, futures_price_data_as_pd)
+
+        log.msg(
+            "Wrote %s lines of prices for %s to %s"
+            % (len(futures_price_data), str(futures_contract_object.key), str(self))
+        )
+
+    def _append_prices_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        new_futures_price_data: futuresContractPrices,
+    ):
+        log = futures_contract_object.log(self.log)
+        ident = from_contract_to_key(futures_contract_object)
+        new_futures_price_data_as_pd = pd.DataFrame(new_futures_price_data)
+
+        # this also removes the spike check state, which is now out of date
+        self.parquet.append(ident, new_futures_price_data_as_pd)
+
+        log.msg(
+            "Appended %s lines of prices for %s to %s"
+            % (len(new_futures_price_data), str(futures_contract_object.key), str(self))
+        )
+
+    def _get_spike_check_state_for_contract_object_no_checking(
+        self, futures_contract_object: futuresContract
+    ) -> spikeCheckState:
+        """
+        Stored in a file next to the prices; writing prices removes it, so it can't be
+        out of date
+
+        :param futures_contract_object: futuresContract
+        :return: spikeCheckState or missing_data
+        """
+        ident = from_contract_to_key(futures_contract_object)
+        metadata = self.parquet.read_metadata(ident)
+        if metadata is None:
+            return missing_data
+
+        spike_check_state_as_dict = metadata.get(SPIKE_CHECK_STATE_KEY, None)
+        if spike_check_state_as_dict is None:
+            return missing_data
+
+        return _spike_check_state_from_json_dict(spike_check_state_as_dict)
+
+    def _write_spike_check_state_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        spike_check_state: spikeCheckState,
+    ):
+        ident = from_contract_to_key(futures_contract_object)
+        self.parquet.write_metadata(
+            ident,
+            {SPIKE_CHECK_STATE_KEY: _spike_check_state_as_json_dict(spike_check_state)},
+        )
+
+    def get_contracts_with_price_data(self) -> listOfFuturesContracts:
+        list_of_contracts = [
+            futuresContract.from_two_strings(*from_key_to_tuple(keyname))
+            for keyname in self.parquet.get_keynames()
+        ]
+
+        return listOfFuturesContracts(list_of_contracts)
+
+    def has_data_for_contract(self, contract_object: futuresContract) -> bool:
+        return self.parquet.has_keyname(from_contract_to_key(contract_object))
+
+    def _delete_prices_for_contract_object_with_no_checks_be_careful(
+        self, futures_contract_object: futuresContract
+    ):
+        log = futures_contract_object.log(self.log)
+
+        ident = from_contract_to_key(futures_contract_object)
+        self.parquet.delete(ident)
+        log.msg(
+            "Deleted all prices for %s from %s"
+            % (futures_contract_object.key, str(self))
+        )
+
+
+def _spike_check_state_as_json_dict(spike_check_state: spikeCheckState) -> dict:
+    spike_check_state_as_dict = spike_check_state.as_dict()
+    last_date = spike_check_state_as_dict["last_date"]
+    if last_date is not None:
+        spike_check_state_as_dict["last_date"] = pd.Timestamp(last_date).isoformat()
+
+    return spike_check_state_as_dict
+
+
+def _spike_check_state_from_json_dict(spike_check_state_as_dict: dict):
+    last_date = spike_check_state_as_dict["last_date"]
+    if last_date is not None:
+        spike_check_state_as_dict["last_date"] = pd.Timestamp(last_date)
+
+    return spikeCheckState.from_dict(spike_check_state_as_dict)
+
+
+def from_key_to_tuple(keyname):
+    return keyname.split(".")
+
+
+def from_contract_to_key(contract: futuresContract):
+    return from_tuple_to_key([contract.instrument_code, contract.date_str])
+
+
+def from_tuple_to_key(keytuple):
+    return keytuple[0] + "." + keytuple[1]
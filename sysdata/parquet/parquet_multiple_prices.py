@@ -0,0 +1,106 @@
+"""
+Read and write 'multiple prices' as Parquet files
+
+"""
+
+import pandas as pd
+from syscore.objects import arg_not_supplied
+from sysdata.parquet.parquet_access import parquetData
+from sysdata.futures.multiple_prices import (
+    futuresMultiplePricesData,
+)
+from sysobjects.multiple_prices import futuresMultiplePrices
+from sysobjects.dict_of_named_futures_per_contract_prices import (
+    list_of_price_column_names,
+    contract_name_from_column_name,
+)
+from syslogdiag.log_to_screen import logtoscreen
+
+MULTIPLE_COLLECTION = "futures_multiple_prices"
+
+
+class parquetFuturesMultiplePricesData(futuresMultiplePricesData):
+    """
+    Class to read / write multiple futures price data to and from Parquet files
+    """
+
+    def __init__(
+        self,
+        parquet_store_path: str = arg_not_supplied,
+        log=logtoscreen("parquetFuturesMultiplePricesData"),
+    ):
+
+        super().__init__(log=log)
+
+        self._parquet = parquetData(
+            MULTIPLE_COLLECTION, parquet_store_path=parquet_store_path
+        )
+
+    def __repr__(self):
+        return repr(self._parquet)
+
+    @property
+    def parquet(self):
+        return self._parquet
+
+    def get_list_of_instruments(self) -> list:
+        return self.parquet.get_keynames()
+
+    def _get_multiple_prices_without_checking(
+        self, instrument_code: str
+    ) -> futuresMultiplePrices:
+        data = self.parquet.read(instrument_code)
+
+        return futuresMultiplePrices(data)
+
+    def _delete_multiple_prices_without_any_warning_be_careful(
+        self, instrument_code: str
+    ):
+
+        self.parquet.delete(instrument_code)
+        self.log.msg(
+            "Deleted multiple prices for %s from %s" % (instrument_code, str(self))
+        )
+
+    def _add_multiple_prices_without_checking_for_existing_entry(
+        self, instrument_code: str, multiple_price_data_object: futuresMultiplePrices
+    ):
+
+        multiple_price_data_aspd = pd.DataFrame(multiple_price_data_object)
+        multiple_price_data_aspd = _change_contracts_to_str(multiple_price_data_aspd)
+
+        self.parquet.write(instrument_code, multiple_price_data_aspd)
+        self.log.msg(
+            "Wrote %s lines of prices for %s to %s"
+            % (len(multiple_price_data_aspd), instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
+
+    def _append_multiple_prices_without_checking(
+        self, instrument_code: str, new_multiple_price_data: futuresMultiplePrices
+    ):
+
+        multiple_price_data_aspd = pd.DataFrame(new_multiple_price_data)
+        multiple_price_data_aspd = _change_contracts_to_str(multiple_price_data_aspd)
+
+        self.parquet.append(instrument_code, multiple_price_data_aspd)
+        self.log.msg(
+            "Appended %s lines of prices for %s to %s"
+            % (len(multiple_price_data_aspd), instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
+
+
+def _change_contracts_to_str(multiple_price_data_aspd):
+    # Parquet columns have one type, so contract ids can't be a mix of str and int
+    for price_column in list_of_price_column_names:
+        multiple_price_data_aspd[price_column] = multiple_price_data_aspd[
+            price_column
+        ].astype(float)
+
+        contract_column = contract_name_from_column_name(price_column)
+        multiple_price_data_aspd[contract_column] = multiple_price_data_aspd[
+            contract_column
+        ].astype(str)
+
+    return multiple_price_data_aspd
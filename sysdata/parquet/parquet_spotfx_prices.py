@@ -0,0 +1,67 @@
+from syscore.objects import arg_not_supplied
+from sysdata.fx.spotfx import fxPricesData
+from sysobjects.spot_fx_prices import fxPrices
+from sysdata.parquet.parquet_access import parquetData
+from syslogdiag.log_to_screen import logtoscreen
+import pandas as pd
+
+SPOTFX_COLLECTION = "spotfx_prices"
+PRICE_COLUMN_NAME = "price"
+
+
+class parquetFxPricesData(fxPricesData):
+    """
+    Class to read / write fx prices to and from Parquet files
+    """
+
+    def __init__(
+        self,
+        parquet_store_path: str = arg_not_supplied,
+        log=logtoscreen("parquetFxPricesData"),
+    ):
+
+        super().__init__(log=log)
+        self._parquet = parquetData(
+            SPOTFX_COLLECTION, parquet_store_path=parquet_store_path
+        )
+
+    @property
+    def parquet(self):
+        return self._parquet
+
+    def __repr__(self):
+        return repr(self._parquet)
+
+    def get_list_of_fxcodes(self) -> list:
+        return self.parquet.get_keynames()
+
+    def _get_fx_prices_without_checking(self, currency_code: str) -> fxPrices:
+
+        fx_data = self.parquet.read(currency_code, columns=[PRICE_COLUMN_NAME])
+
+        fx_prices = fxPrices(fx_data[PRICE_COLUMN_NAME])
+
+        return fx_prices
+
+    def _delete_fx_prices_without_any_warning_be_careful(self, currency_code: str):
+        self.log.label(currency_code=currency_code)
+        self.parquet.delete(currency_code)
+        self.log.msg(
+            "Deleted fX prices for %s from %s" % (currency_code, str(self)),
+            fx_code=currency_code,
+        )
+
+    def _add_fx_prices_without_checking_for_existing_entry(
+        self, currency_code: str, fx_price_data: fxPrices
+    ):
+        self.log.label(currency_code=currency_code)
+        fx_price_data_aspd = pd.DataFrame(fx_price_data)
+        fx_price_data_aspd.columns = [PRICE_COLUMN_NAME]
+        fx_price_data_aspd = fx_price_data_aspd.astype(float)
+
+        self.parquet.write(currency_code, fx_price_data_aspd)
+        self.log.msg(
+            "Wrote %s lines of prices for %s to %s"
+            % (len(fx_price_data), currency_code, str(self)),
+            fx_code=currency_code,
+        )
@@ -0,0 +1,62 @@
+from syscore.objects import arg_not_supplied
+from sysdata.futures.spreads import spreadsForInstrumentData
+from sysobjects.spreads import spreadsForInstrument
+from sysdata.parquet.parquet_access import parquetData
+from syslogdiag.log_to_screen import logtoscreen
+import pandas as pd
+
+SPREAD_COLLECTION = "spreads"
+SPREAD_COLUMN_NAME = "spread"
+
+
+class parquetSpreadsForInstrumentData(spreadsForInstrumentData):
+    def __init__(
+        self,
+        parquet_store_path: str = arg_not_supplied,
+        log=logtoscreen("parquetSpreadsForInstrument"),
+    ):
+
+        super().__init__(log=log)
+
+        self._parquet = parquetData(
+            SPREAD_COLLECTION, parquet_store_path=parquet_store_path
+        )
+
+    def __repr__(self):
+        return repr(self._parquet)
+
+    @property
+    def parquet(self):
+        return self._parquet
+
+    def get_list_of_instruments(self) -> list:
+        return self.parquet.get_keynames()
+
+    def _get_spreads_without_checking(
+        self, instrument_code: str
+    ) -> spreadsForInstrument:
+        data = self.parquet.read(instrument_code, columns=[SPREAD_COLUMN_NAME])
+
+        spreads = spreadsForInstrument(data[SPREAD_COLUMN_NAME])
+
+        return spreads
+
+    def _delete_spreads_without_any_warning_be_careful(self, instrument_code: str):
+        self.parquet.delete(instrument_code)
+        self.log.msg(
+            "Deleted spreads for %s from %s" % (instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
+
+    def _add_spreads_without_checking_for_existing_entry(
+        self, instrument_code: str, spreads: spreadsForInstrument
+    ):
+        spreads_as_pd = pd.DataFrame(spreads)
+        spreads_as_pd.columns = [SPREAD_COLUMN_NAME]
+        spreads_as_pd = spreads_as_pd.astype(float)
+        self.parquet.write(instrument_code, spreads_as_pd)
+        self.log.msg(
+            "Wrote %s lines of spreads for %s to %s"
+            % (len(spreads_as_pd), instrument_code, str(self)),
+            instrument_code=instrument_code,
+        )
@@ -0,0 +1,180 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from syscore.merge_data import spikeCheckState
+from syscore.objects import missing_data
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.csv.csv_spot_fx import csvFxPricesData
+from sysdata.data_blob import dataBlob
+from sysdata.parquet.parquet_access import parquetData
+from sysdata.parquet.parquet_adjusted_prices import parquetFuturesAdjustedPricesData
+from sysdata.parquet.parquet_futures_per_contract_prices import (
+    parquetFuturesContractPriceData,
+)
+from sysdata.parquet.parquet_multiple_prices import parquetFuturesMultiplePricesData
+from sysdata.parquet.parquet_spotfx_prices import parquetFxPricesData
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from sysdata.sim.parquet_futures_sim_data import parquetFuturesSimData
+from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.contracts import futuresContract
+from sysobjects.futures_per_contract_prices import futuresContractPrices
+from syslogdiag.log_to_screen import logtoscreen
+
+INSTRUMENT_CODE = "US10"
+FX_CODE = "GBPUSD"
+
+
+def _contract_prices(length: int = 200) -> futuresContractPrices:
+    random_state = np.random.RandomState(3)
+    dates = pd.bdate_range("2021-01-04", periods=length)
+    final = 100 + random_state.normal(size=length).cumsum() * 0.1
+    prices = pd.DataFrame(
+        dict(
+            OPEN=final,
+            HIGH=final + 0.5,
+            LOW=final - 0.5,
+            FINAL=final,
+            VOLUME=np.full(length, 10.0),
+        ),
+        index=dates,
+    )
+
+    return futuresContractPrices(prices)
+
+
+def _copy_repo_csv_prices_to_parquet(parquet_store_path: str):
+    parquet_adjusted_prices = parquetFuturesAdjustedPricesData(parquet_store_path)
+    parquet_adjusted_prices.add_adjusted_prices(
+        INSTRUMENT_CODE,
+        csvFuturesAdjustedPricesData().get_adjusted_prices(INSTRUMENT_CODE),
+    )
+    parquet_multiple_prices = parquetFuturesMultiplePricesData(parquet_store_path)
+    parquet_multiple_prices.add_multiple_prices(
+        INSTRUMENT_CODE,
+        csvFuturesMultiplePricesData().get_multiple_prices(INSTRUMENT_CODE),
+    )
+    parquet_fx_prices = parquetFxPricesData(parquet_store_path)
+    parquet_fx_prices.add_fx_prices(FX_CODE, csvFxPricesData().get_fx_prices(FX_CODE))
+
+
+class TestParquetData:
+    def test_contract_prices(self, tmp_path):
+        price_data = parquetFuturesContractPriceData(str(tmp_path))
+        contract = futuresContract(INSTRUMENT_CODE, "20210600")
+        prices = _contract_prices()
+
+        assert not price_data.has_data_for_contract(contract)
+        price_data.write_prices_for_contract_object(contract, prices.iloc[:150])
+        price_data.update_prices_for_contract(contract, prices)
+
+        assert price_data.has_data_for_contract(contract)
+        assert price_data.get_contracts_with_price_data() == [contract]
+        pd.testing.assert_frame_equal(
+            price_data.get_prices_for_contract_object(contract),
+            prices,
+            check_freq=False,
+        )
+
+        # the update stored a spike check state, which is the same as working it out
+        spike_check_state = (
+            price_data._get_spike_check_state_for_contract_object_no_checking(contract)
+        )
+        state_as_dict = spike_check_state.as_dict()
+        expected_state_as_dict = spikeCheckState.from_data(prices.FINAL).as_dict()
+        assert state_as_dict.pop("last_date") == expected_state_as_dict.pop("last_date")
+        assert state_as_dict == pytest.approx(expected_state_as_dict, rel=1e-12)
+
+        # but not once the prices change
+        price_data.write_prices_for_contract_object(
+            contract, prices, ignore_duplication=True
+        )
+        assert (
+            price_data._get_spike_check_state_for_contract_object_no_checking(contract)
+            is missing_data
+        )
+
+        price_data.delete_prices_for_contract_object(contract, areyousure=True)
+        assert not price_data.has_data_for_contract(contract)
+
+    def test_prices_match_csv(self, tmp_path):
+        parquet_store_path = str(tmp_path)
+        _copy_repo_csv_prices_to_parquet(parquet_store_path)
+
+        csv_sim_data = csvFuturesSimData()
+        parquet_sim_data = parquetFuturesSimData(parquet_store_path)
+
+        assert parquet_sim_data.get_instrument_list() == [INSTRUMENT_CODE]
+        pd.testing.assert_frame_equal(
+            parquet_sim_data.get_multiple_prices(INSTRUMENT_CODE),
+            csv_sim_data.get_multiple_prices(INSTRUMENT_CODE),
+        )
+        pd.testing.assert_series_equal(
+            parquet_sim_data.get_backadjusted_futures_price(INSTRUMENT_CODE),
+            csv_sim_data.get_backadjusted_futures_price(INSTRUMENT_CODE),
+            check_names=False,
+        )
+        pd.testing.assert_series_equal(
+            parquet_sim_data.get_fx_for_instrument(INSTRUMENT_CODE, "GBP"),
+            csv_sim_data.get_fx_for_instrument(INSTRUMENT_CODE, "GBP"),
+            check_names=False,
+        )
+
+    def test_append_adjusted_prices(self, tmp_path):
+        adjusted_price_data = parquetFuturesAdjustedPricesData(str(tmp_path))
+        adjusted_prices = csvFuturesAdjustedPricesData().get_adjusted_prices(
+            INSTRUMENT_CODE
+        )
+        adjusted_price_data.add_adjusted_prices(
+            INSTRUMENT_CODE, futuresAdjustedPrices(adjusted_prices.iloc[:-10])
+        )
+
+        adjusted_price_data.update_adjusted_prices(
+            INSTRUMENT_CODE,
+            adjusted_prices,
+            adjusted_price_data.get_adjusted_prices(INSTRUMENT_CODE),
+        )
+
+        pd.testing.assert_series_equal(
+            adjusted_price_data.get_adjusted_prices(INSTRUMENT_CODE),
+            adjusted_prices,
+            check_names=False,
+        )
+
+    def test_failed_write_leaves_existing_file(self, tmp_path):
+        parquet = parquetData("test_collection", parquet_store_path=str(tmp_path))
+        data = pd.DataFrame(
+            dict(price=[1.0, 2.0], other=[3.0, 4.0]),
+            index=pd.date_range("2021-01-01", periods=2),
+        )
+        parquet.write("key", data)
+        pd.testing.assert_frame_equal(
+            parquet.read("key", columns=["price"]), data[["price"]], check_freq=False
+        )
+
+        # can't be written, as Parquet columns have one type
+        bad_data = pd.DataFrame(
+            dict(price=[1.0, "a"]), index=pd.date_range("2021-01-01", periods=2)
+        )
+        with pytest.raises(Exception):
+            parquet.write("key", bad_data)
+
+        pd.testing.assert_frame_equal(parquet.read("key"), data, check_freq=False)
+        assert os.listdir(parquet.collection_path) == ["key.parquet"]
+        assert parquet.get_keynames() == ["key"]
+
+    def test_data_blob(self, tmp_path):
+        data = dataBlob(
+            class_list=[parquetFuturesAdjustedPricesData],
+            parquet_store_path=str(tmp_path),
+            log=logtoscreen("test"),
+        )
+
+        assert data.db_futures_adjusted_prices.parquet.parquet_store_path == str(
+            tmp_path
+        )
@@ -0,0 +1,408 @@
+"""
+Wrap another futures sim data object, caching its data on disk in columnar form
+
+    data = cachedFuturesSimData(csvFuturesSimData())
+    system = futures_system(data=data)
+
+The first run reads from the source as normal and writes each series to an
+uncompressed .npz file (one NumPy array per column); later runs load those files
+instead of parsing .csv files or reading from Arctic.
+
+Each cached item is stamped with the modification time of the .csv file or the
+Arctic version of the symbol it came from, and is reloaded from the source when the
+stamp changes. Sources we can't stamp (eg mongo instrument config) are read once
+per run and held in memory, but not written to disk.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from syscore.fileutils import file_in_home_dir, get_resolved_pathname
+from syscore.objects import arg_not_supplied, missing_data
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_instrument_data import (
+    csvFuturesInstrumentData,
+    get_instrument_with_meta_data_object,
+)
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.csv.csv_roll_parameters import csvRollParametersData
+from sysdata.csv.csv_spot_fx import csvFxPricesData
+from sysdata.sim.futures_sim_data_with_data_blob import genericBlobUsingFuturesSimData
+
+from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.instruments import futuresInstrumentWithMetaData
+from sysobjects.multiple_prices import futuresMultiplePrices
+from sysobjects.rolls import rollParameters
+from sysobjects.spot_fx_prices import (
+    fxPrices,
+    get_fx_tuple_from_code,
+    DEFAULT_CURRENCY,
+)
+
+DEFAULT_SIM_DATA_CACHE_PATH = file_in_home_dir("pysystemtrade_sim_data_cache")
+
+ADJUSTED_PRICES_KIND = "adjusted_prices"
+MULTIPLE_PRICES_KIND = "multiple_prices"
+FX_PRICES_KIND = "fx_prices"
+INSTRUMENT_CONFIG_KIND = "instrument_config"
+ROLL_PARAMETERS_KIND = "roll_parameters"
+ALL_INSTRUMENTS_KEY = "ALL"
+
+no_stamp = object()
+
+
+class cachedFuturesSimData(genericBlobUsingFuturesSimData):
+    """
+    Serves the same data as source_data, from a columnar on disk cache where possible
+    """
+
+    def __init__(
+        self,
+        source_data: genericBlobUsingFuturesSimData,
+        cache_path: str = arg_not_supplied,
+    ):
+        super().__init__(data=source_data.data)
+        if cache_path is arg_not_supplied:
+            cache_path = DEFAULT_SIM_DATA_CACHE_PATH
+
+        self._source_data = source_data
+        self._cache_store = columnarDataCacheStore(cache_path)
+        self._memory_cache = dict()
+
+    def __repr__(self):
+        return "cachedFuturesSimData caching %s in %s" % (
+            str(self.source_data),
+            self.cache_store.cache_path,
+        )
+
+    @property
+    def source_data(self) -> genericBlobUsingFuturesSimData:
+        return self._source_data
+
+    @property
+    def cache_store(self) -> "columnarDataCacheStore":
+        return self._cache_store
+
+    def get_backadjusted_futures_price(
+        self, instrument_code: str
+    ) -> futuresAdjustedPrices:
+        data_object = self.db_futures_adjusted_prices_data
+        data = self._get_cached_or_from_source(
+            data_object,
+            kind=ADJUSTED_PRICES_KIND,
+            key=instrument_code,
+            get_stamp=lambda: _modification_stamp_for_data_object(
+                data_object, instrument_code
+            ),
+            read_from_source=lambda: data_object.get_adjusted_prices(instrument_code),
+        )
+
+        return futuresAdjustedPrices(data)
+
+    def get_multiple_prices_for_date_range(
+        self, instrument_code: str, start_date, end_date
+    ) -> futuresMultiplePrices:
+        data_object = self.db_futures_multiple_prices_data
+        data = self._get_cached_or_from_source(
+            data_object,
+            kind=MULTIPLE_PRICES_KIND,
+            key=instrument_code,
+            get_stamp=lambda: _modification_stamp_for_data_object(
+                data_object, instrument_code
+            ),
+            read_from_source=lambda: data_object.get_multiple_prices(instrument_code),
+        )
+
+        return data[start_date:end_date]
+
+    def _get_fx_data_for_date_range(
+        self, currency1: str, currency2: str, start_date, end_date
+    ) -> fxPrices:
+        fx_code = currency1 + currency2
+        data_object = self.db_fx_prices_data
+        data = self._get_cached_or_from_source(
+            data_object,
+            kind=FX_PRICES_KIND,
+            key=fx_code,
+            get_stamp=lambda: _modification_stamp_for_fx_code(data_object, fx_code),
+            read_from_source=lambda: data_object.get_fx_prices(fx_code),
+        )
+
+        return data[start_date:end_date]
+
+    def get_all_instrument_data_as_df(self) -> pd.DataFrame:
+        all_instrument_data = self._get_all_instrument_config_as_df()
+        instrument_list = self.get_instrument_list()
+        all_instrument_data = all_instrument_data[
+            all_instrument_data.index.isin(instrument_list)
+        ]
+
+        return all_instrument_data
+
+    def get_instrument_object_with_meta_data(
+        self, instrument_code: str
+    ) -> futuresInstrumentWithMetaData:
+        all_instrument_data = self._get_all_instrument_config_as_df()
+        instrument = get_instrument_with_meta_data_object(
+            all_instrument_data, instrument_code
+        )
+
+        return instrument
+
+    def get_roll_parameters(self, instrument_code: str) -> rollParameters:
+        all_roll_parameters = self._get_all_roll_parameters_as_df()
+        roll_parameters_dict = all_roll_parameters.loc[instrument_code].to_dict()
+        roll_parameters = rollParameters.create_from_dict(roll_parameters_dict)
+
+        return roll_parameters
+
+    def _get_all_instrument_config_as_df(self) -> pd.DataFrame:
+        data_object = self.db_futures_instrument_data
+
+        return self._get_cached_or_from_source(
+            data_object,
+            kind=INSTRUMENT_CONFIG_KIND,
+            key=ALL_INSTRUMENTS_KEY,
+            get_stamp=lambda: _modification_stamp_for_data_object(data_object),
+            read_from_source=data_object.get_all_instrument_data_as_df,
+        )
+
+    def _get_all_roll_parameters_as_df(self) -> pd.DataFrame:
+        data_object = self.db_roll_parameters
+
+        return self._get_cached_or_from_source(
+            data_object,
+            kind=ROLL_PARAMETERS_KIND,
+            key=ALL_INSTRUMENTS_KEY,
+            get_stamp=lambda: _modification_stamp_for_data_object(data_object),
+            read_from_source=lambda: _all_roll_parameters_as_df(data_object),
+        )
+
+    def _get_cached_or_from_source(
+        self, data_object, kind: str, key: str, get_stamp, read_from_source
+    ):
+        memory_key = (kind, key)
+        data = self._memory_cache.get(memory_key, missing_data)
+        if data is not missing_data:
+            return data
+
+        source_name = "%s_%s" % (kind, str(data_object))
+        stamp = get_stamp()
+        if stamp is no_stamp:
+            data = read_from_source()
+        else:
+            data = self.cache_store.read(source_name, key=key, stamp=stamp)
+            if data is missing_data:
+                data = read_from_source()
+                if len(data) > 0:
+                    self.cache_store.write(source_name, key=key, stamp=stamp, data=data)
+
+        self._memory_cache[memory_key] = data
+
+        return data
+
+
+class columnarDataCacheStore(object):
+    """
+    Stores pd.Series and pd.DataFrame as uncompressed .npz files, one array per column
+
+    Object columns are stored as strings with a null mask, so there is no pickling
+    """
+
+    def __init__(self, cache_path: str):
+        self._cache_path = get_resolved_pathname(cache_path)
+
+    @property
+    def cache_path(self) -> str:
+        return self._cache_path
+
+    def read(self, source_name: str, key: str, stamp: str):
+        filename = self._filename(source_name, key)
+        try:
+            with np.load(filename, allow_pickle=False) as stored_arrays:
+                stored_stamp = str(stored_arrays["__stamp__"])
+                if stored_stamp != stamp:
+                    return missing_data
+                data = _data_from_arrays(stored_arrays)
+        except (OSError, KeyError, ValueError):
+            return missing_data
+
+        return data
+
+    def write(self, source_name: str, key: str, stamp: str, data):
+        filename = self._filename(source_name, key)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        arrays = _data_as_arrays(data)
+        arrays["__stamp__"] = np.array(stamp)
+
+        # write then rename, so a crashed or concurrent run never sees half a file
+        temp_filename = "%s.%d.tmp" % (filename, os.getpid())
+        with open(temp_filename, "wb") as temp_file:
+            np.savez(temp_file, **arrays)
+        os.replace(temp_filename, filename)
+
+    def _filename(self, source_name: str, key: str) -> str:
+        source_hash = hashlib.md5(source_name.encode("utf-8")).hexdigest()[:16]
+
+        return os.path.join(self.cache_path, source_hash, "%s.npz" % key)
+
+
+def _data_as_arrays(data) -> dict:
+    is_series = isinstance(data, pd.Series)
+    if is_series:
+        data = data.to_frame()
+
+    arrays = dict(__is_series__=np.array(is_series))
+    _add_array(arrays, "__index__", data.index)
+    _add_array(arrays, "__columns__", pd.Series(data.columns, dtype=object))
+    for column_number, column_name in enumerate(data.columns):
+        _add_array(arrays, _column_array_name(column_number), data[column_name])
+
+    return arrays
+
+
+def _data_from_arrays(stored_arrays):
+    index = _get_array(stored_arrays, "__index__")
+    columns = _get_array(stored_arrays, "__columns__")
+    data_as_dict = dict(
+        [
+            (
+                column_number,
+                _get_array(stored_arrays, _column_array_name(column_number)),
+            )
+            for column_number in range(len(columns))
+        ]
+    )
+    data = pd.DataFrame(data_as_dict, index=index)
+    data.columns = columns
+
+    if bool(stored_arrays["__is_series__"]):
+        data = data.iloc[:, 0]
+
+    return data
+
+
+def _column_array_name(column_number: int) -> str:
+    return "column_%d" % column_number
+
+
+def _add_array(arrays: dict, array_name: str, values):
+    values_as_array = np.asarray(values)
+    if values_as_array.dtype == object:
+        is_null = np.asarray(pd.isnull(values), dtype=bool)
+        strings = np.array(
+            [
+                "" if null else str(value)
+                for value, null in zip(values_as_array, is_null)
+            ],
+            dtype=str,
+        )
+        arrays[array_name] = strings
+        arrays[array_name + "__null__"] = is_null
+    else:
+        arrays[array_name] = values_as_array
+
+    if isinstance(values, pd.Index):
+        arrays[array_name + "__name__"] = np.array(
+            "" if values.name is None else str(values.name)
+        )
+
+
+def _get_array(stored_arrays, array_name: str):
+    values = stored_arrays[array_name]
+    null_array_name = array_name + "__null__"
+    if null_array_name in stored_arrays.files:
+        values = values.astype(object)
+        values[stored_arrays[null_array_name]] = np.nan
+
+    name_array_name = array_name + "__name__"
+    if name_array_name in stored_arrays.files:
+        name = str(stored_arrays[name_array_name])
+        values = pd.Index(values, name=None if name == "" else name)
+
+    return values
+
+
+def _all_roll_parameters_as_df(roll_parameters_data) -> pd.DataFrame:
+    instrument_list = roll_parameters_data.get_list_of_instruments()
+    all_roll_parameters = dict(
+        [
+            (
+                instrument_code,
+                roll_parameters_data.get_roll_parameters(instrument_code).as_dict(),
+            )
+            for instrument_code in instrument_list
+        ]
+    )
+
+    return pd.DataFrame.from_dict(all_roll_parameters, orient="index")
+
+
+def _modification_stamp_for_fx_code(fx_prices_data, fx_code: str):
+    # fx prices are all derived from XXXUSD series
+    currency1, currency2 = get_fx_tuple_from_code(fx_code)
+    source_codes = [
+        currency + DEFAULT_CURRENCY
+        for currency in (currency1, currency2)
+        if currency != DEFAULT_CURRENCY
+    ]
+    source_stamps = [
+        _modification_stamp_for_data_object(fx_prices_data, source_code)
+        for source_code in source_codes
+    ]
+    if no_stamp in source_stamps:
+        return no_stamp
+
+    return "/".join(source_stamps)
+
+
+def _modification_stamp_for_data_object(data_object, key: str = ""):
+    """
+    A string which changes when the stored data for key changes, or no_stamp if we can't tell
+    """
+    filename = _csv_filename_for_data_object(data_object, key)
+    if filename is not missing_data:
+        return _file_modification_stamp(filename)
+
+    arctic = getattr(data_object, "arctic", None)
+    if arctic is not None:
+        return _arctic_version_stamp(arctic, key)
+
+    return no_stamp
+
+
+def _csv_filename_for_data_object(data_object, key: str):
+    if isinstance(data_object, csvFuturesAdjustedPricesData):
+        return data_object.db.filename_given_instrument_code(key)
+    elif isinstance(data_object, csvFuturesMultiplePricesData):
+        return data_object._filename_given_instrument_code(key)
+    elif isinstance(data_object, csvFxPricesData):
+        return data_object._filename_given_fx_code(key)
+    elif isinstance(data_object, csvFuturesInstrumentData):
+        return data_object.config_file
+    elif isinstance(data_object, csvRollParametersData):
+        return data_object._config_file
+
+    return missing_data
+
+
+def _file_modification_stamp(filename: str) -> str:
+    try:
+        file_stat = os.stat(filename)
+    except OSError:
+        return "missing"
+
+    return "%d_%d" % (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def _arctic_version_stamp(arctic, key: str) -> str:
+    try:
+        version = arctic.library.read_metadata(key).version
+    except Exception:
+        return "missing"
+
+    return "arctic_%s" % str(version)
@@ -0,0 +1,50 @@
+"""
+Get time series used for futures trading from Parquet files, and configuration from
+.csv files, so no database needs to be running
+
+"""
+
+from syscore.objects import arg_not_supplied
+from sysdata.parquet.parquet_adjusted_prices import parquetFuturesAdjustedPricesData
+from sysdata.parquet.parquet_multiple_prices import parquetFuturesMultiplePricesData
+from sysdata.parquet.parquet_spotfx_prices import parquetFxPricesData
+from sysdata.csv.csv_instrument_data import csvFuturesInstrumentData
+from sysdata.csv.csv_roll_parameters import csvRollParametersData
+
+from sysdata.data_blob import dataBlob
+from sysdata.sim.futures_sim_data_with_data_blob import genericBlobUsingFuturesSimData
+
+from syslogdiag.log_to_screen import logtoscreen
+
+
+class parquetFuturesSimData(genericBlobUsingFuturesSimData):
+    """
+    Uses default paths for .csv files, pass in dict of csv_data_paths to modify
+    """
+
+    def __init__(
+        self,
+        parquet_store_path: str = arg_not_supplied,
+        csv_data_paths=arg_not_supplied,
+        log=logtoscreen("parquetFuturesSimData"),
+    ):
+
+        data = dataBlob(
+            log=log,
+            csv_data_paths=csv_data_paths,
+            parquet_store_path=parquet_store_path,
+            class_list=[
+                parquetFuturesAdjustedPricesData,
+                parquetFuturesMultiplePricesData,
+                parquetFxPricesData,
+                csvFuturesInstrumentData,
+                csvRollParametersData,
+            ],
+        )
+
+        super().__init__(data=data)
+
+    def __repr__(self):
+        return "parquetFuturesSimData object with %d instruments" % len(
+            self.get_instrument_list()
+        )
@@ -0,0 +1,82 @@
+import os
+import shutil
+
+import pandas as pd
+
+from syscore.fileutils import get_filename_for_package
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from sysdata.sim.cached_futures_sim_data import cachedFuturesSimData
+
+INSTRUMENT_CODE = "US10"
+
+
+def _csv_sim_data_with_adjusted_prices_in(adjusted_prices_path: str):
+    return csvFuturesSimData(
+        csv_data_paths=dict(csvFuturesAdjustedPricesData=adjusted_prices_path)
+    )
+
+
+class TestCachedFuturesSimData:
+    def test_cached_data_matches_source(self, tmp_path):
+        cache_path = str(tmp_path)
+        source_data = csvFuturesSimData()
+
+        # first run writes the cache, second run reads from it
+        cachedFuturesSimData(
+            csvFuturesSimData(), cache_path=cache_path
+        ).get_multiple_prices(INSTRUMENT_CODE)
+        cached_data = cachedFuturesSimData(csvFuturesSimData(), cache_path=cache_path)
+
+        pd.testing.assert_frame_equal(
+            cached_data.get_multiple_prices(INSTRUMENT_CODE),
+            source_data.get_multiple_prices(INSTRUMENT_CODE),
+        )
+        pd.testing.assert_series_equal(
+            cached_data.get_backadjusted_futures_price(INSTRUMENT_CODE),
+            source_data.get_backadjusted_futures_price(INSTRUMENT_CODE),
+        )
+        pd.testing.assert_series_equal(
+            cached_data.get_fx_for_instrument(INSTRUMENT_CODE, "GBP"),
+            source_data.get_fx_for_instrument(INSTRUMENT_CODE, "GBP"),
+        )
+        assert (
+            cached_data.get_roll_parameters(INSTRUMENT_CODE).as_dict()
+            == source_data.get_roll_parameters(INSTRUMENT_CODE).as_dict()
+        )
+        assert (
+            cached_data.get_instrument_meta_data(INSTRUMENT_CODE).meta_data
+            == source_data.get_instrument_meta_data(INSTRUMENT_CODE).meta_data
+        )
+
+    def test_cache_invalidated_when_source_changes(self, tmp_path):
+        adjusted_prices_path = str(tmp_path / "adjusted_prices")
+        shutil.copytree(
+            get_filename_for_package("data.futures.adjusted_prices_csv", ""),
+            adjusted_prices_path,
+        )
+        cache_path = str(tmp_path / "cache")
+
+        cached_data = cachedFuturesSimData(
+            _csv_sim_data_with_adjusted_prices_in(adjusted_prices_path),
+            cache_path=cache_path,
+        )
+        original_prices = cached_data.get_backadjusted_futures_price(INSTRUMENT_CODE)
+
+        source_data = _csv_sim_data_with_adjusted_prices_in(adjusted_prices_path)
+        source_data.db_futures_adjusted_prices_data.add_adjusted_prices(
+            INSTRUMENT_CODE, original_prices[:-10], ignore_duplication=True
+        )
+        os.utime(
+            source_data.db_futures_adjusted_prices_data.db.filename_given_instrument_code(
+                INSTRUMENT_CODE
+            ),
+            ns=(0, 0),
+        )
+
+        cached_data = cachedFuturesSimData(
+            _csv_sim_data_with_adjusted_prices_in(adjusted_prices_path),
+            cache_path=cache_path,
+        )
+        updated_prices = cached_data.get_backadjusted_futures_price(INSTRUMENT_CODE)
+
+        assert len(updated_prices) == len(original_prices) - 10
@@ -108,7 +108,11 @@ def process_multiple_prices_single_instrument(
     )
 
     if adjust_calendar_to_prices:
-        roll_calendar = adjust_roll_calendar(instrument_code, roll_calendar)
+        roll_calendar = adjust_roll_calendar(
+            instrument_code,
+            roll_calendar,
+            dict_of_futures_contract_prices=dict_of_futures_contract_closing_prices,
+        )
 
     # Second phantom row is needed in order to process the whole set of closing prices (and not stop after the last roll-over)
     roll_calendar = add_phantom_row(
@@ -133,13 +137,19 @@ def process_multiple_prices_single_instrument(
     return multiple_prices
 
 
-def adjust_roll_calendar(instrument_code, roll_calendar):
-    arctic_prices_per_contract = arcticFuturesContractPriceData()
-    print("Getting prices to adjust roll calendar")
-    dict_of_prices = arctic_prices_per_contract.get_all_prices_for_instrument(
-        instrument_code
-    )
-    dict_of_futures_contract_prices = dict_of_prices.final_prices()
+def adjust_roll_calendar(
+    instrument_code,
+    roll_calendar,
+    dict_of_futures_contract_prices: dictFuturesContractFinalPrices = arg_not_supplied,
+):
+    if dict_of_futures_contract_prices is arg_not_supplied:
+        arctic_prices_per_contract = arcticFuturesContractPriceData()
+        print("Getting prices to adjust roll calendar")
+        dict_of_prices = arctic_prices_per_contract.get_all_prices_for_instrument(
+            instrument_code
+        )
+        dict_of_futures_contract_prices = dict_of_prices.final_prices()
+
     roll_calendar = adjust_to_price_series(
         roll_calendar, dict_of_futures_contract_prices
     )
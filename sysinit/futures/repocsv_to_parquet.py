@@ -0,0 +1,55 @@
+"""
+Copy from csv repo files to Parquet files for adjusted prices, multiple prices and spot
+FX, which is all parquetFuturesSimData needs besides the .csv configuration
+"""
+
+from syscore.objects import arg_not_supplied
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.csv.csv_spot_fx import csvFxPricesData
+from sysdata.parquet.parquet_adjusted_prices import parquetFuturesAdjustedPricesData
+from sysdata.parquet.parquet_multiple_prices import parquetFuturesMultiplePricesData
+from sysdata.parquet.parquet_spotfx_prices import parquetFxPricesData
+
+
+def copy_repo_csv_prices_to_parquet(
+    parquet_store_path: str = arg_not_supplied,
+    csv_adj_datapath: str = arg_not_supplied,
+    csv_multiple_datapath: str = arg_not_supplied,
+    csv_fx_datapath: str = arg_not_supplied,
+):
+    csv_adjusted_prices = csvFuturesAdjustedPricesData(csv_adj_datapath)
+    parquet_adjusted_prices = parquetFuturesAdjustedPricesData(parquet_store_path)
+    for instrument_code in csv_adjusted_prices.get_list_of_instruments():
+        print(instrument_code)
+        parquet_adjusted_prices.add_adjusted_prices(
+            instrument_code,
+            csv_adjusted_prices.get_adjusted_prices(instrument_code),
+            ignore_duplication=True,
+        )
+
+    csv_multiple_prices = csvFuturesMultiplePricesData(csv_multiple_datapath)
+    parquet_multiple_prices = parquetFuturesMultiplePricesData(parquet_store_path)
+    for instrument_code in csv_multiple_prices.get_list_of_instruments():
+        print(instrument_code)
+        parquet_multiple_prices.add_multiple_prices(
+            instrument_code,
+            csv_multiple_prices.get_multiple_prices(instrument_code),
+            ignore_duplication=True,
+        )
+
+    csv_fx_prices = csvFxPricesData(csv_fx_datapath)
+    parquet_fx_prices = parquetFxPricesData(parquet_store_path)
+    for currency_code in csv_fx_prices.get_list_of_fxcodes():
+        print(currency_code)
+        parquet_fx_prices.add_fx_prices(
+            currency_code,
+            csv_fx_prices.get_fx_prices(currency_code),
+            ignore_duplication=True,
+        )
+
+
+if __name__ == "__main__":
+    input("Will overwrite existing prices are you sure?! CTL-C to abort")
+    ## MODIFY PATHS TO USE SOMETHING OTHER THAN DEFAULT
+    copy_repo_csv_prices_to_parquet(parquet_store_path=arg_not_supplied)
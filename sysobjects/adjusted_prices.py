@@ -9,6 +9,7 @@ from sysobjects.dict_of_named_futures_per_contract_prices import (
     price_column_names,
     contract_column_names,
     price_name,
+    forward_name,
     contract_name_from_column_name,
 )
 from sysobjects.multiple_prices import futuresMultiplePrices
@@ -71,6 +72,25 @@ class futuresAdjustedPrices(pd.Series):
 
         return updated_adj
 
+    def update_with_multiple_prices(
+        self, updated_multiple_prices: futuresMultiplePrices
+    ):
+        """
+        Update adjusted prices, allowing for rolls in the new multiple prices
+
+        Only the new part of the multiple prices is stitched; any roll differentials
+        found there are then added to the existing adjusted prices
+
+        :param updated_multiple_prices: futuresMultiplePrices
+        :return: updated adjusted prices
+        """
+
+        updated_adj = _update_adjusted_prices_from_multiple_allowing_rolls(
+            self, updated_multiple_prices
+        )
+
+        return updated_adj
+
 
 def _panama_stitch(
     multiple_prices_input: futuresMultiplePrices, forward_fill: bool = False
@@ -78,6 +98,109 @@ def _panama_stitch(
     """
     Do a panama stitch for adjusted prices
 
+    Vectorised version: roll dates are found with a contract change mask, and the
+    roll differentials are then added to all earlier prices as array slices. The
+    differentials are applied one roll at a time in date order, so the floating
+    point results are identical to the row by row loop in _panama_stitch_with_loop
+
+    :param multiple_prices:  futuresMultiplePrices
+    :return: pd.Series of adjusted prices
+    """
+    multiple_prices = copy(multiple_prices_input)
+
+    if multiple_prices.empty:
+        raise Exception("Can't stitch an empty multiple prices object")
+
+    adjusted_prices, __ = _panama_stitch_with_roll_differentials(multiple_prices)
+
+    return adjusted_prices
+
+
+def _panama_stitch_with_roll_differentials(
+    multiple_prices: futuresMultiplePrices,
+) -> (pd.Series, np.array):
+    """
+    Panama stitch, also returning the roll differentials in date order
+
+    :param multiple_prices:  futuresMultiplePrices, not empty
+    :return: tuple: pd.Series of adjusted prices, np.array of roll differentials
+    """
+    price_contract_column = contract_name_from_column_name(price_name)
+    forward_contract_column = contract_name_from_column_name(forward_name)
+
+    prices = multiple_prices[price_name].to_numpy(dtype=float, copy=True)
+    forward_prices = multiple_prices[forward_name].to_numpy(dtype=float)
+    price_contracts = multiple_prices[price_contract_column].to_numpy()
+
+    roll_index_positions = _roll_index_positions(price_contracts)
+    roll_differentials = (
+        forward_prices[roll_index_positions - 1] - prices[roll_index_positions - 1]
+    )
+    _check_roll_differentials_are_valid(
+        multiple_prices,
+        roll_index_positions=roll_index_positions,
+        roll_differentials=roll_differentials,
+        price_contract_column=price_contract_column,
+        forward_contract_column=forward_contract_column,
+    )
+
+    adjusted_prices_values = prices
+    for roll_index_position, roll_differential in zip(
+        roll_index_positions, roll_differentials
+    ):
+        # We add the roll differential to all previous prices
+        adjusted_prices_values[:roll_index_position] += roll_differential
+
+    adjusted_prices = pd.Series(adjusted_prices_values, index=multiple_prices.index)
+
+    return adjusted_prices, roll_differentials
+
+
+def _roll_index_positions(price_contracts: np.array) -> np.array:
+    """
+    Index positions of the first row priced off a new contract
+    """
+    contract_has_changed = price_contracts[1:] != price_contracts[:-1]
+
+    roll_index_positions = np.nonzero(contract_has_changed)[0] + 1
+
+    return roll_index_positions
+
+
+def _check_roll_differentials_are_valid(
+    multiple_prices: futuresMultiplePrices,
+    roll_index_positions: np.array,
+    roll_differentials: np.array,
+    price_contract_column: str,
+    forward_contract_column: str,
+):
+    missing_differentials = np.isnan(roll_differentials)
+    if not missing_differentials.any():
+        return None
+
+    # report the first missing roll, as the row by row loop would
+    first_missing_roll_position = roll_index_positions[missing_differentials][0]
+    previous_row = multiple_prices.iloc[first_missing_roll_position - 1]
+    roll_date = multiple_prices.index[first_missing_roll_position]
+
+    raise Exception(
+        "On this day %s which should be a roll date we don't have prices for both %s and %s contracts"
+        % (
+            str(roll_date),
+            previous_row[price_contract_column],
+            previous_row[forward_contract_column],
+        )
+    )
+
+
+def _panama_stitch_with_loop(
+    multiple_prices_input: futuresMultiplePrices, forward_fill: bool = False
+) -> pd.Series:
+    """
+    Do a panama stitch for adjusted prices, walking the multiple prices one row at a time
+
+    This is the original, slow, implementation; kept as a reference for _panama_stitch
+
     :param multiple_prices:  futuresMultiplePrices
     :return: pd.Series of adjusted prices
     """
@@ -174,6 +297,83 @@ def _update_adjusted_prices_from_multiple_no_roll(
     return merged_adjusted_prices
 
 
+def _update_adjusted_prices_from_multiple_allowing_rolls(
+    existing_adjusted_prices: futuresAdjustedPrices,
+    updated_multiple_prices: futuresMultiplePrices,
+) -> futuresAdjustedPrices:
+    """
+    Update adjusted prices, with work proportional to the new data only
+
+    Gives the same result as restitching all the multiple prices, as long as the
+    existing adjusted prices were stitched from the same multiple prices
+
+    :param existing_adjusted_prices: futuresAdjustedPrices
+    :param updated_multiple_prices: futuresMultiplePrices
+    :return: updated adjusted prices
+    """
+    if existing_adjusted_prices.empty:
+        return futuresAdjustedPrices.stitch_multiple_prices(updated_multiple_prices)
+
+    last_date_in_current_adj = existing_adjusted_prices.index[-1]
+    multiple_prices_to_stitch = _multiple_prices_from_last_existing_row(
+        existing_adjusted_prices, updated_multiple_prices
+    )
+    if len(multiple_prices_to_stitch) <= 1:
+        # nothing new
+        return futuresAdjustedPrices(copy(existing_adjusted_prices))
+
+    stitched_new_prices, roll_differentials = _panama_stitch_with_roll_differentials(
+        multiple_prices_to_stitch
+    )
+
+    # Rolls in the new data shift all existing prices, one roll at a time
+    #   to match a full restitch
+    existing_adjusted_values = existing_adjusted_prices.to_numpy(
+        dtype=float, copy=True
+    )
+    for roll_differential in roll_differentials:
+        existing_adjusted_values += roll_differential
+
+    shifted_existing_adjusted_prices = pd.Series(
+        existing_adjusted_values, index=existing_adjusted_prices.index
+    )
+    new_adjusted_prices = stitched_new_prices[
+        stitched_new_prices.index > last_date_in_current_adj
+    ]
+    new_adjusted_prices = new_adjusted_prices.dropna()
+
+    merged_adjusted_prices = pd.concat(
+        [shifted_existing_adjusted_prices, new_adjusted_prices], axis=0
+    )
+    merged_adjusted_prices = futuresAdjustedPrices(merged_adjusted_prices)
+
+    return merged_adjusted_prices
+
+
+def _multiple_prices_from_last_existing_row(
+    existing_adjusted_prices: futuresAdjustedPrices,
+    updated_multiple_prices: futuresMultiplePrices,
+) -> futuresMultiplePrices:
+    """
+    Multiple prices after the end of the adjusted prices, plus the row before that
+
+    We need the earlier row, since a roll differential is taken from the row before the roll
+    """
+    last_date_in_current_adj = existing_adjusted_prices.index[-1]
+    multiple_prices_index = updated_multiple_prices.index
+
+    first_row_position = multiple_prices_index.searchsorted(
+        last_date_in_current_adj, side="right"
+    )
+    first_row_position = max(first_row_position - 1, 0)
+
+    multiple_prices_to_stitch = futuresMultiplePrices(
+        updated_multiple_prices.iloc[first_row_position:]
+    )
+
+    return multiple_prices_to_stitch
+
+
 def _calc_new_multiple_prices(
     existing_adjusted_prices: futuresAdjustedPrices,
     updated_multiple_prices: futuresMultiplePrices,
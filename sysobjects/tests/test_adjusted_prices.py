@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysobjects.adjusted_prices import (
+    futuresAdjustedPrices,
+    _panama_stitch,
+    _panama_stitch_with_loop,
+)
+from sysobjects.multiple_prices import futuresMultiplePrices
+
+
+def _small_multiple_prices() -> futuresMultiplePrices:
+    index = pd.date_range("2020-01-01", periods=6)
+    data = pd.DataFrame(
+        dict(
+            CARRY=[np.nan] * 6,
+            CARRY_CONTRACT=["20200100"] * 6,
+            PRICE=[100.0, 101.0, 103.5, np.nan, 104.2, 106.1],
+            PRICE_CONTRACT=[
+                "20200300",
+                "20200300",
+                "20200600",
+                "20200600",
+                "20200600",
+                "20200900",
+            ],
+            FORWARD=[101.3, 102.2, 104.7, 105.0, 105.9, np.nan],
+            FORWARD_CONTRACT=[
+                "20200600",
+                "20200600",
+                "20200900",
+                "20200900",
+                "20200900",
+                "20201200",
+            ],
+        ),
+        index=index,
+    )
+
+    return futuresMultiplePrices(data)
+
+
+class TestPanamaStitch:
+    def test_stitch_matches_loop(self):
+        multiple_prices = _small_multiple_prices()
+
+        vectorised = _panama_stitch(multiple_prices)
+        looped = _panama_stitch_with_loop(multiple_prices)
+
+        assert vectorised.index.equals(looped.index)
+        np.testing.assert_array_equal(vectorised.values, looped.values)
+
+    def test_stitch_missing_forward_on_roll(self):
+        multiple_prices = _small_multiple_prices()
+        multiple_prices.iloc[4, multiple_prices.columns.get_loc("FORWARD")] = np.nan
+
+        with pytest.raises(Exception) as vectorised_error:
+            _panama_stitch(multiple_prices)
+        with pytest.raises(Exception) as looped_error:
+            _panama_stitch_with_loop(multiple_prices)
+
+        assert str(vectorised_error.value) == str(looped_error.value)
+        assert "20200600 and 20200900" in str(vectorised_error.value)
+
+    def test_stitch_matches_loop_on_csv_data(self):
+        multiple_prices = csvFuturesMultiplePricesData().get_multiple_prices(
+            "US10"
+        )
+        multiple_prices = futuresMultiplePrices(multiple_prices.tail(5000))
+
+        vectorised = futuresAdjustedPrices.stitch_multiple_prices(multiple_prices)
+        looped = _panama_stitch_with_loop(multiple_prices)
+
+        np.testing.assert_array_equal(vectorised.values, looped.values)
+
+
+class TestIncrementalUpdate:
+    def test_update_with_roll_matches_full_stitch(self):
+        multiple_prices = _small_multiple_prices()
+        existing_adjusted_prices = futuresAdjustedPrices.stitch_multiple_prices(
+            futuresMultiplePrices(multiple_prices.iloc[:2])
+        )
+
+        updated_adjusted_prices = existing_adjusted_prices.update_with_multiple_prices(
+            multiple_prices
+        )
+        full_stitch = futuresAdjustedPrices.stitch_multiple_prices(multiple_prices)
+
+        pd.testing.assert_series_equal(
+            updated_adjusted_prices.dropna(), full_stitch.dropna()
+        )
+
+    def test_update_with_rolls_matches_full_stitch_on_csv_data(self):
+        multiple_prices = csvFuturesMultiplePricesData().get_multiple_prices(
+            "US10"
+        )
+        existing_adjusted_prices = futuresAdjustedPrices.stitch_multiple_prices(
+            futuresMultiplePrices(multiple_prices.iloc[:-1000])
+        )
+
+        updated_adjusted_prices = existing_adjusted_prices.update_with_multiple_prices(
+            multiple_prices
+        )
+        full_stitch = futuresAdjustedPrices.stitch_multiple_prices(multiple_prices)
+
+        new_rows = multiple_prices.iloc[-1000:]
+        assert (new_rows.PRICE_CONTRACT != new_rows.PRICE_CONTRACT.shift(1)).sum() > 1
+        np.testing.assert_array_equal(
+            updated_adjusted_prices.dropna().values, full_stitch.dropna().values
+        )
+
+    def test_update_with_no_new_data(self):
+        multiple_prices = _small_multiple_prices()
+        existing_adjusted_prices = futuresAdjustedPrices.stitch_multiple_prices(
+            multiple_prices
+        )
+
+        updated_adjusted_prices = existing_adjusted_prices.update_with_multiple_prices(
+            multiple_prices
+        )
+
+        pd.testing.assert_series_equal(updated_adjusted_prices, existing_adjusted_prices)
@@ -25,6 +25,12 @@ from sysproduction.data.strategies import (
     diagStrategiesConfig,
 )
 
+from systems.persistent_cache import (
+    config_fingerprint,
+    CONFIG_ELEMENT_NAME as SYSTEM_CACHE_CONFIG_ELEMENT_NAME,
+)
+from systems.system_cache import cacheRef
+
 
 PICKLE_EXT = ".pck"
 CONFIG_EXT = ".yaml"
@@ -33,6 +39,15 @@ CONFIG_FILE_SUFFIX = "_config"
 PICKLE_SUFFIX = PICKLE_FILE_SUFFIX + PICKLE_EXT
 CONFIG_SUFFIX = CONFIG_FILE_SUFFIX + CONFIG_EXT
 
+INCREMENTAL_BACKTEST_CONFIG_ELEMENT_NAME = "incremental_backtest"
+# capital changes every day, but doesn't affect any estimates
+CONFIG_ELEMENTS_NOT_AFFECTING_ESTIMATES = [
+    "notional_trading_capital",
+    INCREMENTAL_BACKTEST_CONFIG_ELEMENT_NAME,
+    SYSTEM_CACHE_CONFIG_ELEMENT_NAME,
+]
+ESTIMATES_STATE_CACHE_REF = cacheRef("incremental_backtest", "estimates_state")
+
 
 def user_choose_backtest(data: dataBlob = arg_not_supplied) -> interactiveBacktest:
     (
@@ -191,6 +206,138 @@ def load_backtest_state(system, strategy_name, date_time_signature):
     return system
 
 
+def prepare_system_for_incremental_backtest(
+    data: dataBlob, system, strategy_name: str
+) -> bool:
+    """
+    Restore slowly changing estimates (forecast scalars, weights, diversification
+    multipliers) from the most recent stored backtest into the cache of a new system,
+    so running it only has to calculate the time series with the latest prices
+
+    Time series (vol, forecasts, positions...) are calculated from scratch every time,
+    so recursive calculations like EWMA vol and smoothed forecasts come out exactly as
+    they would in a full backtest. Restored estimates are carried forward to new dates.
+
+    The estimates are done again from scratch if there is no stored backtest, if the
+    config (apart from capital) or instruments have changed, or every
+    incremental_backtest: full_backtest_every_days
+
+    :param data: data object, used to access the log
+    :param system: a system object which hasn't run yet
+    :param strategy_name: str
+
+    :return: True if estimates were restored, False if this will be a full backtest
+    """
+    estimates_state = _current_estimates_state(system)
+    restored = _restore_estimates_if_still_valid(
+        data, system, strategy_name=strategy_name, estimates_state=estimates_state
+    )
+    if not restored:
+        system.cache.delete_all_items(delete_protected=True)
+        system.cache.set_item_in_cache(
+            estimates_state, ESTIMATES_STATE_CACHE_REF, protected=True
+        )
+
+    return restored
+
+
+def _current_estimates_state(system) -> dict:
+    return dict(
+        config_fingerprint=config_fingerprint(
+            system.config, elements_to_ignore=CONFIG_ELEMENTS_NOT_AFFECTING_ESTIMATES
+        ),
+        instrument_list=sorted(system.get_instrument_list()),
+        datetime=datetime.datetime.now(),
+    )
+
+
+def _restore_estimates_if_still_valid(
+    data: dataBlob, system, strategy_name: str, estimates_state: dict
+) -> bool:
+    ensure_backtest_directory_exists(strategy_name)
+    list_of_timestamps = sorted(get_list_of_timestamps_for_strategy(strategy_name))
+    if len(list_of_timestamps) == 0:
+        data.log.msg("No stored backtest for %s: running full backtest" % strategy_name)
+        return False
+
+    # most recent last
+    timestamp = list_of_timestamps[-1]
+    try:
+        load_backtest_state(system, strategy_name, timestamp)
+    except Exception as e:
+        data.log.warn(
+            "Couldn't load backtest state %s for %s error %s: running full backtest"
+            % (timestamp, strategy_name, e)
+        )
+        return False
+
+    reason = _reason_estimates_need_recalculating(system, estimates_state)
+    if reason is not None:
+        data.log.msg(
+            "Running full backtest for %s, since %s" % (strategy_name, reason)
+        )
+        return False
+
+    _delete_all_items_except_estimates(system)
+    data.log.msg(
+        "Incremental backtest for %s, reusing estimates from backtest %s"
+        % (strategy_name, timestamp)
+    )
+
+    return True
+
+
+def _reason_estimates_need_recalculating(system, estimates_state: dict):
+    previous_cache_element = system.cache.get(ESTIMATES_STATE_CACHE_REF, missing_data)
+    if previous_cache_element is missing_data:
+        return "stored backtest has no estimates state"
+
+    previous_estimates_state = previous_cache_element.value()
+    if (
+        previous_estimates_state["config_fingerprint"]
+        != estimates_state["config_fingerprint"]
+    ):
+        return "config has changed"
+
+    if previous_estimates_state["instrument_list"] != estimates_state["instrument_list"]:
+        return "instruments have changed"
+
+    full_backtest_every_days = _incremental_backtest_config(system)[
+        "full_backtest_every_days"
+    ]
+    age_of_estimates = estimates_state["datetime"] - previous_estimates_state["datetime"]
+    if age_of_estimates >= datetime.timedelta(days=full_backtest_every_days):
+        return "estimates are more than %d days old" % full_backtest_every_days
+
+    return None
+
+
+def _delete_all_items_except_estimates(system):
+    estimates_to_keep = _incremental_backtest_config(system)["estimates_to_keep"]
+    list_of_cache_refs_to_delete = [
+        cache_ref
+        for cache_ref in system.cache.get_items_with_data()
+        if not _is_estimate_to_keep(cache_ref, estimates_to_keep)
+    ]
+    system.cache.delete_elements_in_cache_ref_list(
+        list_of_cache_refs_to_delete, delete_protected=True
+    )
+
+
+def _is_estimate_to_keep(cache_ref: cacheRef, estimates_to_keep: dict) -> bool:
+    if cache_ref == ESTIMATES_STATE_CACHE_REF:
+        return True
+    itemnames_to_keep = estimates_to_keep.get(cache_ref.stage_name, [])
+
+    return cache_ref.itemname in itemnames_to_keep
+
+
+def _incremental_backtest_config(system) -> dict:
+    return system.config.get_element_or_missing_data(
+        INCREMENTAL_BACKTEST_CONFIG_ELEMENT_NAME
+    )
+
+
 def store_backtest_state(data, system, strategy_name="default_strategy"):
     """
     Store a pickled backtest state and backtest config for a system
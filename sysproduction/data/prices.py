@@ -3,7 +3,7 @@ import datetime
 from syscore.objects import missing_contract, arg_not_supplied, missing_data
 from syscore.dateutils import Frequency, from_config_frequency_to_frequency
 
-from sysobjects.contracts import futuresContract
+from sysobjects.contracts import futuresContract, listOfFuturesContracts
 from sysobjects.dict_of_futures_per_contract_prices import (
     dictFuturesContractPrices,
     get_last_matched_date_and_prices_for_contract_list,
@@ -160,16 +160,23 @@ class diagPrices(productionDataLayerGeneric):
     def get_dict_of_prices_for_contract_list(
         self, instrument_code: str, list_of_contract_date_str: list
     ) -> dictFuturesContractPrices:
-        dict_of_prices = {}
-        for contract_date_str in list_of_contract_date_str:
-            if contract_date_str is missing_contract:
-                continue
-            # Could blow up here if don't have prices for a contract??
-            contract = futuresContract(instrument_code, contract_date_str)
-            prices = self.get_prices_for_contract_object(contract)
-            dict_of_prices[contract_date_str] = prices
+        list_of_contracts = listOfFuturesContracts(
+            [
+                futuresContract(instrument_code, contract_date_str)
+                for contract_date_str in list_of_contract_date_str
+                if contract_date_str is not missing_contract
+            ]
+        )
+        dict_of_prices = self.get_prices_for_contract_list(list_of_contracts)
 
-        dict_of_prices = dictFuturesContractPrices(dict_of_prices)
+        return dict_of_prices
+
+    def get_prices_for_contract_list(
+        self, list_of_contracts: listOfFuturesContracts
+    ) -> dictFuturesContractPrices:
+        dict_of_prices = self.db_futures_contract_price_data.get_prices_for_contract_list(
+            list_of_contracts
+        )
 
         return dict_of_prices
 
@@ -248,6 +255,30 @@ class updatePrices(productionDataLayerGeneric):
             ignore_duplication=ignore_duplication,
         )
 
+    def update_multiple_prices(
+        self,
+        instrument_code: str,
+        updated_multiple_prices: futuresMultiplePrices,
+        existing_multiple_prices: futuresMultiplePrices,
+    ):
+        self.db_futures_multiple_prices_data.update_multiple_prices(
+            instrument_code,
+            updated_multiple_prices,
+            existing_multiple_prices=existing_multiple_prices,
+        )
+
+    def update_adjusted_prices(
+        self,
+        instrument_code: str,
+        updated_adjusted_prices: futuresAdjustedPrices,
+        existing_adjusted_prices: futuresAdjustedPrices,
+    ):
+        self.db_futures_adjusted_prices_data.update_adjusted_prices(
+            instrument_code,
+            updated_adjusted_prices,
+            existing_adjusted_prices=existing_adjusted_prices,
+        )
+
     def add_spread_entry(self, instrument_code: str, spread: float):
         self.db_spreads_for_instrument_data.add_spread_entry(
             instrument_code, spread=spread
@@ -251,7 +251,7 @@ class rollingAdjustedAndMultiplePrices(object):
 
             new_adjusted_prices = (
                 self._new_adjusted_prices
-            ) = futuresAdjustedPrices.stitch_multiple_prices(
+            ) = self.current_adjusted_prices.update_with_multiple_prices(
                 self.updated_multiple_prices
             )
 
@@ -51,6 +51,7 @@ class runSystemCarryTrendDynamic(runSystemClassic):
             notional_trading_capital=notional_trading_capital,
             base_currency=base_currency,
         )
+        self._restore_estimates_if_incremental(system)
 
         ## This is the difference here
         updated_optimal_positions(data, strategy_name, system)
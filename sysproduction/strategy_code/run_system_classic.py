@@ -6,6 +6,10 @@ this:
 - gets the final positions and position buffers
 - writes these into a table (earmarked with a strategy name)
 
+With incremental=True (set in the run_systems process configuration), estimates are
+reused from the last stored backtest rather than done again every night; see
+sysproduction.data.backtest.prepare_system_for_incremental_backtest
+
 
 """
 
@@ -23,7 +27,10 @@ from sysproduction.data.contracts import dataContracts
 from sysproduction.data.positions import dataOptimalPositions
 from sysproduction.data.sim_data import get_sim_data_object_for_production
 
-from sysproduction.data.backtest import store_backtest_state
+from sysproduction.data.backtest import (
+    store_backtest_state,
+    prepare_system_for_incremental_backtest,
+)
 
 from syslogdiag.log_to_screen import logtoscreen
 
@@ -37,6 +44,7 @@ class runSystemClassic(object):
         data: dataBlob,
         strategy_name: str,
         backtest_config_filename=arg_not_supplied,
+        incremental: bool = False,
     ):
 
         if backtest_config_filename is arg_not_supplied:
@@ -45,6 +53,7 @@ class runSystemClassic(object):
         self.data = data
         self.strategy_name = strategy_name
         self.backtest_config_filename = backtest_config_filename
+        self.incremental = incremental
 
     def run_backtest(self):
         strategy_name = self.strategy_name
@@ -56,11 +65,18 @@ class runSystemClassic(object):
             notional_trading_capital=notional_trading_capital,
             base_currency=base_currency,
         )
+        self._restore_estimates_if_incremental(system)
 
         updated_buffered_positions(data, strategy_name, system)
 
         store_backtest_state(data, system, strategy_name=strategy_name)
 
+    def _restore_estimates_if_incremental(self, system: System):
+        if self.incremental:
+            prepare_system_for_incremental_backtest(
+                self.data, system, strategy_name=self.strategy_name
+            )
+
     def _get_currency_and_capital(self):
         data = self.data
         strategy_name = self.strategy_name
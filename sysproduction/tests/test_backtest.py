@@ -0,0 +1,157 @@
+import datetime
+
+import pytest
+
+from sysdata.config.configdata import Config
+from sysdata.data_blob import dataBlob
+from sysdata.sim.sim_data import simData
+from syslogdiag.log_to_screen import logtoscreen
+from sysproduction.data import backtest
+from sysproduction.data.backtest import (
+    ESTIMATES_STATE_CACHE_REF,
+    prepare_system_for_incremental_backtest,
+    store_backtest_state,
+)
+from sysproduction.strategy_code.run_system_classic import runSystemClassic
+from systems.basesystem import System
+from systems.stage import SystemStage
+from systems.system_cache import diagnostic
+
+STRATEGY_NAME = "test_strategy"
+
+
+class estimatingStage(SystemStage):
+    def __init__(self):
+        self.estimate_count = 0
+
+    @property
+    def name(self):
+        return "test_stage"
+
+    @diagnostic(protected=True)
+    def slow_estimate(self, instrument_code):
+        self.estimate_count += 1
+        return 2.0
+
+    @diagnostic(protected=True)
+    def other_protected_item(self, instrument_code):
+        return 3.0
+
+    @diagnostic()
+    def time_series(self, instrument_code):
+        return self.slow_estimate(instrument_code) * self.other_protected_item(
+            instrument_code
+        )
+
+
+def _system(instruments: list = ["code"], **config_elements) -> System:
+    config = Config(
+        dict(
+            instruments=instruments,
+            incremental_backtest=dict(
+                full_backtest_every_days=7,
+                estimates_to_keep=dict(test_stage=["slow_estimate"]),
+            ),
+            **config_elements
+        )
+    )
+
+    return System([estimatingStage()], simData(), config)
+
+
+def _run_and_store_backtest(data: dataBlob, system: System, age_in_days: int = 0):
+    prepare_system_for_incremental_backtest(data, system, strategy_name=STRATEGY_NAME)
+    system.test_stage.time_series("code")
+
+    if age_in_days > 0:
+        estimates_state = system.cache[ESTIMATES_STATE_CACHE_REF].value()
+        estimates_state["datetime"] -= datetime.timedelta(days=age_in_days)
+
+    store_backtest_state(data, system, strategy_name=STRATEGY_NAME)
+
+
+@pytest.fixture
+def data(tmp_path, monkeypatch) -> dataBlob:
+    monkeypatch.setattr(
+        backtest, "get_directory_store_backtests", lambda: str(tmp_path)
+    )
+
+    return dataBlob(log=logtoscreen("test_backtest"))
+
+
+class TestIncrementalBacktest:
+    def test_estimates_restored(self, data):
+        _run_and_store_backtest(data, _system())
+
+        system = _system(notional_trading_capital=2000000)
+        assert prepare_system_for_incremental_backtest(
+            data, system, strategy_name=STRATEGY_NAME
+        )
+        system.test_stage.time_series("code")
+        assert system.test_stage.estimate_count == 0
+
+    def test_no_stored_backtest(self, data):
+        system = _system()
+        assert not prepare_system_for_incremental_backtest(
+            data, system, strategy_name=STRATEGY_NAME
+        )
+        system.test_stage.time_series("code")
+        assert system.test_stage.estimate_count == 1
+
+    def test_config_changed(self, data):
+        _run_and_store_backtest(data, _system())
+
+        system = _system(percentage_vol_target=25.0)
+        assert not prepare_system_for_incremental_backtest(
+            data, system, strategy_name=STRATEGY_NAME
+        )
+        system.test_stage.time_series("code")
+        assert system.test_stage.estimate_count == 1
+
+    def test_instruments_changed(self, data):
+        _run_and_store_backtest(data, _system())
+
+        system = _system(instruments=["code", "another_code"])
+        assert not prepare_system_for_incremental_backtest(
+            data, system, strategy_name=STRATEGY_NAME
+        )
+        system.test_stage.time_series("code")
+        assert system.test_stage.estimate_count == 1
+
+    def test_estimates_too_old(self, data):
+        _run_and_store_backtest(data, _system(), age_in_days=7)
+
+        system = _system()
+        assert not prepare_system_for_incremental_backtest(
+            data, system, strategy_name=STRATEGY_NAME
+        )
+        system.test_stage.time_series("code")
+        assert system.test_stage.estimate_count == 1
+
+    def test_only_estimates_to_keep_restored(self, data):
+        _run_and_store_backtest(data, _system())
+
+        system = _system()
+        prepare_system_for_incremental_backtest(
+            data, system, strategy_name=STRATEGY_NAME
+        )
+
+        restored_itemnames = sorted(
+            cache_ref.itemname for cache_ref in system.cache.get_items_with_data()
+        )
+        assert restored_itemnames == ["estimates_state", "slow_estimate"]
+
+    def test_run_system_classic_only_restores_if_incremental(self, data):
+        _run_and_store_backtest(data, _system())
+
+        for incremental, expected_estimate_count in [(False, 1), (True, 0)]:
+            system = _system()
+            run_system = runSystemClassic(
+                data,
+                STRATEGY_NAME,
+                backtest_config_filename="not_used.yaml",
+                incremental=incremental,
+            )
+            run_system._restore_estimates_if_incremental(system)
+            system.test_stage.time_series("code")
+            assert system.test_stage.estimate_count == expected_estimate_count
@@ -41,20 +41,23 @@ class updateHistoricalPricesBase(object):
 
 
     def update_historical_prices_with_data(self, data: dataBlob, instrument_code:str):
+        list_of_codes = self.get_list_of_instrument_codes_to_update(data, instrument_code)
+        for instrument in list_of_codes:
+            data.log.label(instrument_code = instrument)
+            self.update_historical_prices_for_instrument(
+                instrument, data)
+
+    def get_list_of_instrument_codes_to_update(self, data: dataBlob, instrument_code:str) -> list:
         price_data = diagPrices(data)
         list_of_codes_all = price_data.get_list_of_instruments_in_multiple_prices()
         if instrument_code == ALL_INSTRUMENTS:
-            for instrument in list_of_codes_all:
-                data.log.label(instrument_code = instrument)
-                self.update_historical_prices_for_instrument(
-                    instrument, data)
+            return list_of_codes_all
+
+        if instrument_code in list_of_codes_all:
+            return [instrument_code]
         else:
-            if instrument_code in list_of_codes_all:
-                data.log.label(instrument_code = instrument_code)
-                self.update_historical_prices_for_instrument(
-                    instrument_code, data)
-            else:
-                data.log.warn("Instrument %s does not have existing multiple prices or is not available from datasource %s" % (instrument_code, self.datasource))
+            data.log.warn("Instrument %s does not have existing multiple prices or is not available from datasource %s" % (instrument_code, self.datasource))
+            return []
 
 
     def get_data_broker(self) -> futuresContractPriceData:
@@ -66,9 +69,6 @@ class updateHistoricalPricesBase(object):
 
     def get_and_add_prices_for_frequency(
             self, data: dataBlob, contract_object: futuresContract, frequency: Frequency = DAILY_PRICE_FREQ):
-        db_futures_prices = updatePrices(data)
-        price_data = diagPrices(data)
-
         if not self.is_update_allowed(contract_object.instrument_code, frequency):
             return
 
@@ -77,8 +77,19 @@ class updateHistoricalPricesBase(object):
         broker_prices = data_broker.get_prices_at_frequency_for_contract_object(
             contract_object, frequency)
 
+        return self.add_prices_for_frequency(data, contract_object, broker_prices, frequency)
+
+
+    def add_prices_for_frequency(
+            self, data: dataBlob, contract_object: futuresContract, broker_prices: futuresContractPrices,
+            frequency: Frequency = DAILY_PRICE_FREQ):
+        # may be called from several threads at once, so don't label the shared log
+        log = contract_object.log(data.log)
+        db_futures_prices = updatePrices(data)
+        price_data = diagPrices(data)
+
         if len(broker_prices)==0:
-            data.log.msg("No prices from broker for %s" % str(contract_object))
+            log.msg("No prices from broker for %s" % str(contract_object))
             return failure
 
         if self.manual_price_check == True:
@@ -107,7 +118,7 @@ class updateHistoricalPricesBase(object):
                 self.report_price_spike(data, contract_object)
                 return failure
 
-            data.log.msg(
+            log.msg(
                 "Added %d rows at frequency %s for %s"
                 % (error_or_rows_added, frequency, str(contract_object))
             )
@@ -120,13 +131,14 @@ class updateHistoricalPricesBase(object):
         msg = (
                 "Spike found in prices for %s: need to manually check by running interactive_manual_check_historical_prices" %
                 str(contract_object))
-        data.log.warn(msg)
+        log = contract_object.log(data.log)
+        log.warn(msg)
         try:
             send_production_mail_msg(
                 data, msg, "Price Spike %s" %
                         contract_object.instrument_code)
         except BaseException:
-            data.log.warn(
+            log.warn(
                 "Couldn't send email about price spike for %s"
                 % str(contract_object)
             )
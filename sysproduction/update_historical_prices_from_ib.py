@@ -1,6 +1,7 @@
 """
 Update historical data per contract from interactive brokers data, dump into mongodb
 """
+from functools import partial
 from syscore.objects import success, failure
 from syscore.objects import arg_not_supplied
 from syscore.dateutils import DAILY_PRICE_FREQ, Frequency
@@ -9,6 +10,7 @@ from sysdata.data_blob import dataBlob
 from sysproduction.data.prices import diagPrices
 from sysproduction.data.contracts import dataContracts
 from sysbrokers.IB.ib_futures_contract_price_data import ibFuturesContractPriceData, futuresContract
+from sysbrokers.IB.ib_historical_download import ibHistoricalDownloadScheduler, contractDownload
 from sysdata.futures.futures_per_contract_prices import futuresContractPriceData
 from sysproduction.update_historical_prices_base import updateHistoricalPricesBase, ALL_INSTRUMENTS
 
@@ -41,6 +43,58 @@ class updateHistoricalPricesIB(updateHistoricalPricesBase):
     def get_data_broker(self) -> futuresContractPriceData:
         return self.data.broker_futures_contract_price
 
+    def update_historical_prices_with_data(self, data: dataBlob, instrument_code: str):
+        """
+        Several contracts are downloaded at once, and written to the database as they arrive
+
+        Manual price checks need us to look at each contract in turn, so they aren't
+        """
+        if self.manual_price_check:
+            return super().update_historical_prices_with_data(data, instrument_code)
+
+        list_of_codes = self.get_list_of_instrument_codes_to_update(data, instrument_code)
+        list_of_contract_downloads = []
+        for instrument in list_of_codes:
+            list_of_contract_downloads += self.get_list_of_contract_downloads_for_instrument(
+                instrument, data)
+
+        scheduler = ibHistoricalDownloadScheduler(
+            self.get_data_broker(),
+            write_prices_func=partial(self.write_prices_for_contract_and_frequency, data),
+            log=data.log)
+        scheduler.download_and_write(list_of_contract_downloads)
+
+    def get_list_of_contract_downloads_for_instrument(self, instrument_code: str, data: dataBlob) -> list:
+        diag_contracts = dataContracts(data)
+        all_contracts_list = diag_contracts.get_all_contract_objects_for_instrument_code(
+            instrument_code)
+        contract_list = all_contracts_list.currently_sampling()
+
+        if len(contract_list) == 0:
+            data.log.warn("No contracts marked for sampling for %s" % instrument_code)
+            return []
+
+        # same order as update_historical_prices_for_instrument_and_contract: if we
+        # can't write intraday prices, we don't write daily prices
+        diag_prices = diagPrices(data)
+        list_of_frequencies = [
+            frequency for frequency in
+            [diag_prices.get_intraday_frequency_for_historical_download(), DAILY_PRICE_FREQ]
+            if self.is_update_allowed(instrument_code, frequency)
+        ]
+        if len(list_of_frequencies) == 0:
+            return []
+
+        return [
+            contractDownload(contract_object, list_of_frequencies)
+            for contract_object in contract_list
+        ]
+
+    def write_prices_for_contract_and_frequency(
+            self, data: dataBlob, contract_object: futuresContract, frequency: Frequency, broker_prices):
+        # called from the scheduler's writer thread; logs with the contract's own labels
+        return self.add_prices_for_frequency(data, contract_object, broker_prices, frequency)
+
 
     def update_historical_prices_for_instrument(self, instrument_code: str, data: dataBlob):
         """
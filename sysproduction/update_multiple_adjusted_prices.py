@@ -19,7 +19,7 @@ from sysobjects.dict_of_named_futures_per_contract_prices import (
 
 from sysobjects.adjusted_prices import no_update_roll_has_occured, futuresAdjustedPrices
 from sysobjects.multiple_prices import futuresMultiplePrices, setOfNamedContracts
-from sysobjects.contracts import futuresContract
+from sysobjects.contracts import futuresContract, listOfFuturesContracts
 
 from sysdata.data_blob import dataBlob
 from sysproduction.data.prices import (
@@ -111,9 +111,15 @@ def update_multiple_adjusted_prices_for_instrument(
     """
 
     data.log.label(instrument_code=instrument_code)
-    updated_multiple_prices = calc_updated_multiple_prices(data, instrument_code)
+    diag_prices = diagPrices(data)
+    existing_multiple_prices = diag_prices.get_multiple_prices(instrument_code)
+    existing_adjusted_prices = diag_prices.get_adjusted_prices(instrument_code)
+
+    updated_multiple_prices = calc_updated_multiple_prices(
+        data, instrument_code, existing_multiple_prices
+    )
     updated_adjusted_prices = calc_update_adjusted_prices(
-        data, instrument_code, updated_multiple_prices
+        data, instrument_code, updated_multiple_prices, existing_adjusted_prices
     )
 
     update_with_new_prices(
@@ -121,17 +127,18 @@ def update_multiple_adjusted_prices_for_instrument(
         instrument_code,
         updated_adjusted_prices=updated_adjusted_prices,
         updated_multiple_prices=updated_multiple_prices,
+        existing_multiple_prices=existing_multiple_prices,
+        existing_adjusted_prices=existing_adjusted_prices,
     )
 
 
 def calc_updated_multiple_prices(
-    data: dataBlob, instrument_code: str
+    data: dataBlob,
+    instrument_code: str,
+    existing_multiple_prices: futuresMultiplePrices,
 ) -> futuresMultiplePrices:
-    diag_prices = diagPrices(data)
     # update multiple prices with new prices
     # (method in multiple prices object and possible in data socket)
-    existing_multiple_prices = diag_prices.get_multiple_prices(instrument_code)
-
     relevant_contracts = existing_multiple_prices.current_contract_dict()
 
     new_prices_dict = get_dict_of_new_prices_and_contractid(
@@ -145,12 +152,12 @@ def calc_updated_multiple_prices(
 
 
 def calc_update_adjusted_prices(
-    data: dataBlob, instrument_code: str, updated_multiple_prices: futuresMultiplePrices
+    data: dataBlob,
+    instrument_code: str,
+    updated_multiple_prices: futuresMultiplePrices,
+    existing_adjusted_prices: futuresAdjustedPrices,
 ) -> futuresAdjustedPrices:
 
-    diag_prices = diagPrices(data)
-    existing_adjusted_prices = diag_prices.get_adjusted_prices(instrument_code)
-
     updated_adjusted_prices = (
         existing_adjusted_prices.update_with_multiple_prices_no_roll(
             updated_multiple_prices
@@ -179,12 +186,20 @@ def get_dict_of_new_prices_and_contractid(
     :return: dict of futures contract prices for each contract, plus contract id column
     """
     diag_prices = diagPrices(data)
-    # get prices for relevant contracts, return as dict labelled with column
-    # for contractids
+    # get prices for relevant contracts in one go, return as dict labelled with
+    # column for contractids
+    list_of_contracts = listOfFuturesContracts(
+        [
+            futuresContract(instrument_code, contract_date_str)
+            for contract_date_str in set(contract_date_dict.values())
+        ]
+    )
+    dict_of_prices = diag_prices.get_prices_for_contract_list(list_of_contracts)
+
     relevant_contract_prices = dict()
     for key, contract_date_str in contract_date_dict.items():
         contract = futuresContract(instrument_code, contract_date_str)
-        price_series = diag_prices.get_prices_for_contract_object(contract)
+        price_series = dict_of_prices[contract.date_str]
         relevant_contract_prices[key] = price_series.return_final_prices()
 
     relevant_contract_prices = dictNamedFuturesContractFinalPrices(
@@ -205,15 +220,22 @@ def update_with_new_prices(
     instrument_code: str,
     updated_multiple_prices: futuresMultiplePrices,
     updated_adjusted_prices: futuresAdjustedPrices,
+    existing_multiple_prices: futuresMultiplePrices,
+    existing_adjusted_prices: futuresAdjustedPrices,
 ):
 
+    # if only new rows have been added, only they are written
     update_prices = updatePrices(data)
 
-    update_prices.add_multiple_prices(
-        instrument_code, updated_multiple_prices, ignore_duplication=True
+    update_prices.update_multiple_prices(
+        instrument_code,
+        updated_multiple_prices,
+        existing_multiple_prices=existing_multiple_prices,
     )
-    update_prices.add_adjusted_prices(
-        instrument_code, updated_adjusted_prices, ignore_duplication=True
+    update_prices.update_adjusted_prices(
+        instrument_code,
+        updated_adjusted_prices,
+        existing_adjusted_prices=existing_adjusted_prices,
     )
 
 
@@ -1,5 +1,5 @@
 import pandas as pd
-from syscore.genutils import progressBar
+from syscore.genutils import progressBar, str2Bool
 from sysquant.estimators.correlation_estimator import correlationEstimator
 
 from sysquant.fitting_dates import generate_fitting_dates
@@ -32,6 +32,7 @@ def correlation_over_time(
     date_method="expanding",
     rollyears=20,
     interval_frequency: str = "12M",
+    only_at_fit_dates: bool = False,
     **kwargs
 ) -> CorrelationList:
 
@@ -45,6 +46,12 @@ def correlation_over_time(
         interval_frequency=interval_frequency,
     )
 
+    if str2Bool(only_at_fit_dates):
+        # exponential estimates are then only kept where we need them, saving memory
+        kwargs["dates_to_keep"] = [
+            fit_period.fit_end for fit_period in fit_dates if not fit_period.no_data
+        ]
+
     progress = progressBar(len(fit_dates), "Estimating correlations")
 
     correlation_estimator_for_one_period = correlationEstimator(
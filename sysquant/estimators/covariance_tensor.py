@@ -0,0 +1,236 @@
+"""
+Covariance matrices for every date of a backtest, held in one (T x N x N) array
+
+Looking up the covariance for a date is then a binary search on the dates plus a
+slice of the array, rather than building pandas objects for every date. When the
+array is large it is memory mapped to a temporary file rather than held in memory.
+
+>>> returns = pd.DataFrame(dict(a=[0.1, -0.2, 0.15, 0.05, -0.1], b=[0.05, -0.1, 0.2, -0.05, 0.0]), index=pd.bdate_range("2020-01-01", periods=5))
+>>> tensor = covarianceTensor.from_returns(returns, span=3, min_periods=2)
+>>> tensor.covariance_on_date(pd.Timestamp("2020-01-08")).as_pd().round(4)
+        a       b
+a  0.0167  0.0076
+b  0.0076  0.0100
+>>> tensor.covariance_on_date(pd.Timestamp("2020-01-08")).as_np().tolist() == returns.ewm(span=3, min_periods=2).cov().loc["2020-01-07"].values.tolist()
+True
+"""
+
+import datetime
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from syscore.objects import arg_not_supplied
+from sysquant.estimators.correlations import CorrelationList, create_boring_corr_matrix
+from sysquant.estimators.covariance import covarianceEstimate
+
+# bigger arrays than this are memory mapped
+MAX_BYTES_IN_MEMORY = 256 * 1024 * 1024
+# to limit the size of temporary arrays
+DATES_PER_CHUNK = 1000
+
+
+class covarianceTensor(object):
+    def __init__(self, dates: pd.DatetimeIndex, asset_names: list, values: np.array):
+        """
+        :param dates: sorted
+        :param asset_names: list of str, length N
+        :param values: (T x N x N) array, values[t] is the covariance on dates[t]
+        """
+        self._dates = pd.DatetimeIndex(dates)
+        self._dates_as_np = self._dates.values
+        self._asset_names = list(asset_names)
+        self._values = values
+
+    def __repr__(self):
+        return "Covariance for %d assets on %d dates" % (
+            len(self.asset_names),
+            len(self.dates),
+        )
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return self._dates
+
+    @property
+    def asset_names(self) -> list:
+        return self._asset_names
+
+    @property
+    def values(self) -> np.array:
+        return self._values
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return isinstance(self.values, np.memmap)
+
+    def covariance_on_date(
+        self, relevant_date: datetime.datetime = arg_not_supplied
+    ) -> covarianceEstimate:
+        """
+        Most recent covariance on or before relevant_date; the last one if not supplied
+        """
+        values = self.values_on_date(relevant_date)
+
+        return covarianceEstimate(values, columns=self.asset_names)
+
+    def values_on_date(
+        self, relevant_date: datetime.datetime = arg_not_supplied
+    ) -> np.array:
+        index_of_date = self.index_of_date(relevant_date)
+
+        return np.array(self.values[index_of_date])
+
+    def index_of_date(self, relevant_date: datetime.datetime = arg_not_supplied) -> int:
+        if relevant_date is arg_not_supplied:
+            return len(self) - 1
+
+        index_of_date = (
+            int(
+                np.searchsorted(
+                    self._dates_as_np, np.datetime64(relevant_date), side="right"
+                )
+            )
+            - 1
+        )
+        if index_of_date < 0:
+            raise Exception(
+                "Date %s is before first covariance estimate" % str(relevant_date)
+            )
+
+        return index_of_date
+
+    @classmethod
+    def from_returns(
+        covarianceTensor,
+        returns: pd.DataFrame,
+        span: int = 250,
+        min_periods: int = 20,
+    ):
+        """
+        Exponentially weighted covariance of returns on each date, as
+        returns.ewm(span=span, min_periods=min_periods).cov()
+        """
+        asset_names = list(returns.columns)
+        size = len(asset_names)
+        values = _empty_array((len(returns.index), size, size))
+
+        # the lookback means we can't just do each chunk of dates on its own, but
+        # pandas calculates all the dates at once anyway
+        stacked_covariance = returns.ewm(span=span, min_periods=min_periods).cov()
+        values[:] = stacked_covariance.values.reshape(values.shape)
+
+        return covarianceTensor(returns.index, asset_names, values)
+
+    @classmethod
+    def from_stdev_and_correlations(
+        covarianceTensor,
+        stdev: pd.DataFrame,
+        correlation_list: CorrelationList,
+    ):
+        """
+        Covariance on each date of stdev from stdev on that date, and the most recent
+        correlation estimate in correlation_list; identity correlation before the
+        first estimate
+
+        Gives the same values as covariance_from_stdev_and_correlation date by date,
+        including nans for assets without data, but in the order of stdev.columns
+
+        :param stdev: T x N; assets without data on a date are nan
+        """
+        asset_names = list(stdev.columns)
+        size = len(asset_names)
+        dates = stdev.index
+
+        all_correlations = _correlations_with_identity_last(
+            correlation_list, asset_names
+        )
+        index_of_correlation = _index_of_correlation_for_dates(
+            correlation_list, dates
+        )
+        correlation_has_data = (~np.isnan(all_correlations)).sum(axis=1) >= 2
+
+        stdev_values = stdev.values
+        values = _empty_array((len(dates), size, size))
+        for chunk_start in range(0, len(dates), DATES_PER_CHUNK):
+            chunk = slice(chunk_start, chunk_start + DATES_PER_CHUNK)
+            values[chunk] = _covariance_given_stdev_and_correlation(
+                stdev_values[chunk],
+                all_correlations[index_of_correlation[chunk]],
+                correlation_has_data[index_of_correlation[chunk]],
+            )
+
+        return covarianceTensor(dates, asset_names, values)
+
+
+def _correlations_with_identity_last(
+    correlation_list: CorrelationList, asset_names: list
+) -> np.array:
+    # so index -1 is the identity matrix, used before the first estimate
+    list_of_correlations = [
+        correlation.as_pd().reindex(index=asset_names, columns=asset_names).values
+        for correlation in correlation_list.corr_list
+    ]
+    identity = create_boring_corr_matrix(
+        len(asset_names), columns=asset_names, offdiag=0.0
+    )
+    list_of_correlations.append(identity.values)
+
+    return np.array(list_of_correlations, dtype=float)
+
+
+def _index_of_correlation_for_dates(
+    correlation_list: CorrelationList, dates: pd.DatetimeIndex
+) -> np.array:
+    # as fit_dates.index_of_most_recent_period_before_relevant_date, for all dates
+    list_of_start_periods = pd.DatetimeIndex(
+        correlation_list.fit_dates.list_of_starting_periods()
+    )
+
+    return (
+        np.searchsorted(list_of_start_periods.values, dates.values, side="right") - 1
+    )
+
+
+def _covariance_given_stdev_and_correlation(
+    stdev: np.array, correlations: np.array, correlation_has_data: np.array
+) -> np.array:
+    """
+    :param stdev: T x N
+    :param correlations: T x N x N
+    :param correlation_has_data: T x N
+    :return: T x N x N
+    """
+    has_data = correlation_has_data & ~np.isnan(stdev)
+    both_have_data = has_data[:, :, np.newaxis] & has_data[:, np.newaxis, :]
+
+    # same order of multiplication as diag(stdev).dot(corr).dot(diag(stdev))
+    covariance = stdev[:, :, np.newaxis] * correlations * stdev[:, np.newaxis, :]
+    covariance[~both_have_data] = np.nan
+
+    # with a matrix product, any nan in the correlations of assets with data
+    # makes every covariance nan
+    any_nan = np.any(np.isnan(covariance) & both_have_data, axis=(1, 2))
+    covariance[any_nan[:, np.newaxis, np.newaxis] & both_have_data] = np.nan
+
+    return covariance
+
+
+def _empty_array(shape: tuple) -> np.array:
+    size_in_bytes = int(np.prod(shape)) * np.dtype(float).itemsize
+    if size_in_bytes <= MAX_BYTES_IN_MEMORY:
+        return np.empty(shape, dtype=float)
+
+    # deleted when the array is
+    temp_file = tempfile.TemporaryFile()
+    return np.memmap(temp_file, dtype=float, mode="w+", shape=shape)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
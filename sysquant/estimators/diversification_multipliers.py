@@ -38,25 +38,10 @@ def diversification_multiplier_from_list(
 
     ref_periods = [fit_period.period_start for fit_period in correlation_list.fit_dates]
 
-    # here's where we stack up the answers
-    div_mult_vector = []
-
-    for (corrmatrix, start_of_period) in zip(correlation_list.corr_list, ref_periods):
-
-        weight_slice = weight_df[:start_of_period]
-        if weight_slice.shape[0] == 0:
-            # empty space
-            div_mult_vector.append(1.0)
-            continue
-
-        # take the current weights and work out the DM
-        weights_dict = weight_slice.iloc[-1].to_dict()
-        weights = portfolioWeights(weights_dict)
-        div_multiplier = diversification_mult_single_period(
-            corrmatrix, weights, **kwargs
-        )
-
-        div_mult_vector.append(div_multiplier)
+    # all the periods at once
+    div_mult_vector = diversification_mult_for_each_period(
+        correlation_list, weight_df, **kwargs
+    )
 
     # In same space as correlations probably annually
     div_mult_df = pd.Series(div_mult_vector, index=ref_periods)
@@ -70,6 +55,67 @@ def diversification_multiplier_from_list(
     return div_mult_df_smoothed
 
 
+def diversification_mult_for_each_period(
+    correlation_list: CorrelationList, weight_df: pd.DataFrame, dm_max: float = 2.5
+) -> np.array:
+    """
+    As diversification_mult_single_period for each correlation matrix in the list,
+    with the most recent weights at the start of its period (1.0 if there aren't
+    any yet), but done for all the periods together
+
+    :param weight_df: TxN, columns in the same order as correlation_list.column_names
+    :returns: np.array, one value per period
+    """
+    column_names = list(correlation_list.column_names)
+    size = len(column_names)
+    ref_periods = pd.DatetimeIndex(
+        [fit_period.period_start for fit_period in correlation_list.fit_dates]
+    )
+
+    # P x N x N
+    correlations = np.array(
+        [
+            _correlation_values_in_order(corrmatrix, column_names)
+            for corrmatrix in correlation_list.corr_list
+        ],
+        dtype=float,
+    ).reshape((len(ref_periods), size, size))
+
+    # P x N, weights from the last row on or before each period start
+    index_of_weights = (
+        np.searchsorted(weight_df.index.values, ref_periods.values, side="right") - 1
+    )
+    no_weights_yet = index_of_weights < 0
+    weights = weight_df.values.astype(float)[np.maximum(index_of_weights, 0)]
+
+    # as portfolioWeights.portfolio_stdev, only use assets which have weights and
+    # correlations
+    correlation_has_data = (~np.isnan(correlations)).sum(axis=1) >= 2
+    valid = correlation_has_data & ~np.isnan(weights)
+    both_valid = valid[:, :, np.newaxis] & valid[:, np.newaxis, :]
+    weights = np.where(valid, weights, 0.0)
+    correlations = np.where(both_valid, correlations, 0.0)
+
+    variance = np.einsum("pi,pij,pj->p", weights, correlations, weights)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        risk = variance**0.5
+        div_mult = np.minimum(1.0 / risk, dm_max)
+
+    use_one = no_weights_yet | np.isnan(risk) | (risk < 0.0000001)
+    div_mult[use_one] = 1.0
+
+    return div_mult
+
+
+def _correlation_values_in_order(
+    corrmatrix: correlationEstimate, column_names: list
+) -> np.array:
+    if list(corrmatrix.columns) == column_names:
+        return corrmatrix.as_np()
+
+    return corrmatrix.as_pd().reindex(index=column_names, columns=column_names).values
+
+
 def diversification_mult_single_period(
     corrmatrix: correlationEstimate, weights: portfolioWeights, dm_max: float = 2.5
 ) -> float:
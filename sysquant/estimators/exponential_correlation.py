@@ -1,5 +1,8 @@
 import datetime
+
+import numpy as np
 import pandas as pd
+
 from syscore.genutils import str2Bool
 from syscore.objects import arg_not_supplied
 from sysquant.fitting_dates import fitDates
@@ -49,6 +52,7 @@ class exponentialCorrelation(exponentialEstimator):
             data_for_correlation,
             ew_lookback=adjusted_lookback,
             min_periods=adjusted_min_periods,
+            dates_to_keep=other_kwargs.get("dates_to_keep", arg_not_supplied),
         )
 
         return correlation_calculations
@@ -141,36 +145,112 @@ class exponentialCorrelation(exponentialEstimator):
 
 
 class exponentialCorrelationResults(object):
+    """
+    Exponentially weighted correlations on each date, held as a (T x N x N) array
+
+    Gives the same values as data.ewm(...).corr(pairwise=True), without building the
+    stacked dataframe, and finds the matrix for a date with a binary search.
+
+    If dates_to_keep is passed, only the matrices needed for those dates are kept
+    (eg the ends of fitting periods), and only those dates can be looked up.
+    """
+
     def __init__(
         self,
         data_for_correlation,
         ew_lookback: int = 250,
         min_periods: int = 20,
+        dates_to_keep: list = arg_not_supplied,
         **_ignored_kwargs
     ):
 
         columns = data_for_correlation.columns
         self._columns = columns
+        self._ew_lookback = ew_lookback
+        self._min_periods = min_periods
+
+        all_dates = data_for_correlation.index
+        self._dates = all_dates
+        if dates_to_keep is arg_not_supplied:
+            self._kept_dates = arg_not_supplied
+            rows_to_keep = np.arange(len(all_dates))
+        else:
+            self._kept_dates = pd.Index(sorted(set(dates_to_keep)))
+            rows_to_keep = np.array(
+                [
+                    self._index_of_last_date_before(date_point)
+                    for date_point in self._kept_dates
+                ],
+                dtype=int,
+            )
 
-        raw_correlations = data_for_correlation.ewm(
-            span=ew_lookback, min_periods=min_periods, ignore_na=True
-        ).corr(pairwise=True, ignore_na=True)
-
-        self._raw_correlations = raw_correlations
+        self._rows_kept = rows_to_keep
+        self._correlation_values = _exponential_correlation_values(
+            data_for_correlation,
+            rows_to_keep=rows_to_keep,
+            ew_lookback=ew_lookback,
+            min_periods=min_periods,
+        )
 
     @property
-    def raw_correlations(self):
-        return self._raw_correlations
+    def raw_correlations(self) -> pd.DataFrame:
+        """
+        Stacked as data.ewm(...).corr(pairwise=True)
+        """
+        if self._kept_dates is not arg_not_supplied:
+            raise Exception("Raw correlations are only kept for some dates")
+
+        columns = self.columns
+        size = self.size_of_matrix
+        values = self._correlation_values.reshape(len(self._dates) * size, size)
+        index = pd.MultiIndex.from_product([self._dates, columns])
+
+        return pd.DataFrame(values, index=index, columns=columns)
 
     def last_valid_cor_matrix_for_date(
         self, date_point: datetime.datetime
     ) -> correlationEstimate:
-        raw_correlations = self.raw_correlations
+        """
+        The correlation on the last date before date_point
+        """
         columns = self.columns
+        index_of_matrix = self._index_of_matrix_for_date(date_point)
+        if index_of_matrix < 0:
+            # as the stacked version; no dates before date_point
+            corr_matrix_values = np.empty((0, len(columns)))
+        else:
+            corr_matrix_values = self._correlation_values[index_of_matrix].copy()
+
+        return correlationEstimate(values=corr_matrix_values, columns=columns)
+
+    def _index_of_matrix_for_date(self, date_point: datetime.datetime) -> int:
+        kept_dates = self._kept_dates
+        if kept_dates is arg_not_supplied:
+            return self._index_of_last_date_before(date_point)
+
+        index_of_kept_date = kept_dates.searchsorted(date_point)
+        if (
+            index_of_kept_date == len(kept_dates)
+            or kept_dates[index_of_kept_date] != date_point
+        ):
+            raise Exception(
+                "Correlations only kept for some dates, not %s" % str(date_point)
+            )
+        if self._rows_kept[index_of_kept_date] < 0:
+            return -1
 
-        return last_valid_cor_matrix_for_date(
-            raw_correlations=raw_correlations, date_point=date_point, columns=columns
-        )
+        return index_of_kept_date
+
+    def _index_of_last_date_before(self, date_point: datetime.datetime) -> int:
+        dates = self._dates
+        if dates.is_monotonic_increasing:
+            return int(dates.searchsorted(date_point, side="left")) - 1
+
+        earlier_dates = np.flatnonzero(dates < date_point)
+        if len(earlier_dates) == 0:
+            return -1
+
+        return int(earlier_dates[-1])
 
     @property
     def size_of_matrix(self) -> int:
@@ -181,15 +261,34 @@ class exponentialCorrelationResults(object):
         return self._columns
 
 
-def last_valid_cor_matrix_for_date(
-    raw_correlations: pd.DataFrame, columns: list, date_point: datetime.datetime
-) -> correlationEstimate:
-
-    size_of_matrix = len(columns)
-    corr_matrix_values = (
-        raw_correlations[raw_correlations.index.get_level_values(0) < date_point]
-        .tail(size_of_matrix)
-        .values
-    )
+def _exponential_correlation_values(
+    data_for_correlation: pd.DataFrame,
+    rows_to_keep: np.array,
+    ew_lookback: int = 250,
+    min_periods: int = 20,
+) -> np.array:
+    """
+    Each pair in turn, as pandas does for pairwise=True, keeping only the rows we
+    need; rows_to_keep of -1 are left as nan
+
+    :return: (len(rows_to_keep) x N x N) array
+    """
+    size = len(data_for_correlation.columns)
+    correlation_values = np.full((len(rows_to_keep), size, size), np.nan)
+    rows_with_data = rows_to_keep >= 0
+    rows_to_take = rows_to_keep[rows_with_data]
+
+    for i in range(size):
+        for j in range(i, size):
+            # values missing in either series are masked out in both
+            data_i = data_for_correlation.iloc[:, i]
+            data_j = data_for_correlation.iloc[:, j]
+            correlation = (
+                data_i.ewm(span=ew_lookback, min_periods=min_periods, ignore_na=True)
+                .corr(data_j)
+                .values[rows_to_take]
+            )
+            correlation_values[rows_with_data, i, j] = correlation
+            correlation_values[rows_with_data, j, i] = correlation
 
-    return correlationEstimate(values=corr_matrix_values, columns=columns)
+    return correlation_values
@@ -4,6 +4,9 @@ import numpy as np
 
 from syscore.genutils import str2Bool
 
+# to limit the size of the (rule x time x instrument) array
+MAX_BYTES_PER_CHUNK = 256 * 1024 * 1024
+
 
 def forecast_scalar(
     cs_forecasts: pd.DataFrame,
@@ -48,3 +51,185 @@ def forecast_scalar(
         scaling_factor = scaling_factor.fillna(method="bfill")
 
     return scaling_factor
+
+
+def forecast_scalars_for_dict_of_rules(
+    dict_of_cs_forecasts: dict,
+    target_abs_forecast: float = 10.0,
+    window: int = 250000,
+    min_periods=500,
+    backfill=True,
+) -> dict:
+    """
+    As forecast_scalar for the cross sectional forecasts of each of several rules,
+    but with the rules stacked into a (time x rule x instrument) array so the cross
+    sectional medians and time series averages are done together in numpy
+
+    :param dict_of_cs_forecasts: forecasts, cross sectionally, for each rule
+    :type dict_of_cs_forecasts: dict of pd.DataFrame TxN, keys are rule names
+
+    :returns: dict of pd.Series, keys are rule names
+    """
+    backfill = str2Bool(backfill)  # in yaml will come in as text
+
+    list_of_rules = list(dict_of_cs_forecasts.keys())
+    rules_per_chunk = _rules_per_chunk(dict_of_cs_forecasts)
+
+    scaling_factors = dict()
+    for chunk_start in range(0, len(list_of_rules), rules_per_chunk):
+        chunk_of_cs_forecasts = dict(
+            [
+                (rule_name, dict_of_cs_forecasts[rule_name])
+                for rule_name in list_of_rules[
+                    chunk_start : chunk_start + rules_per_chunk
+                ]
+            ]
+        )
+        scaling_factors.update(
+            _forecast_scalars_for_chunk_of_rules(
+                chunk_of_cs_forecasts,
+                target_abs_forecast=target_abs_forecast,
+                window=window,
+                min_periods=min_periods,
+                backfill=backfill,
+            )
+        )
+
+    return scaling_factors
+
+
+def _rules_per_chunk(dict_of_cs_forecasts: dict) -> int:
+    list_of_cs_forecasts = list(dict_of_cs_forecasts.values())
+    if len(list_of_cs_forecasts) == 0:
+        return 1
+
+    index = _union_of_indices(
+        [cs_forecasts.index for cs_forecasts in list_of_cs_forecasts]
+    )
+    columns = _union_of_indices(
+        [cs_forecasts.columns for cs_forecasts in list_of_cs_forecasts]
+    )
+    bytes_per_rule = len(index) * len(columns) * np.dtype(float).itemsize
+
+    return max(1, int(MAX_BYTES_PER_CHUNK // max(bytes_per_rule, 1)))
+
+
+def _forecast_scalars_for_chunk_of_rules(
+    dict_of_cs_forecasts: dict,
+    target_abs_forecast: float,
+    window: int,
+    min_periods: int,
+    backfill: bool,
+) -> dict:
+    list_of_cs_forecasts = list(dict_of_cs_forecasts.values())
+    index = _union_of_indices(
+        [cs_forecasts.index for cs_forecasts in list_of_cs_forecasts]
+    )
+    columns = _union_of_indices(
+        [cs_forecasts.columns for cs_forecasts in list_of_cs_forecasts]
+    )
+
+    # time x rule x instrument; nan where an instrument doesn't have the rule
+    forecasts = np.full((len(index), len(list_of_cs_forecasts), len(columns)), np.nan)
+    for rule_number, cs_forecasts in enumerate(list_of_cs_forecasts):
+        if not (
+            cs_forecasts.index.equals(index) and cs_forecasts.columns.equals(columns)
+        ):
+            cs_forecasts = cs_forecasts.reindex(index=index, columns=columns)
+        forecasts[:, rule_number, :] = cs_forecasts.values
+
+    more_than_one_instrument = np.array(
+        [cs_forecasts.shape[1] > 1 for cs_forecasts in list_of_cs_forecasts]
+    )
+
+    # Remove zeros/nans
+    forecasts[forecasts == 0.0] = np.nan
+
+    # Take CS average first; as in forecast_scalar, only forward fill if there
+    # is more than one instrument
+    _ffill_along_time_in_place(forecasts, rules_to_fill=more_than_one_instrument)
+    np.abs(forecasts, out=forecasts)
+    cs_average = _nanmedian_across_instruments_in_place(forecasts)
+
+    scaling_factors = dict()
+    for rule_number, (rule_name, cs_forecasts) in enumerate(
+        dict_of_cs_forecasts.items()
+    ):
+        # now the TS, over the times for this rule only
+        times_for_rule = index.get_indexer(cs_forecasts.index)
+        x = cs_average[times_for_rule, rule_number]
+        avg_abs_value = _rolling_nanmean(x, window=window, min_periods=min_periods)
+        scaling_factor = pd.Series(
+            target_abs_forecast / avg_abs_value,
+            index=cs_forecasts.index,
+            name=(
+                None
+                if more_than_one_instrument[rule_number]
+                else cs_forecasts.columns[0]
+            ),
+        )
+
+        if backfill:
+            scaling_factor = scaling_factor.bfill()
+
+        scaling_factors[rule_name] = scaling_factor
+
+    return scaling_factors
+
+
+def _union_of_indices(list_of_indices: list) -> pd.Index:
+    union = list_of_indices[0]
+    for other_index in list_of_indices[1:]:
+        union = union.union(other_index)
+
+    return union
+
+
+def _ffill_along_time_in_place(values: np.array, rules_to_fill: np.array):
+    # values is time x rule x instrument; a loop over time touches contiguous
+    # memory, and doesn't need another array the size of values
+    rules_to_fill = rules_to_fill[:, np.newaxis]
+    for time_number in range(1, values.shape[0]):
+        values_now = values[time_number]
+        np.copyto(
+            values_now,
+            values[time_number - 1],
+            where=np.isnan(values_now) & rules_to_fill,
+        )
+
+
+def _nanmedian_across_instruments_in_place(values: np.array) -> np.array:
+    # as np.nanmedian(values, axis=2), which is very slow for 3 dimensions
+    # sorts values in place, which puts the nans last
+    count = np.sum(~np.isnan(values), axis=2)
+    values.sort(axis=2)
+    sorted_values = values
+    upper_middle = np.take_along_axis(
+        sorted_values, (count // 2)[:, :, np.newaxis], axis=2
+    )[:, :, 0]
+    lower_middle = np.take_along_axis(
+        sorted_values, np.maximum(count - 1, 0)[:, :, np.newaxis] // 2, axis=2
+    )[:, :, 0]
+
+    median = (lower_middle + upper_middle) / 2.0
+    median[count == 0] = np.nan
+
+    return median
+
+
+def _rolling_nanmean(x: np.array, window: int, min_periods: int) -> np.array:
+    # as pd.Series(x).rolling(window=window, min_periods=min_periods).mean()
+    is_valid = ~np.isnan(x)
+    cumulative_sum = np.cumsum(np.where(is_valid, x, 0.0))
+    cumulative_count = np.cumsum(is_valid)
+    if window < len(x):
+        cumulative_sum[window:] = cumulative_sum[window:] - cumulative_sum[:-window]
+        cumulative_count[window:] = (
+            cumulative_count[window:] - cumulative_count[:-window]
+        )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = cumulative_sum / cumulative_count
+    mean[(cumulative_count < max(min_periods, 1))] = np.nan
+
+    return mean
@@ -0,0 +1,347 @@
+"""
+Online (streaming) versions of the exponentially weighted estimators in vol.py
+
+Each object holds a small amount of state, and is updated with one new observation at
+a time, returning the latest estimate. The results are identical to the batch versions
+run over the whole history, since the same recursions as pandas are used in the same
+order. So once an estimator has seen the history (eg with update_with_series), it can
+be kept around and updated each time a new daily price arrives, without going back to
+the history again.
+
+>>> returns = pd.Series([0.1, -0.2, 0.15, 0.05, -0.1, 0.3])
+>>> estimator = onlineEWMAMean(span=3)
+>>> estimator.update_with_series(returns).equals(returns.ewm(span=3).mean())
+True
+>>> estimator.update(0.2) == pd.concat([returns, pd.Series([0.2])]).ewm(span=3).mean().iloc[-1]
+True
+"""
+
+import bisect
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from syscore.dateutils import BUSINESS_DAYS_IN_YEAR
+from syscore.objects import arg_not_supplied
+
+# adjust=True, the pandas default
+NEW_WEIGHT = 1.0
+
+
+class onlineEstimator(object):
+    """
+    Base class; inheritors implement update
+    """
+
+    def __init__(self):
+        self._value = np.nan
+
+    @property
+    def value(self) -> float:
+        """
+        Latest estimate
+        """
+        return self._value
+
+    def update(self, *args) -> float:
+        raise NotImplementedError
+
+    def update_with_series(self, *list_of_series) -> pd.Series:
+        """
+        Update with each observation in turn
+
+        :param list_of_series: as many pd.Series as update takes arguments, aligned
+        :returns: pd.Series of the estimates after each update, same index
+        """
+        index = list_of_series[0].index
+        list_of_values = [series.values for series in list_of_series]
+        estimates = [self.update(*observations) for observations in zip(*list_of_values)]
+
+        return pd.Series(estimates, index=index, dtype=float)
+
+
+class onlineEWMAMean(onlineEstimator):
+    """
+    As series.ewm(span=span, min_periods=min_periods).mean()  (or com=...)
+    """
+
+    def __init__(
+        self,
+        span: float = arg_not_supplied,
+        com: float = arg_not_supplied,
+        min_periods: int = 0,
+        ignore_na: bool = False,
+    ):
+        super().__init__()
+        alpha = 1.0 / (1.0 + center_of_mass(span=span, com=com))
+        self._old_weight_factor = 1.0 - alpha
+        self._min_periods = max(int(min_periods), 1)
+        self._ignore_na = ignore_na
+
+        self._weighted_mean = np.nan
+        self._old_weight = 1.0
+        self._observations = 0
+
+    def update(self, new_value: float) -> float:
+        is_observation = new_value == new_value
+        self._observations += is_observation
+
+        weighted_mean = self._weighted_mean
+        if weighted_mean == weighted_mean:
+            if is_observation or not self._ignore_na:
+                self._old_weight *= self._old_weight_factor
+                if is_observation:
+                    old_weight = self._old_weight
+                    # avoid numerical errors on constant series
+                    if weighted_mean != new_value:
+                        weighted_mean = (
+                            old_weight * weighted_mean + NEW_WEIGHT * new_value
+                        )
+                        weighted_mean /= old_weight + NEW_WEIGHT
+                    self._old_weight += NEW_WEIGHT
+        elif is_observation:
+            weighted_mean = new_value
+
+        self._weighted_mean = weighted_mean
+        if self._observations >= self._min_periods:
+            self._value = weighted_mean
+        else:
+            self._value = np.nan
+
+        return self._value
+
+
+class onlineEWMAStd(onlineEstimator):
+    """
+    As series.ewm(span=span, min_periods=min_periods).std()  (or com=...)
+    """
+
+    def __init__(
+        self,
+        span: float = arg_not_supplied,
+        com: float = arg_not_supplied,
+        min_periods: int = 0,
+        ignore_na: bool = False,
+    ):
+        super().__init__()
+        alpha = 1.0 / (1.0 + center_of_mass(span=span, com=com))
+        self._old_weight_factor = 1.0 - alpha
+        self._min_periods = max(int(min_periods), 1)
+        self._ignore_na = ignore_na
+
+        self._mean = np.nan
+        self._variance = 0.0
+        self._sum_weights = 1.0
+        self._sum_weights_squared = 1.0
+        self._old_weight = 1.0
+        self._observations = 0
+
+    def update(self, new_value: float) -> float:
+        is_observation = new_value == new_value
+        self._observations += is_observation
+
+        mean = self._mean
+        if mean == mean:
+            if is_observation or not self._ignore_na:
+                old_weight_factor = self._old_weight_factor
+                self._sum_weights *= old_weight_factor
+                self._sum_weights_squared *= old_weight_factor * old_weight_factor
+                self._old_weight *= old_weight_factor
+                if is_observation:
+                    old_weight = self._old_weight
+                    old_mean = mean
+                    # avoid numerical errors on constant series
+                    if mean != new_value:
+                        mean = ((old_weight * old_mean) + (NEW_WEIGHT * new_value)) / (
+                            old_weight + NEW_WEIGHT
+                        )
+                    self._variance = (
+                        (
+                            old_weight
+                            * (self._variance + ((old_mean - mean) * (old_mean - mean)))
+                        )
+                        + (NEW_WEIGHT * ((new_value - mean) * (new_value - mean)))
+                    ) / (old_weight + NEW_WEIGHT)
+                    self._sum_weights += NEW_WEIGHT
+                    self._sum_weights_squared += NEW_WEIGHT * NEW_WEIGHT
+                    self._old_weight += NEW_WEIGHT
+        elif is_observation:
+            mean = new_value
+
+        self._mean = mean
+        self._value = self._std_dev_given_state()
+
+        return self._value
+
+    def _std_dev_given_state(self) -> float:
+        if self._observations < self._min_periods:
+            return np.nan
+
+        # bias correction
+        numerator = self._sum_weights * self._sum_weights
+        denominator = numerator - self._sum_weights_squared
+        if not denominator > 0:
+            return np.nan
+
+        variance = (numerator / denominator) * self._variance
+        if variance < 0:
+            return 0.0
+
+        return float(np.sqrt(variance))
+
+
+class onlineRollingQuantile(onlineEstimator):
+    """
+    As series.rolling(window, min_periods=min_periods).quantile(quantile)
+
+    State is the last window observations, kept sorted
+    """
+
+    def __init__(self, window: int, quantile: float, min_periods: int = None):
+        super().__init__()
+        if min_periods is None:
+            min_periods = window
+        self._window = deque(maxlen=window)
+        self._sorted_values = []
+        self._quantile = quantile
+        self._min_periods = min_periods
+
+    def update(self, new_value: float) -> float:
+        window = self._window
+        if len(window) == window.maxlen:
+            dropped_value = window[0]
+            if dropped_value == dropped_value:
+                sorted_values = self._sorted_values
+                del sorted_values[bisect.bisect_left(sorted_values, dropped_value)]
+
+        window.append(new_value)
+        if new_value == new_value:
+            bisect.insort(self._sorted_values, new_value)
+
+        self._value = self._quantile_given_state()
+
+        return self._value
+
+    def _quantile_given_state(self) -> float:
+        sorted_values = self._sorted_values
+        observations = len(sorted_values)
+        if observations < self._min_periods or observations == 0:
+            return np.nan
+        if observations == 1:
+            return sorted_values[0]
+
+        # linear interpolation
+        index_with_fraction = self._quantile * (observations - 1)
+        index = int(index_with_fraction)
+        if index_with_fraction == index:
+            return sorted_values[index]
+
+        low_value = sorted_values[index]
+        high_value = sorted_values[index + 1]
+
+        return low_value + (high_value - low_value) * (index_with_fraction - index)
+
+
+class onlineRobustVol(onlineEstimator):
+    """
+    As vol.robust_vol_calc; updated with daily returns
+
+    backfill isn't supported, since it uses later values
+    """
+
+    def __init__(
+        self,
+        days: int = 35,
+        min_periods: int = 10,
+        vol_abs_min: float = 0.0000000001,
+        vol_floor: bool = True,
+        floor_min_quant: float = 0.05,
+        floor_min_periods: int = 100,
+        floor_days: int = 500,
+        **ignored_kwargs
+    ):
+        super().__init__()
+        self._ewm_std = onlineEWMAStd(span=days, min_periods=min_periods)
+        self._vol_abs_min = vol_abs_min
+        self._vol_floor = vol_floor
+        self._floor_quantile = onlineRollingQuantile(
+            floor_days, quantile=floor_min_quant, min_periods=floor_min_periods
+        )
+        # the floor is zero on the first day, and until the first quantile is available
+        self._floor = 0.0
+        self._first_update = True
+
+    def update(self, daily_return: float) -> float:
+        vol = self._ewm_std.update(daily_return)
+        vol = _apply_min_vol(vol, vol_abs_min=self._vol_abs_min)
+
+        if self._vol_floor:
+            floor = self._floor_quantile.update(vol)
+            if floor == floor and not self._first_update:
+                self._floor = floor
+            # same as np.maximum; nan if vol is nan
+            if vol == vol:
+                vol = max(vol, self._floor)
+            self._first_update = False
+
+        self._value = vol
+
+        return vol
+
+
+class onlineMixedVol(onlineEstimator):
+    """
+    As vol.mixed_vol_calc; updated with daily returns
+
+    backfill isn't supported, since it uses later values
+    """
+
+    def __init__(
+        self,
+        days: int = 35,
+        min_periods: int = 10,
+        slow_vol_years: int = 20,
+        proportion_of_slow_vol: float = 0.3,
+        vol_abs_min: float = 0.0000000001,
+        **ignored_kwargs
+    ):
+        super().__init__()
+        self._ewm_std = onlineEWMAStd(span=days, min_periods=min_periods)
+        slow_vol_days = slow_vol_years * BUSINESS_DAYS_IN_YEAR
+        self._long_vol = onlineEWMAMean(com=slow_vol_days)
+        self._proportion_of_slow_vol = proportion_of_slow_vol
+        self._vol_abs_min = vol_abs_min
+
+    def update(self, daily_return: float) -> float:
+        vol = self._ewm_std.update(daily_return)
+        long_vol = self._long_vol.update(vol)
+
+        proportion_of_slow_vol = self._proportion_of_slow_vol
+        vol = long_vol * proportion_of_slow_vol + vol * (1 - proportion_of_slow_vol)
+        vol = _apply_min_vol(vol, vol_abs_min=self._vol_abs_min)
+
+        self._value = vol
+
+        return vol
+
+
+def _apply_min_vol(vol: float, vol_abs_min: float) -> float:
+    if vol < vol_abs_min:
+        return vol_abs_min
+
+    return vol
+
+
+def center_of_mass(span: float = arg_not_supplied, com: float = arg_not_supplied):
+    """
+    Pandas style: one of span or com
+    """
+    if span is not arg_not_supplied and com is not arg_not_supplied:
+        raise Exception("Supply only one of span or com")
+    if span is not arg_not_supplied:
+        return (span - 1) / 2.0
+    if com is not arg_not_supplied:
+        return float(com)
+
+    raise Exception("Need to supply one of span or com")
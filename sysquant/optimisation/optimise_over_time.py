@@ -1,11 +1,17 @@
 import pandas as pd
 
 from syscore.genutils import progressBar
+from syscore.parallel import map_in_process_pool
 
 from syslogdiag.log_to_screen import logtoscreen, logger
 
-from sysquant.fitting_dates import generate_fitting_dates, listOfFittingDates
+from sysquant.fitting_dates import (
+    fitDates,
+    generate_fitting_dates,
+    listOfFittingDates,
+)
 from sysquant.optimisation.portfolio_optimiser import portfolioOptimiser
+from sysquant.optimisation.weights import portfolioWeights
 from sysquant.returns import returnsForOptimisation
 
 
@@ -16,6 +22,7 @@ class optimiseWeightsOverTime(object):
         date_method="expanding",
         rollyears=20,
         log: logger = logtoscreen("optimiser"),
+        workers: int = 1,
         **kwargs
     ):
 
@@ -28,6 +35,8 @@ class optimiseWeightsOverTime(object):
 
         self._fit_dates = fit_dates
         self._optimiser = optimiser_for_one_period
+        self._workers = int(workers)
+        self._log = log
 
     @property
     def fit_dates(self) -> listOfFittingDates:
@@ -37,8 +46,29 @@ class optimiseWeightsOverTime(object):
     def optimiser(self) -> portfolioOptimiser:
         return self._optimiser
 
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def log(self) -> logger:
+        return self._log
+
     def weights(self) -> pd.DataFrame:
         fit_dates = self.fit_dates
+
+        if self.workers > 1 and len(fit_dates) > 1:
+            weight_list = self._weights_for_each_period_in_process_pool()
+        else:
+            weight_list = self._weights_for_each_period()
+
+        weight_index = fit_dates.list_of_starting_periods()
+        weights = pd.DataFrame(weight_list, index=weight_index)
+
+        return weights
+
+    def _weights_for_each_period(self) -> list:
+        fit_dates = self.fit_dates
         optimiser = self.optimiser
 
         progress = progressBar(len(fit_dates), "Optimising weights")
@@ -50,7 +80,45 @@ class optimiseWeightsOverTime(object):
             weight_dict = optimiser.calculate_weights_for_period(fit_period)
             weight_list.append(weight_dict)
 
-        weight_index = fit_dates.list_of_starting_periods()
-        weights = pd.DataFrame(weight_list, index=weight_index)
+        return weight_list
 
-        return weights
+    def _weights_for_each_period_in_process_pool(self) -> list:
+        """
+        Each period is independent, so they can be done in any order. Workers are
+        forked, so they share the returns with this process rather than having
+        them pickled; only the weights come back.
+        """
+        fit_dates = self.fit_dates
+        optimiser = self.optimiser
+        self.log.msg(
+            "Optimising weights for %d periods with %d workers"
+            % (len(fit_dates), self.workers)
+        )
+
+        # the estimators for the whole dataset are calculated once in this process
+        # on the first period, rather than once in every worker
+        weight_list = [optimiser.calculate_weights_for_period(fit_dates[0])]
+
+        list_of_args = [(fit_period,) for fit_period in fit_dates[1:]]
+        weight_list += map_in_process_pool(
+            _weights_for_period,
+            list_of_args,
+            workers=self.workers,
+            initializer=_set_optimiser_for_workers,
+            initargs=(optimiser,),
+        )
+
+        return weight_list
+
+
+# set in each worker process by optimiseWeightsOverTime
+_optimiser_for_workers = None
+
+
+def _set_optimiser_for_workers(optimiser: portfolioOptimiser):
+    global _optimiser_for_workers
+    _optimiser_for_workers = optimiser
+
+
+def _weights_for_period(fit_period: fitDates) -> portfolioWeights:
+    return _optimiser_for_workers.calculate_weights_for_period(fit_period)
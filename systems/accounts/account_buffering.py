@@ -1,9 +1,9 @@
 import pandas as pd
 
-from syscore.algos import apply_buffer
+from syscore.algos import apply_buffer, apply_buffer_to_list_of_positions
 from syscore.objects import missing_data
 from syscore.pdutils import turnover
-from systems.system_cache import diagnostic
+from systems.system_cache import diagnostic, dont_cache
 
 from systems.accounts.account_inputs import accountInputs
 
@@ -116,3 +116,62 @@ class accountBuffering(accountInputs):
         )
 
         return buffered_position
+
+    @dont_cache
+    def buffer_positions_for_all_instruments_together(self, roundpositions=True):
+        """
+        Buffer the positions of every instrument in one go, and put them in the
+        cache, so later calls to get_buffered_position don't buffer them one at a time
+
+        Does nothing if we aren't buffering, or caching
+        """
+        if not self.parent.cache.are_we_caching():
+            return None
+
+        buffer_method = self.config.get_element_or_missing_data("buffer_method")
+        if buffer_method is missing_data:
+            return None
+
+        cache = self.parent.cache
+        dict_of_cache_refs = dict(
+            [
+                (
+                    instrument_code,
+                    cache.cache_ref(
+                        accountBuffering.get_buffered_position,
+                        self,
+                        instrument_code,
+                        roundpositions=roundpositions,
+                    ),
+                )
+                for instrument_code in self.get_instrument_list()
+            ]
+        )
+        instruments_to_buffer = [
+            instrument_code
+            for instrument_code, cache_ref in dict_of_cache_refs.items()
+            if cache_ref not in cache
+        ]
+        if len(instruments_to_buffer) == 0:
+            return None
+
+        self.log.msg("Calculating buffered positions for all instruments")
+        list_of_buffered_positions = apply_buffer_to_list_of_positions(
+            [
+                self.get_notional_position(instrument_code)
+                for instrument_code in instruments_to_buffer
+            ],
+            [
+                self.get_buffers_for_position(instrument_code)
+                for instrument_code in instruments_to_buffer
+            ],
+            trade_to_edge=self.config.buffer_trade_to_edge,
+            roundpositions=roundpositions,
+        )
+
+        for instrument_code, buffered_position in zip(
+            instruments_to_buffer, list_of_buffered_positions
+        ):
+            cache.set_item_in_cache(
+                buffered_position, dict_of_cache_refs[instrument_code]
+            )
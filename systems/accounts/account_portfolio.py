@@ -1,4 +1,6 @@
 import numpy as np
+
+from syscore.objects import missing_data
 from systems.system_cache import output
 from systems.accounts.account_instruments import accountInstruments
 from systems.accounts.curves.dict_of_account_curves import dictOfAccountCurves
@@ -31,6 +33,11 @@ class accountPortfolio(accountInstruments):
         self.log.terse("Calculating pandl for portfolio")
         capital = self.get_notional_capital()
         instruments = self.get_instrument_list()
+        # with a hedge stage, pandl uses its buffered positions rather than ours
+        if self.hedge_stage is missing_data:
+            self.buffer_positions_for_all_instruments_together(
+                roundpositions=roundpositions
+            )
         dict_of_pandl_by_instrument = dict(
             [
                 (
@@ -56,6 +63,11 @@ class accountPortfolio(accountInstruments):
     @output()
     def total_portfolio_level_turnover(self, roundpositions=True):
         list_of_instruments = self.get_instrument_list()
+        # unlike portfolio, turnover always uses our own buffered positions, even
+        # with a hedge stage
+        self.buffer_positions_for_all_instruments_together(
+            roundpositions=roundpositions
+        )
         list_of_turnovers_at_portfolio_level = [
             self.turnover_at_portfolio_level(
                 instrument_code, roundpositions=roundpositions
@@ -31,7 +31,7 @@ class pandlCalculationWithSRCosts(pandlCalculationWithGenericCosts):
         weighted_positions = apply_weighting(weight, self.positions)
         weighted_average_position = apply_weighting(weight, self.average_position)
 
-        return pandlCalculationWithSRCosts(
+        weighted_pandl_calculator = pandlCalculationWithSRCosts(
             positions=weighted_positions,
             capital=weighted_capital,
             average_position=weighted_average_position,
@@ -43,6 +43,9 @@ class pandlCalculationWithSRCosts(pandlCalculationWithGenericCosts):
             roundpositions=self.roundpositions,
             delayfill=self.delayfill,
         )
+        self._share_alignment_of_price_and_fx(weighted_pandl_calculator)
+
+        return weighted_pandl_calculator
 
     def costs_pandl_in_points(self) -> pd.Series:
         SR_cost_as_annualised_figure = self.SR_cost_as_annualised_figure_points()
@@ -7,6 +7,14 @@ from syscore.dateutils import Frequency, DAILY_PRICE_FREQ
 
 
 class pandlCalculation(object):
+    """
+    Profit and loss from prices and positions
+
+    Prices, positions, fx and capital are aligned to a common date index the first
+    time they are needed, and kept as numpy arrays, so working out the gross, net,
+    costs or percentage curves more than once doesn't align them again
+    """
+
     def __init__(
         self,
         price: pd.Series,
@@ -27,12 +35,15 @@ class pandlCalculation(object):
         self._delayfill = delayfill
         self._roundpositions = roundpositions
 
+        # aligned series, as (index, numpy array of values, name); see _aligned
+        self._aligned_cache = dict()
+
     def weight(self, weight: pd.Series):
 
         weighted_capital = apply_weighting(weight, self.capital)
         weighted_positions = apply_weighting(weight, self.positions)
 
-        return pandlCalculation(
+        weighted_pandl_calculator = pandlCalculation(
             self.price,
             positions=weighted_positions,
             fx=self.fx,
@@ -41,6 +52,16 @@ class pandlCalculation(object):
             roundpositions=self.roundpositions,
             delayfill=self.delayfill,
         )
+        self._share_alignment_of_price_and_fx(weighted_pandl_calculator)
+
+        return weighted_pandl_calculator
+
+    def _share_alignment_of_price_and_fx(self, weighted_pandl_calculator):
+        # weighting only changes positions and capital, so the weighted calculator
+        # can use the price returns and fx we've already aligned
+        for key, aligned in self._aligned_cache.items():
+            if key[0] in ALIGNMENTS_NOT_AFFECTED_BY_WEIGHTING:
+                weighted_pandl_calculator._aligned_cache[key] = aligned
 
     def capital_as_pd_series_for_frequency(
         self, frequency: Frequency = DAILY_PRICE_FREQ
@@ -59,8 +80,12 @@ class pandlCalculation(object):
         as_pd_series = self.as_pd_series(**kwargs)
 
         cum_returns = as_pd_series.cumsum()
-        resample_freq = from_config_frequency_pandas_resample(frequency)
-        cum_returns_at_frequency = cum_returns.resample(resample_freq).last()
+        if frequency is Frequency.BDay:
+            # much quicker than resampling
+            cum_returns_at_frequency = last_value_in_each_business_day(cum_returns)
+        else:
+            resample_freq = from_config_frequency_pandas_resample(frequency)
+            cum_returns_at_frequency = cum_returns.resample(resample_freq).last()
 
         ffill_cum_returns_at_frequency = cum_returns_at_frequency.ffill()
         returns_at_frequency = ffill_cum_returns_at_frequency.diff()
@@ -83,10 +108,15 @@ class pandlCalculation(object):
         return pandl
 
     def _percentage_pandl_given_pandl(self, pandl_in_base: pd.Series):
-        capital = self.capital
-        capital_aligned = capital.reindex(pandl_in_base.index, method="ffill")
+        capital_aligned, capital_name = self._aligned(
+            "capital", pandl_in_base.index, lambda: self.capital
+        )
 
-        return 100.0 * pandl_in_base / capital_aligned
+        return pd.Series(
+            100.0 * pandl_in_base.values / capital_aligned,
+            index=pandl_in_base.index,
+            name=_name_of_result(pandl_in_base.name, capital_name),
+        )
 
     def pandl_in_base_currency(self) -> pd.Series:
         pandl_in_ccy = self.pandl_in_instrument_currency()
@@ -95,10 +125,13 @@ class pandlCalculation(object):
         return pandl_in_base
 
     def _base_pandl_given_currency_pandl(self, pandl_in_ccy) -> pd.Series:
-        fx = self.fx
-        fx_aligned = fx.reindex(pandl_in_ccy.index, method="ffill")
+        fx_aligned, fx_name = self._aligned("fx", pandl_in_ccy.index, lambda: self.fx)
 
-        return pandl_in_ccy * fx_aligned
+        return pd.Series(
+            pandl_in_ccy.values * fx_aligned,
+            index=pandl_in_ccy.index,
+            name=_name_of_result(pandl_in_ccy.name, fx_name),
+        )
 
     def pandl_in_instrument_currency(self) -> pd.Series:
         pandl_in_points = self.pandl_in_points()
@@ -114,16 +147,52 @@ class pandlCalculation(object):
         return pandl_in_points * point_size
 
     def pandl_in_points(self) -> pd.Series:
+        price_index = self.price.index
+        price_returns, price_name = self._aligned(
+            "price_returns", price_index, lambda: self.price_returns
+        )
+        positions, positions_name = self._aligned(
+            "positions", price_index, self._positions_with_unique_dates
+        )
+
+        previous_positions = np.empty(len(positions))
+        previous_positions[:1] = np.nan
+        previous_positions[1:] = positions[:-1]
+        returns = previous_positions * price_returns
+
+        returns[np.isnan(returns)] = 0.0
+
+        return pd.Series(
+            returns,
+            index=price_index,
+            name=_name_of_result(positions_name, price_name),
+        )
+
+    def _positions_with_unique_dates(self) -> pd.Series:
         positions = self.positions
-        price_returns = self.price_returns
-        pos_series = positions.groupby(positions.index).last()
-        pos_series = pos_series.reindex(price_returns.index, method="ffill")
 
-        returns = pos_series.shift(1) * price_returns
+        return positions.groupby(positions.index).last()
+
+    def _aligned(self, key: str, index: pd.Index, get_series_func) -> tuple:
+        """
+        Series returned by get_series_func, forward filled to index, as a numpy array
+
+        Kept for the last index asked for, so curves on the same index (gross, costs,
+        net...) only align once
 
-        returns[returns.isna()] = 0.0
+        :returns: tuple, numpy array and name of series
+        """
+        aligned = self._aligned_cache.get(key, None)
+        if aligned is not None:
+            aligned_index, aligned_values, name = aligned
+            if aligned_index is index or aligned_index.equals(index):
+                return aligned_values, name
 
-        return returns
+        series = get_series_func()
+        aligned_values = series.reindex(index, method="ffill").values.astype(float)
+        self._aligned_cache[key] = (index, aligned_values, series.name)
+
+        return aligned_values, series.name
 
     @property
     def price_returns(self) -> pd.Series:
@@ -208,6 +277,51 @@ class pandlCalculation(object):
         return self.price.index
 
 
+ALIGNMENTS_NOT_AFFECTED_BY_WEIGHTING = ["price_returns", "fx"]
+
+
+def _name_of_result(name, other_name):
+    # as pandas, when multiplying two series
+    if name == other_name:
+        return name
+
+    return None
+
+
+def last_value_in_each_business_day(series: pd.Series) -> pd.Series:
+    """
+    Same as series.resample("B").last(), without generating the business days one by
+    one; weekend values go into the previous Friday, as when resampling
+
+    :param series: with a sorted DatetimeIndex
+    """
+    if len(series) == 0:
+        return series.resample("B").last()
+
+    days = series.index.values.astype("datetime64[D]")
+    business_days = np.busday_offset(days, 0, roll="backward")
+
+    all_days = np.arange(business_days[0], business_days[-1] + 1)
+    all_business_days = all_days[np.is_busday(all_days)]
+
+    # last value with data on each business day
+    values = series.values
+    has_data = ~pd.isna(values)
+    values_with_data = values[has_data]
+    business_days_with_data = business_days[has_data]
+    is_last_in_day = np.ones(len(values_with_data), dtype=bool)
+    is_last_in_day[:-1] = business_days_with_data[1:] != business_days_with_data[:-1]
+
+    last_values = pd.Series(
+        values_with_data[is_last_in_day],
+        index=pd.DatetimeIndex(business_days_with_data[is_last_in_day]),
+        name=series.name,
+    )
+    index = pd.DatetimeIndex(all_business_days, name=series.index.name)
+
+    return last_values.reindex(index)
+
+
 def apply_weighting(weight: pd.Series, thing_to_weight: pd.Series) -> pd.Series:
     aligned_weight = weight.reindex(thing_to_weight.index).ffill()
     weighted_thing = thing_to_weight * aligned_weight
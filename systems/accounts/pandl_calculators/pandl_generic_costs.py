@@ -17,7 +17,7 @@ class pandlCalculationWithGenericCosts(pandlCalculation):
         weighted_capital = apply_weighting(weight, self.capital)
         weighted_positions = apply_weighting(weight, self.positions)
 
-        return pandlCalculationWithGenericCosts(
+        weighted_pandl_calculator = pandlCalculationWithGenericCosts(
             self.price,
             positions=weighted_positions,
             fx=self.fx,
@@ -26,6 +26,9 @@ class pandlCalculationWithGenericCosts(pandlCalculation):
             roundpositions=self.roundpositions,
             delayfill=self.delayfill,
         )
+        self._share_alignment_of_price_and_fx(weighted_pandl_calculator)
+
+        return weighted_pandl_calculator
 
     def as_pd_series(self, percent=False, curve_type=NET_CURVE):
         if curve_type == NET_CURVE:
@@ -21,7 +21,7 @@ class pandlCalculationWithFills(pandlCalculation):
         weighted_capital = apply_weighting(weight, self.capital)
         weighted_positions = apply_weighting(weight, self.positions)
 
-        return pandlCalculationWithFills(
+        weighted_pandl_calculator = pandlCalculationWithFills(
             self.price,
             positions=weighted_positions,
             fx=self.fx,
@@ -30,6 +30,9 @@ class pandlCalculationWithFills(pandlCalculation):
             roundpositions=self.roundpositions,
             delayfill=self.delayfill,
         )
+        self._share_alignment_of_price_and_fx(weighted_pandl_calculator)
+
+        return weighted_pandl_calculator
 
     @classmethod
     def using_positions_and_prices_merged_from_fills(
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from systems.accounts.accounts_stage import Account
+from systems.basesystem import System
+from systems.tests.testdata import get_test_object_futures_with_portfolios
+
+
+def _system(buffer_method: str) -> System:
+    (
+        portfolio,
+        posobject,
+        combobject,
+        capobject,
+        rules,
+        rawdata,
+        data,
+        config,
+    ) = get_test_object_futures_with_portfolios()
+    config.buffer_method = buffer_method
+    # BUND has no prices in the test data
+    config.instrument_weights = dict(EDOLLAR=0.5, US10=0.5)
+
+    return System(
+        [portfolio, posobject, combobject, capobject, rules, rawdata, Account()],
+        data,
+        config,
+    )
+
+
+class TestBufferingAllInstrumentsTogether:
+    @pytest.mark.parametrize("buffer_method", ["position", "forecast"])
+    @pytest.mark.parametrize("roundpositions", [True, False])
+    def test_same_as_buffering_one_at_a_time(self, buffer_method, roundpositions):
+        system = _system(buffer_method)
+        system.accounts.portfolio(roundpositions=roundpositions)
+
+        # nothing buffered yet, so get_buffered_position buffers one at a time
+        uncached_system = _system(buffer_method)
+
+        for instrument_code in system.get_instrument_list():
+            cache_ref = system.cache.cache_ref(
+                Account.get_buffered_position,
+                system.accounts,
+                instrument_code,
+                roundpositions=roundpositions,
+            )
+            # put there by portfolio, buffering every instrument together
+            assert cache_ref in system.cache
+
+            pd.testing.assert_series_equal(
+                system.cache[cache_ref].value(),
+                uncached_system.accounts.get_buffered_position(
+                    instrument_code, roundpositions=roundpositions
+                ),
+            )
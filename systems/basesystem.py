@@ -1,4 +1,5 @@
 from syscore.objects import arg_not_supplied, missing_data
+from syscore.parallel import map_in_process_pool
 from sysdata.config.configdata import Config
 from sysdata.config.instruments import (
     get_duplicate_list_of_instruments_to_remove_from_config,
@@ -69,6 +70,7 @@ class System(object):
 
         self._data = data
         self._config = config
+        self._recording_config = None
         self._log = log
 
         self.config.system_init(self)
@@ -127,8 +129,20 @@ class System(object):
 
     @property
     def config(self):
+        # while the cache records what an item depends on, stages get a config
+        # which records the elements they read
+        if self._recording_config is not None:
+            return self._recording_config
+
         return self._config
 
+    @property
+    def unrecorded_config(self):
+        return self._config
+
+    def set_recording_config(self, recording_config=None):
+        self._recording_config = recording_config
+
     @property
     def name(self):
         return "base_system"
@@ -159,6 +173,62 @@ class System(object):
 
         self.data.log.set_logging_level(new_log_level)
 
+    def precompute(
+        self,
+        stage_method,
+        instrument_list: list = arg_not_supplied,
+        workers: int = 1,
+        other_args_list: list = arg_not_supplied,
+    ):
+        """
+        Calculate a stage method for many instruments in worker processes,
+        and merge everything they calculate into the cache
+
+        For example, to get all the capped forecasts using 8 processes:
+
+        system.precompute("forecastScaleCap.get_capped_forecast", workers=8,
+                          other_args_list=list(system.rules.trading_rules().keys()))
+
+        Workers are forked from this process, so they start with the current cache.
+        Items flagged as not_pickable (eg account curves) stay in the workers.
+
+        :param stage_method: "stage_name.method_name", or a bound stage method
+        :param instrument_list: instruments to calculate for, defaults to self.get_instrument_list()
+        :param workers: number of worker processes, 1 to run in this process
+        :param other_args_list: if passed, call method(instrument_code, other_arg) for each other_arg
+        :returns: None
+        """
+
+        stage_name, method_name = _resolve_stage_method_names(stage_method)
+        if instrument_list is arg_not_supplied:
+            instrument_list = self.get_instrument_list()
+
+        if other_args_list is arg_not_supplied:
+            list_of_other_args = [()]
+        else:
+            list_of_other_args = [(other_arg,) for other_arg in other_args_list]
+
+        list_of_args = [
+            (stage_name, method_name, instrument_code, list_of_other_args)
+            for instrument_code in instrument_list
+        ]
+
+        try:
+            list_of_new_cache_items = map_in_process_pool(
+                _precompute_for_instrument,
+                list_of_args,
+                workers=workers,
+                initializer=_set_system_for_precompute,
+                initargs=(self,),
+            )
+        finally:
+            # run serially, the initializer sets this in our own process; don't keep
+            # the system alive after we're done with it
+            _set_system_for_precompute(None)
+
+        for new_cache_items in list_of_new_cache_items:
+            self.cache.add_items_not_already_in_cache(new_cache_items)
+
     # note we have to use this special cache here, or we get recursion problems
     @base_system_cache()
     def get_instrument_list(
@@ -409,6 +479,38 @@ class System(object):
         return too_short
 
 
+def _resolve_stage_method_names(stage_method) -> tuple:
+    if isinstance(stage_method, str):
+        stage_name, method_name = stage_method.split(".")
+    else:
+        stage_name = stage_method.__self__.name
+        method_name = stage_method.__name__
+
+    return stage_name, method_name
+
+
+# set in each worker process by System.precompute, and reset afterwards
+_system_for_precompute = None
+
+
+def _set_system_for_precompute(system: System):
+    global _system_for_precompute
+    _system_for_precompute = system
+
+
+def _precompute_for_instrument(
+    stage_name: str, method_name: str, instrument_code: str, list_of_other_args: list
+) -> dict:
+    system = _system_for_precompute
+    cache_refs_before = set(system.cache.get_items_with_data())
+
+    stage_method = getattr(getattr(system, stage_name), method_name)
+    for other_args in list_of_other_args:
+        stage_method(instrument_code, *other_args)
+
+    return system.cache.get_pickable_items_not_in(cache_refs_before)
+
+
 if __name__ == "__main__":
     import doctest
 
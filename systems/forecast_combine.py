@@ -1,4 +1,5 @@
 from copy import copy
+from dataclasses import dataclass
 
 import pandas as pd
 
@@ -32,6 +33,27 @@ from systems.forecasting import Rules
 from systems.forecast_scale_cap import ForecastScaleCap
 
 
+@dataclass(frozen=True)
+class forecastEstimationGroup:
+    """
+    A pool of instruments estimated together, and the trading rules involved
+
+    Used as a cache key, so instruments in the same pool share one estimate
+    """
+
+    instrument_codes: tuple
+    rules: tuple
+
+    @classmethod
+    def from_lists(forecastEstimationGroup, instrument_codes: list, rules: list):
+        return forecastEstimationGroup(
+            instrument_codes=tuple(sorted(instrument_codes)), rules=tuple(sorted(rules))
+        )
+
+    def __str__(self):
+        return "%s: %s" % ("/".join(self.instrument_codes), "/".join(self.rules))
+
+
 class ForecastCombine(SystemStage):
     """
     Stage for combining forecasts (already capped and scaled)
@@ -549,10 +571,18 @@ class ForecastCombine(SystemStage):
         2015-06-01  0.464240  0.192962  0.342798
         2015-12-12  0.464240  0.192962  0.342798
         """
-        optimiser = self.calculation_of_raw_estimated_monthly_forecast_weights(
-            instrument_code
-        )
-        weights = optimiser.weights()
+        if self._forecast_weights_are_the_same_across_group():
+            # estimated once for all the instruments in the group
+            estimation_group = self.forecast_weight_estimation_group(instrument_code)
+            weights = self.get_raw_estimated_monthly_forecast_weights_for_group(
+                estimation_group
+            )
+        else:
+            optimiser = self.calculation_of_raw_estimated_monthly_forecast_weights(
+                instrument_code
+            )
+            weights = optimiser.weights()
+
         # Apply postprocessing cheap rules
         forecast_weights_cheap_rules_only = self._remove_expensive_rules_from_weights(
             instrument_code, weights
@@ -560,6 +590,63 @@ class ForecastCombine(SystemStage):
 
         return forecast_weights_cheap_rules_only
 
+    @diagnostic(protected=True)
+    def get_raw_estimated_monthly_forecast_weights_for_group(
+        self, estimation_group: forecastEstimationGroup
+    ) -> pd.DataFrame:
+        """
+        Estimate forecast weights for a group of instruments with the same cheap
+        trading rules, when every instrument would get the same weights
+
+        Cached under the group, so each group is only estimated once; hits are in
+        system.cache.stats()
+
+        :param estimation_group: forecastEstimationGroup
+        :returns: TxK pd.DataFrame containing weights, columns are trading rule variation names
+        """
+        self.log.terse(
+            "Calculating raw forecast weights for group %s" % str(estimation_group)
+        )
+
+        # any instrument in the group gives the same answer
+        instrument_code = estimation_group.instrument_codes[0]
+        optimiser = self.calculation_of_raw_estimated_monthly_forecast_weights(
+            instrument_code
+        )
+
+        return optimiser.weights()
+
+    @dont_cache
+    def _forecast_weights_are_the_same_across_group(self) -> bool:
+        # with gross returns and costs both pooled the net returns, and so the
+        # weights, don't depend on which instrument in the group we are doing
+        weighting_params = {
+            **self.config.forecast_weight_estimate,
+            **self.config.forecast_cost_estimates,
+        }
+        pool_gross_returns = str2Bool(weighting_params.get("pool_gross_returns", True))
+        use_pooled_costs = str2Bool(weighting_params.get("use_pooled_costs", False))
+
+        return pool_gross_returns and use_pooled_costs
+
+    @diagnostic()
+    def forecast_weight_estimation_group(
+        self, instrument_code: str
+    ) -> forecastEstimationGroup:
+        """
+        The instruments whose returns are pooled when estimating weights for this one,
+        and the rules being weighted
+
+        :param instrument_code:
+        :returns: forecastEstimationGroup
+        """
+        codes_to_use = self.has_same_cheap_rules_as_code(instrument_code)
+        trading_rule_list = self.cheap_trading_rules(instrument_code)
+
+        return forecastEstimationGroup.from_lists(
+            instrument_codes=codes_to_use, rules=trading_rule_list
+        )
+
     @diagnostic(not_pickable=True, protected=True)
     def calculation_of_raw_estimated_monthly_forecast_weights(self, instrument_code):
         """
@@ -1127,6 +1214,24 @@ class ForecastCombine(SystemStage):
         ['carry', 'ewmac16', 'ewmac8']
         """
 
+        estimation_group = self.forecast_correlation_estimation_group(instrument_code)
+        correlation_list = self.get_forecast_correlation_matrices_for_group(
+            estimation_group
+        )
+
+        return correlation_list
+
+    @diagnostic()
+    def forecast_correlation_estimation_group(
+        self, instrument_code: str
+    ) -> forecastEstimationGroup:
+        """
+        The instruments whose forecasts are pooled when estimating correlations for
+        this one, and all the rules they trade
+
+        :param instrument_code:
+        :returns: forecastEstimationGroup
+        """
         # Get some useful stuff from the config
         corr_params = copy(self.config.forecast_correlation_estimate)
 
@@ -1142,13 +1247,30 @@ class ForecastCombine(SystemStage):
         else:
             codes_to_use = [instrument_code]
 
-        correlation_list = (
-            self.get_forecast_correlation_matrices_from_instrument_code_list(
-                codes_to_use
-            )
+        all_rules = set()
+        for code in codes_to_use:
+            all_rules.update(self.get_trading_rule_list(code))
+
+        return forecastEstimationGroup.from_lists(
+            instrument_codes=codes_to_use, rules=list(all_rules)
         )
 
-        return correlation_list
+    @diagnostic(protected=True, not_pickable=True)
+    def get_forecast_correlation_matrices_for_group(
+        self, estimation_group: forecastEstimationGroup
+    ) -> CorrelationList:
+        """
+        Correlations for a group of instruments, shared by all of them
+
+        Cached under the group, so each group is only estimated once; hits are in
+        system.cache.stats()
+
+        :param estimation_group: forecastEstimationGroup
+        :returns: correlation_list object
+        """
+        return self.get_forecast_correlation_matrices_from_instrument_code_list(
+            list(estimation_group.instrument_codes)
+        )
 
     @diagnostic()
     def has_same_rules_as_code(self, instrument_code: str) -> list:
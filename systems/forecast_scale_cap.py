@@ -12,6 +12,11 @@ from systems.system_cache import input, dont_cache, diagnostic, output
 from syscore.genutils import str2Bool
 from syscore.objects import resolve_function, missing_data
 
+from sysquant.estimators.forecast_scalar import (
+    forecast_scalar,
+    forecast_scalars_for_dict_of_rules,
+)
+
 
 class ForecastScaleCap(SystemStage):
     """
@@ -258,6 +263,16 @@ class ForecastScaleCap(SystemStage):
 
         """
 
+        if self._estimate_pooled_scalars_for_all_rules_together(
+            instrument_code=instrument_code,
+            rule_variation_name=rule_variation_name,
+            forecast_scalar_config=forecast_scalar_config,
+        ):
+            return self._get_pooled_forecast_scalar_estimated_for_all_rules(
+                rule_variation_name=rule_variation_name,
+                forecast_scalar_config=forecast_scalar_config,
+            )
+
         # The config contains 'func' and some other arguments
         # we turn func which could be a string into a function, and then
         # call it with the other ags
@@ -281,6 +296,107 @@ class ForecastScaleCap(SystemStage):
 
         return scaling_factor
 
+    @dont_cache
+    def _estimate_pooled_scalars_for_all_rules_together(
+        self,
+        instrument_code: str,
+        rule_variation_name: str,
+        forecast_scalar_config: dict,
+    ) -> bool:
+        # only the default scalar function has a version that does all rules at once
+        if instrument_code != ALL_KEYNAME:
+            return False
+        if not self.parent.cache.are_we_caching():
+            return False
+        if resolve_function(forecast_scalar_config["func"]) is not forecast_scalar:
+            return False
+
+        return rule_variation_name in self._list_of_all_trading_rules()
+
+    @dont_cache
+    def _get_pooled_forecast_scalar_estimated_for_all_rules(
+        self, rule_variation_name: str, forecast_scalar_config: dict
+    ) -> pd.Series:
+        """
+        Estimate the pooled scalars for every trading rule in one go, and put them
+        in the cache, so later calls for the other rules don't estimate them again
+
+        :returns: scalar for rule_variation_name
+        """
+        list_of_rules = self._list_of_all_trading_rules()
+        self.log.msg(
+            "Estimating pooled forecast scalars for %s" % ", ".join(list_of_rules)
+        )
+
+        dict_of_cs_forecasts = dict(
+            [
+                (
+                    rule_name,
+                    self._get_cross_sectional_forecasts_for_instrument(
+                        ALL_KEYNAME, rule_name
+                    ),
+                )
+                for rule_name in list_of_rules
+            ]
+        )
+
+        scalar_kwargs = copy(forecast_scalar_config)
+        scalar_kwargs.pop("func")
+        dict_of_scaling_factors = forecast_scalars_for_dict_of_rules(
+            dict_of_cs_forecasts,
+            target_abs_forecast=self.target_abs_forecast(),
+            **scalar_kwargs
+        )
+
+        for rule_name, scaling_factor in dict_of_scaling_factors.items():
+            if rule_name == rule_variation_name:
+                # the cache decorator will store this one
+                continue
+            self._set_pooled_forecast_scalar_in_cache(
+                scaling_factor,
+                rule_variation_name=rule_name,
+                forecast_scalar_config=forecast_scalar_config,
+            )
+
+        return dict_of_scaling_factors[rule_variation_name]
+
+    @dont_cache
+    def _set_pooled_forecast_scalar_in_cache(
+        self,
+        scaling_factor: pd.Series,
+        rule_variation_name: str,
+        forecast_scalar_config: dict,
+    ):
+        # must be the same as the reference when called from _get_forecast_scalar_estimated
+        cache = self.parent.cache
+        cache_ref = cache.cache_ref(
+            ForecastScaleCap._get_forecast_scalar_estimated_from_instrument_code,
+            self,
+            instrument_code=ALL_KEYNAME,
+            rule_variation_name=rule_variation_name,
+            forecast_scalar_config=forecast_scalar_config,
+        )
+        if cache_ref in cache:
+            return None
+
+        cache.set_item_in_cache(scaling_factor, cache_ref, protected=True)
+
+    @diagnostic()
+    def _list_of_all_trading_rules(self) -> list:
+        """
+        All the trading rules used by any instrument
+
+        If we don't have a combForecast this will be all the rules in the system
+        """
+        list_of_rules = set()
+        for instrument_code in self.parent.get_instrument_list():
+            list_of_rules.update(self._get_trading_rule_list(instrument_code))
+
+        if len(list_of_rules) == 0:
+            list_of_rules = self.rules_stage.trading_rules().keys()
+
+        return sorted(list_of_rules)
+
     @dont_cache
     def target_abs_forecast(self) -> float:
         return self.config.average_absolute_forecast
@@ -0,0 +1,398 @@
+"""
+A persistent on disk store for system cache items, shared between runs
+
+Items are stored under a hash of the cache reference, the instrument list, the
+config elements read while calculating the item, and a fingerprint of the input
+data it depends on. If none of these have changed since an item was written, a
+later run loads it from disk instead of calculating it again.
+
+What an item depends on (cacheDependencies) is recorded when it is calculated,
+including everything its nested cached calls depend on, and is stored with it. An
+instrument level item depends on the data for that instrument, unless it uses an
+item for another instrument (eg a forecast scalar pooled across instruments).
+Items across instruments depend on the data for all of them. So new prices for one
+instrument don't make us recalculate items for the others.
+
+Switched on in config:
+
+system_cache:
+  persistent: True
+  directory: '/home/me/system_cache'  # empty string for the default in the home directory
+  max_size_mb: 2000
+
+When the store grows beyond max_size_mb the least recently used files are deleted.
+"""
+
+import hashlib
+import os
+import pickle
+
+import pandas as pd
+
+from syscore.fileutils import file_in_home_dir, get_resolved_pathname
+from syscore.objects import missing_data, arg_not_supplied
+from sysdata.config.configdata import Config, RESERVED_NAMES
+
+DEFAULT_PERSISTENT_CACHE_DIRECTORY = file_in_home_dir("pysystemtrade_system_cache")
+PERSISTENT_CACHE_FILE_EXTENSION = ".pck"
+CONFIG_ELEMENT_NAME = "system_cache"
+BYTES_PER_MB = 1024 * 1024
+
+
+class persistentCacheStore(object):
+    def __init__(self, directory: str, max_size_bytes: int):
+        self._directory = get_resolved_pathname(directory)
+        self._max_size_bytes = max_size_bytes
+        self._file_sizes = missing_data
+
+    @classmethod
+    def from_config_dict(persistentCacheStore, config_dict: dict):
+        directory = config_dict.get("directory", "")
+        if directory == "" or directory is None:
+            directory = DEFAULT_PERSISTENT_CACHE_DIRECTORY
+        max_size_bytes = int(float(config_dict.get("max_size_mb", 2000)) * BYTES_PER_MB)
+
+        return persistentCacheStore(directory, max_size_bytes=max_size_bytes)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def max_size_bytes(self) -> int:
+        return self._max_size_bytes
+
+    def read(self, key: str):
+        filename = self._filename(key)
+        try:
+            with open(filename, "rb") as fhandle:
+                cache_element = pickle.load(fhandle)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return missing_data
+
+        # mark as recently used, for eviction
+        os.utime(filename)
+
+        return cache_element
+
+    def write(self, key: str, cache_element):
+        os.makedirs(self.directory, exist_ok=True)
+        filename = self._filename(key)
+
+        # write then rename, so a reader never sees half a file
+        temp_filename = "%s.%d.tmp" % (filename, os.getpid())
+        with open(temp_filename, "wb") as fhandle:
+            pickle.dump(cache_element, fhandle)
+        os.replace(temp_filename, filename)
+
+        file_sizes = self._get_file_sizes()
+        file_sizes[filename] = os.path.getsize(filename)
+        self._evict_if_too_large()
+
+    def _evict_if_too_large(self):
+        file_sizes = self._get_file_sizes()
+        total_size = sum(file_sizes.values())
+        if total_size <= self.max_size_bytes:
+            return None
+
+        filenames_oldest_used_first = sorted(
+            file_sizes.keys(), key=_last_used_time_of_file
+        )
+        for filename in filenames_oldest_used_first:
+            if total_size <= self.max_size_bytes:
+                break
+            total_size -= file_sizes.pop(filename)
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def _get_file_sizes(self) -> dict:
+        file_sizes = self._file_sizes
+        if file_sizes is missing_data:
+            file_sizes = self._file_sizes = self._scan_file_sizes()
+
+        return file_sizes
+
+    def _scan_file_sizes(self) -> dict:
+        if not os.path.isdir(self.directory):
+            return dict()
+
+        file_sizes = dict(
+            [
+                (entry.path, entry.stat().st_size)
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(PERSISTENT_CACHE_FILE_EXTENSION)
+            ]
+        )
+
+        return file_sizes
+
+    def _filename(self, key: str) -> str:
+        return os.path.join(self.directory, key + PERSISTENT_CACHE_FILE_EXTENSION)
+
+
+def _last_used_time_of_file(filename: str) -> float:
+    try:
+        return os.stat(filename).st_mtime
+    except OSError:
+        return 0.0
+
+
+class cacheDependencies(object):
+    """
+    What a cached item was calculated from: the names of config elements read, and
+    the data for some instruments (or all of them)
+    """
+
+    def __init__(
+        self,
+        config_element_names: set = arg_not_supplied,
+        instrument_codes: set = arg_not_supplied,
+        all_instruments: bool = False,
+        all_config: bool = False,
+    ):
+        if config_element_names is arg_not_supplied:
+            config_element_names = set()
+        if instrument_codes is arg_not_supplied:
+            instrument_codes = set()
+
+        self.config_element_names = config_element_names
+        self.instrument_codes = instrument_codes
+        self.all_instruments = all_instruments
+        self.all_config = all_config
+
+    def __repr__(self):
+        return "cacheDependencies(config: %s, instruments: %s)" % (
+            "all" if self.all_config else sorted(self.config_element_names),
+            "all" if self.all_instruments else sorted(self.instrument_codes),
+        )
+
+    @classmethod
+    def unknown(cacheDependencies):
+        # for items we didn't see calculated, eg from precompute worker processes
+        return cacheDependencies(all_instruments=True, all_config=True)
+
+    def add(self, other_dependencies: "cacheDependencies"):
+        self.config_element_names.update(other_dependencies.config_element_names)
+        self.instrument_codes.update(other_dependencies.instrument_codes)
+        self.all_instruments = (
+            self.all_instruments or other_dependencies.all_instruments
+        )
+        self.all_config = self.all_config or other_dependencies.all_config
+
+
+class recordingConfig(Config):
+    """
+    Stands in for a Config while a cached item is being calculated, adding the names
+    of the elements read to elements_read. Everything else goes to the Config.
+    """
+
+    def __init__(self, config: Config, elements_read: set):
+        object.__setattr__(self, "_recorded_config", config)
+        object.__setattr__(self, "_elements_read", elements_read)
+
+    def __getattr__(self, name: str):
+        # only called for names which aren't methods or properties of Config, ie
+        # elements. Reading one which doesn't exist counts, since adding it changes
+        # things.
+        if name[0] != "_":
+            self._elements_read.add(name)
+
+        return getattr(self._recorded_config, name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self._recorded_config, name, value)
+
+
+def persistent_cache_key(cache_ref, item_fingerprint: str) -> str:
+    key_string = "%s|%s" % (repr(cache_ref), item_fingerprint)
+
+    return hashlib.sha1(key_string.encode("utf-8")).hexdigest()
+
+
+def dependencies_key(cache_ref) -> str:
+    # where the cacheDependencies of an item are stored
+    key_string = "%s|dependencies" % repr(cache_ref)
+
+    return hashlib.sha1(key_string.encode("utf-8")).hexdigest()
+
+
+def item_fingerprint(
+    system, dependencies: cacheDependencies, instrument_fingerprints: dict
+) -> str:
+    """
+    Hash of the config elements and input data an item depends on, and the
+    instrument list
+
+    :param system: System
+    :param dependencies: cacheDependencies
+    :param instrument_fingerprints: dict, instrument code: data fingerprint. Filled
+        in as required, so pass the same dict each time.
+    :return: str
+    """
+    config = system.config
+    if dependencies.all_config:
+        config_fingerprint_string = _config_fingerprint(config)
+    else:
+        config_fingerprint_string = _config_subset_fingerprint(
+            config, dependencies.config_element_names
+        )
+
+    instrument_list = system.get_instrument_list()
+    if dependencies.all_instruments:
+        instrument_codes = instrument_list
+    else:
+        instrument_codes = sorted(dependencies.instrument_codes)
+
+    list_of_instrument_fingerprints = [
+        "%s:%s"
+        % (
+            instrument_code,
+            _cached_instrument_data_fingerprint(
+                system, instrument_code, instrument_fingerprints
+            ),
+        )
+        for instrument_code in instrument_codes
+    ]
+    fingerprint_string = "%s|%s|%s" % (
+        config_fingerprint_string,
+        ",".join(instrument_list),
+        "|".join(list_of_instrument_fingerprints),
+    )
+
+    return hashlib.sha1(fingerprint_string.encode("utf-8")).hexdigest()
+
+
+def system_fingerprint(
+    system, config_elements_to_ignore: list = arg_not_supplied
+) -> str:
+    """
+    Hash of the config and input data of a system
+
+    :param system: System
+    :param config_elements_to_ignore: names of config elements which don't count
+    :return: str
+    """
+    config_fingerprint = _config_fingerprint(
+        system.config, elements_to_ignore=config_elements_to_ignore
+    )
+    data_fingerprint = _data_fingerprint(system)
+    fingerprint_string = "%s|%s" % (config_fingerprint, data_fingerprint)
+
+    return hashlib.sha1(fingerprint_string.encode("utf-8")).hexdigest()
+
+
+def config_fingerprint(config, elements_to_ignore: list = arg_not_supplied) -> str:
+    """
+    Hash of a config, which is the same in every run if the config is
+
+    :param config: Config
+    :param elements_to_ignore: names of config elements which don't count
+    :return: str
+    """
+    fingerprint_string = _config_fingerprint(
+        config, elements_to_ignore=elements_to_ignore
+    )
+
+    return hashlib.sha1(fingerprint_string.encode("utf-8")).hexdigest()
+
+
+def _config_fingerprint(config, elements_to_ignore: list = arg_not_supplied) -> str:
+    if elements_to_ignore is arg_not_supplied:
+        elements_to_ignore = [CONFIG_ELEMENT_NAME]
+
+    config_as_dict = config.as_dict()
+    for element_name in elements_to_ignore:
+        config_as_dict.pop(element_name, None)
+
+    return _stable_repr(config_as_dict)
+
+
+def _config_subset_fingerprint(config, element_names: set) -> str:
+    # reading an element which doesn't exist counts, since adding it changes things
+    element_names = [
+        element_name
+        for element_name in element_names
+        if element_name != CONFIG_ELEMENT_NAME
+        and element_name not in RESERVED_NAMES
+        and not hasattr(Config, element_name)
+    ]
+    config_subset = dict(
+        [
+            (element_name, config.get_element_or_missing_data(element_name))
+            for element_name in element_names
+        ]
+    )
+
+    return _stable_repr(config_subset)
+
+
+def _stable_repr(config_item) -> str:
+    """
+    Like repr, but without memory addresses, so it's the same in every run
+    """
+    if isinstance(config_item, dict):
+        return "{%s}" % ", ".join(
+            [
+                "%s: %s" % (_stable_repr(key), _stable_repr(config_item[key]))
+                for key in sorted(config_item.keys(), key=str)
+            ]
+        )
+    elif isinstance(config_item, (list, tuple)):
+        return "[%s]" % ", ".join([_stable_repr(element) for element in config_item])
+    elif isinstance(config_item, (str, int, float, bool)) or config_item is None:
+        return repr(config_item)
+    elif callable(config_item) and hasattr(config_item, "__qualname__"):
+        return "%s.%s" % (config_item.__module__, config_item.__qualname__)
+    elif hasattr(config_item, "__dict__"):
+        return "%s(%s)" % (type(config_item).__name__, _stable_repr(vars(config_item)))
+
+    return repr(config_item)
+
+
+def _data_fingerprint(system) -> str:
+    instrument_list = system.get_instrument_list()
+    data = system.data
+    base_currency = system.config.base_currency
+    list_of_instrument_fingerprints = [
+        "%s:%s"
+        % (
+            instrument_code,
+            _instrument_data_fingerprint(data, instrument_code, base_currency),
+        )
+        for instrument_code in instrument_list
+    ]
+
+    return "|".join(list_of_instrument_fingerprints)
+
+
+def _cached_instrument_data_fingerprint(
+    system, instrument_code: str, instrument_fingerprints: dict
+) -> str:
+    fingerprint = instrument_fingerprints.get(instrument_code, None)
+    if fingerprint is None:
+        fingerprint = instrument_fingerprints[instrument_code] = (
+            _instrument_data_fingerprint(
+                system.data, instrument_code, system.config.base_currency
+            )
+        )
+
+    return fingerprint
+
+
+def _instrument_data_fingerprint(data, instrument_code: str, base_currency: str) -> str:
+    list_of_data = [
+        data.get_raw_price(instrument_code),
+        data.get_fx_for_instrument(instrument_code, base_currency),
+    ]
+    if hasattr(data, "get_instrument_raw_carry_data"):
+        list_of_data.append(data.get_instrument_raw_carry_data(instrument_code))
+
+    list_of_hashes = [
+        str(pd.util.hash_pandas_object(some_data, index=True).sum())
+        for some_data in list_of_data
+    ]
+    list_of_hashes.append(repr(data.get_raw_cost_data(instrument_code)))
+
+    return "/".join(list_of_hashes)
@@ -1,7 +1,24 @@
+"""
+Greedy search across integer contract positions
+
+At each iteration we try a one contract step in each asset, and take the step which
+improves the objective (tracking error plus costs) the most.
+
+Rather than evaluating the objective in full for every candidate step, which is
+O(N^2) each and so O(N^3) per iteration, we keep covariance @ (weights - optimal) as
+state. All the candidate steps can then be scored at once in O(N), since each is a
+rank one change. To guarantee exactly the same solution as the full evaluation, the
+scores come with error bounds, and any candidate which could be the best (or could
+have a negative variance) is evaluated in full before we choose.
+"""
+
 from copy import copy
 
 import numpy as np
 
+# generous bound on relative floating point error in the incremental scores
+RELATIVE_SCORE_ERROR = 1e-10
+
 
 def greedy_algo_across_integer_values(
     obj_instance: "objectiveFunctionForGreedy",
@@ -12,6 +29,192 @@ def greedy_algo_across_integer_values(
     best_value = obj_instance.evaluate(weight_start)
     best_solution = weight_start
 
+    at_limit = np.full(len(weight_start), False)
+    search_state = greedySearchState(obj_instance, weights=best_solution)
+
+    while True:
+        new_best_value, index_to_step, at_limit = _find_possible_new_best_vectorised(
+            search_state=search_state,
+            best_value=best_value,
+            obj_instance=obj_instance,
+            at_limit=at_limit,
+        )
+
+        if new_best_value < best_value:
+            # reached a new optimium
+            best_value = new_best_value
+            best_solution = search_state.take_step(index_to_step)
+        else:
+            # we can't do any better
+            break
+
+    return best_solution
+
+
+class greedySearchState(object):
+    """
+    Current weights, with covariance @ (weights - optimal weights) and the trade costs
+    kept up to date as steps are taken
+    """
+
+    def __init__(self, obj_instance: "objectiveFunctionForGreedy", weights: np.array):
+        self._covariance = obj_instance.covariance_matrix_as_np
+        self._weights_optimal = obj_instance.weights_optimal_as_np
+        self._steps = obj_instance.per_contract_value_as_np * obj_instance.direction_as_np
+
+        if obj_instance.no_prior_positions_provided:
+            self._cost_multipliers = np.zeros(len(weights))
+            self._weights_prior = np.zeros(len(weights))
+        else:
+            self._cost_multipliers = obj_instance.costs_as_np
+            self._weights_prior = obj_instance.weights_prior_as_np_replace_nans_with_zeros
+        self._trade_shadow_cost = obj_instance.trade_shadow_cost
+
+        self._weights = copy(weights)
+        self._solution_gap = weights - self._weights_optimal
+        self._covariance_times_gap = self._covariance.dot(self._solution_gap)
+
+    @property
+    def weights(self) -> np.array:
+        return self._weights
+
+    @property
+    def steps(self) -> np.array:
+        return self._steps
+
+    def take_step(self, index: int) -> np.array:
+        step = self._steps[index]
+        weights = copy(self._weights)
+        weights[index] = weights[index] + step
+
+        self._weights = weights
+        self._solution_gap = weights - self._weights_optimal
+        # rank one update
+        self._covariance_times_gap = (
+            self._covariance_times_gap + step * self._covariance[:, index]
+        )
+
+        return weights
+
+    def bounds_on_objective_after_steps(self, indices: np.array) -> tuple:
+        """
+        Objective (tracking error plus costs) if we take a single step in each of the
+        assets in indices, with lower and upper bounds allowing for rounding
+
+        :returns: tuple of np.array: lower bound, upper bound, and lower bound on variance
+        """
+        steps = self._steps[indices]
+        covariance_times_gap = self._covariance_times_gap[indices]
+        covariance_diagonal = self._covariance[indices, indices]
+
+        variance = self._solution_gap.dot(self._covariance_times_gap)
+        change_in_variance = (
+            2 * steps * covariance_times_gap + steps * steps * covariance_diagonal
+        )
+        variance_after_steps = variance + change_in_variance
+        variance_error = RELATIVE_SCORE_ERROR * (
+            np.abs(self._solution_gap).dot(np.abs(self._covariance_times_gap))
+            + np.abs(change_in_variance)
+        )
+
+        costs_after_steps, costs_error = self._costs_after_steps(indices, steps)
+
+        lower_variance = variance_after_steps - variance_error
+        lower_bound = (
+            np.sqrt(np.maximum(lower_variance, 0.0)) + costs_after_steps - costs_error
+        )
+        upper_bound = (
+            np.sqrt(np.maximum(variance_after_steps + variance_error, 0.0))
+            + costs_after_steps
+            + costs_error
+        )
+
+        return lower_bound, upper_bound, lower_variance
+
+    def _costs_after_steps(self, indices: np.array, steps: np.array) -> tuple:
+        trade_costs = np.abs(
+            self._cost_multipliers
+            * (self._weights - self._weights_prior)
+            * self._trade_shadow_cost
+        )
+        total_trade_costs = trade_costs.sum()
+
+        new_trade_costs_for_indices = np.abs(
+            self._cost_multipliers[indices]
+            * (self._weights[indices] + steps - self._weights_prior[indices])
+            * self._trade_shadow_cost
+        )
+        costs_after_steps = (
+            total_trade_costs - trade_costs[indices] + new_trade_costs_for_indices
+        )
+        costs_error = RELATIVE_SCORE_ERROR * (
+            total_trade_costs + new_trade_costs_for_indices
+        )
+
+        return costs_after_steps, costs_error
+
+
+def _find_possible_new_best_vectorised(
+    search_state: greedySearchState,
+    best_value: float,
+    obj_instance: "objectiveFunctionForGreedy",
+    at_limit: np.array,
+) -> tuple:
+    best_solution = search_state.weights
+    temp_weights = best_solution + search_state.steps
+    at_limit = at_limit | _would_be_at_limit(temp_weights, obj_instance=obj_instance)
+
+    candidates = np.flatnonzero(~at_limit)
+    if len(candidates) == 0:
+        return best_value, None, at_limit
+
+    lower_bound, upper_bound, lower_variance = search_state.bounds_on_objective_after_steps(
+        candidates
+    )
+
+    # the best candidate can't be worse than the lowest upper bound, and has to beat
+    # the current value; anything which could have a negative variance is evaluated
+    # in full, so it raises an exception exactly as it would have done
+    could_be_best = (lower_bound <= np.min(upper_bound)) & (lower_bound < best_value)
+    might_be_negative = lower_variance < 0
+    candidates_to_evaluate = candidates[could_be_best | might_be_negative]
+
+    new_best_value = best_value
+    index_to_step = None
+    for i in candidates_to_evaluate:
+        temp_step = copy(best_solution)
+        temp_step[i] = temp_weights[i]
+        temp_objective_value = obj_instance.evaluate(temp_step)
+
+        if temp_objective_value < new_best_value:
+            new_best_value = temp_objective_value
+            index_to_step = i
+
+    return new_best_value, index_to_step, at_limit
+
+
+def _would_be_at_limit(
+    temp_weights: np.array, obj_instance: "objectiveFunctionForGreedy"
+) -> np.array:
+    direction = obj_instance.direction_as_np
+    over_maximum = (direction > 0) & (temp_weights > obj_instance.maxima_as_np)
+    under_minimum = ~(direction > 0) & (temp_weights < obj_instance.minima_as_np)
+
+    return over_maximum | under_minimum
+
+
+def greedy_algo_across_integer_values_with_loop(
+    obj_instance: "objectiveFunctionForGreedy",
+) -> np.array:
+    """
+    Evaluates the objective in full for every candidate step; slower but simpler
+    """
+    ## Starting weights
+    ## These will either be all zero, or in the presence of constraints will include the minima
+    weight_start = obj_instance.starting_weights_as_np
+    best_value = obj_instance.evaluate(weight_start)
+    best_solution = weight_start
+
     at_limit = [False] * len(weight_start)
 
     done = False
@@ -1,10 +1,13 @@
 import datetime
 from copy import copy
+from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 from syscore.genutils import progressBar
 from syscore.objects import arg_not_supplied, missing_data
+from syscore.parallel import map_in_process_pool
 from syscore.pdutils import calculate_cost_deflator, get_row_of_series
 from systems.provided.dynamic_small_system_optimise.optimisation import (
     objectiveFunctionForGreedy,
@@ -13,6 +16,9 @@ from systems.provided.dynamic_small_system_optimise.optimisation import (
 from systems.provided.dynamic_small_system_optimise.buffering import (
     speedControlForDynamicOpt,
 )
+from systems.provided.dynamic_small_system_optimise.position_path_checkpoint import (
+    positionPathCheckpoint,
+)
 
 from systems.stage import SystemStage
 from systems.system_cache import diagnostic
@@ -26,6 +32,18 @@ from sysquant.estimators.covariance import covarianceEstimate
 from sysquant.estimators.mean_estimator import meanEstimates
 
 
+@dataclass
+class inputsForOptimisationOnDate:
+    """
+    Everything the optimisation needs on a date, except the previous positions
+    """
+
+    covariance_matrix: covarianceEstimate
+    per_contract_value: portfolioWeights
+    contracts_optimal: portfolioWeights
+    costs: meanEstimates
+
+
 class optimisedPositions(SystemStage):
     @property
     def name(self):
@@ -44,24 +62,148 @@ class optimisedPositions(SystemStage):
 
     @diagnostic()
     def get_optimised_position_df(self) -> pd.DataFrame:
+        """
+        Each day depends on the positions of the previous day, so we have to walk
+        through the dates in order. But the inputs for each day don't, so they are
+        calculated in blocks ahead of the walk, in worker processes if configured.
+        The position path can be checkpointed after each block.
+
+        dynamic_optimisation_backtest:
+          workers: 1
+          days_per_block: 250
+          checkpoint: False
+        """
         self.log.msg("Optimising positions for small capital: may take a while!")
         common_index = list(self.common_index())
-        p = progressBar(len(common_index), show_timings=True, show_each_time=True)
-        previous_optimal_positions = portfolioWeights.allzeros(self.instrument_list())
-        position_list = []
-        for relevant_date in common_index:
-            # self.log.msg(relevant_date)
-            optimal_positions = self.get_optimal_positions_with_fixed_contract_values(
-                relevant_date, previous_positions=previous_optimal_positions
+        backtest_config = self.config.dynamic_optimisation_backtest
+        workers = int(backtest_config["workers"])
+        days_per_block = int(backtest_config["days_per_block"])
+
+        checkpoint = positionPathCheckpoint.for_system(self.parent, backtest_config)
+        position_list = checkpoint.load(common_index)
+        if len(position_list) > 0:
+            self.log.msg(
+                "Resuming from checkpoint %s with %d of %d dates done"
+                % (checkpoint.filename, len(position_list), len(common_index))
+            )
+            previous_optimal_positions = copy(position_list[-1])
+        else:
+            previous_optimal_positions = portfolioWeights.allzeros(
+                self.instrument_list()
+            )
+
+        p = progressBar(
+            len(common_index) - len(position_list),
+            show_timings=True,
+            show_each_time=True,
+        )
+        for block_start in range(len(position_list), len(common_index), days_per_block):
+            dates_in_block = common_index[block_start : block_start + days_per_block]
+            list_of_inputs = self.get_inputs_for_optimisation_on_dates(
+                dates_in_block, workers=workers
             )
-            position_list.append(optimal_positions)
-            previous_optimal_positions = copy(optimal_positions)
-            p.iterate()
+            for relevant_date, inputs in zip(dates_in_block, list_of_inputs):
+                optimal_positions = self._get_optimal_positions_given_inputs(
+                    inputs,
+                    relevant_date=relevant_date,
+                    previous_positions=previous_optimal_positions,
+                )
+                position_list.append(optimal_positions)
+                previous_optimal_positions = copy(optimal_positions)
+                p.iterate()
+
+            checkpoint.save(common_index[: len(position_list)], position_list)
+
         p.finished()
+        checkpoint.delete()
         position_df = pd.DataFrame(position_list, index=common_index)
 
         return position_df
 
+    def get_inputs_for_optimisation_on_dates(
+        self, list_of_dates: list, workers: int = 1
+    ) -> list:
+        """
+        :return: list of inputsForOptimisationOnDate, same order as list_of_dates
+        """
+        if workers <= 1 or len(list_of_dates) <= 1:
+            return self._calculate_inputs_for_optimisation_on_dates(list_of_dates)
+
+        # so the dataframes the inputs come from are calculated once, before the
+        # workers are forked, rather than once in every worker
+        first_inputs = self._calculate_inputs_for_optimisation_on_dates(
+            list_of_dates[:1]
+        )
+
+        list_of_args = [
+            (chunk_of_dates,)
+            for chunk_of_dates in _split_into_chunks(list_of_dates[1:], workers)
+        ]
+        list_of_inputs_by_chunk = map_in_process_pool(
+            _inputs_for_optimisation_on_dates,
+            list_of_args,
+            workers=workers,
+            initializer=_set_stage_for_inputs,
+            initargs=(self,),
+        )
+
+        list_of_inputs = first_inputs
+        for inputs_for_chunk in list_of_inputs_by_chunk:
+            list_of_inputs += inputs_for_chunk
+
+        return list_of_inputs
+
+    def _calculate_inputs_for_optimisation_on_dates(self, list_of_dates: list) -> list:
+        # same values as get_inputs_for_optimisation_on_date, but taking rows of
+        # dataframes for all the dates at once
+        list_of_per_contract_values = _rows_of_df_as_dicts(
+            self.get_per_contract_value_as_proportion_of_capital_df(), list_of_dates
+        )
+        list_of_contracts_optimal = _rows_of_df_as_dicts(
+            self.get_original_position_contracts_df(), list_of_dates
+        )
+        list_of_costs = _rows_of_df_as_dicts(
+            self.get_costs_per_contract_as_proportion_of_capital_df(), list_of_dates
+        )
+
+        return [
+            inputsForOptimisationOnDate(
+                covariance_matrix=self.get_covariance_matrix(
+                    relevant_date=relevant_date
+                ),
+                per_contract_value=portfolioWeights(per_contract_value),
+                contracts_optimal=portfolioWeights(contracts_optimal),
+                costs=meanEstimates(costs),
+            )
+            for relevant_date, per_contract_value, contracts_optimal, costs in zip(
+                list_of_dates,
+                list_of_per_contract_values,
+                list_of_contracts_optimal,
+                list_of_costs,
+            )
+        ]
+
+    def get_inputs_for_optimisation_on_date(
+        self, relevant_date: datetime.datetime = arg_not_supplied
+    ) -> inputsForOptimisationOnDate:
+        covariance_matrix = self.get_covariance_matrix(relevant_date=relevant_date)
+
+        per_contract_value = self.get_per_contract_value(relevant_date)
+        contracts_optimal = self.original_position_contracts_for_relevant_date(
+            relevant_date
+        )
+
+        costs = self.get_costs_per_contract_as_proportion_of_capital_all_instruments(
+            relevant_date
+        )
+
+        return inputsForOptimisationOnDate(
+            covariance_matrix=covariance_matrix,
+            per_contract_value=per_contract_value,
+            contracts_optimal=contracts_optimal,
+            costs=costs,
+        )
+
     def get_optimal_positions_with_fixed_contract_values(
         self,
         relevant_date: datetime.datetime = arg_not_supplied,
@@ -69,12 +211,29 @@ class optimisedPositions(SystemStage):
         maximum_positions: portfolioWeights = arg_not_supplied,
     ) -> portfolioWeights:
 
-        obj_instance = self._get_optimal_positions_objective_instance(
+        inputs = self.get_inputs_for_optimisation_on_date(relevant_date)
+
+        return self._get_optimal_positions_given_inputs(
+            inputs,
             relevant_date=relevant_date,
             previous_positions=previous_positions,
             maximum_positions=maximum_positions,
         )
 
+    def _get_optimal_positions_given_inputs(
+        self,
+        inputs: inputsForOptimisationOnDate,
+        relevant_date: datetime.datetime = arg_not_supplied,
+        previous_positions: portfolioWeights = arg_not_supplied,
+        maximum_positions: portfolioWeights = arg_not_supplied,
+    ) -> portfolioWeights:
+
+        obj_instance = self._get_optimal_positions_objective_instance_given_inputs(
+            inputs,
+            previous_positions=previous_positions,
+            maximum_positions=maximum_positions,
+        )
+
         try:
             optimal_positions = obj_instance.optimise_positions()
         except Exception as e:
@@ -95,25 +254,30 @@ class optimisedPositions(SystemStage):
         maximum_positions: portfolioWeights = arg_not_supplied,
     ) -> objectiveFunctionForGreedy:
 
-        covariance_matrix = self.get_covariance_matrix(relevant_date=relevant_date)
+        inputs = self.get_inputs_for_optimisation_on_date(relevant_date)
 
-        per_contract_value = self.get_per_contract_value(relevant_date)
-        contracts_optimal = self.original_position_contracts_for_relevant_date(
-            relevant_date
+        return self._get_optimal_positions_objective_instance_given_inputs(
+            inputs,
+            previous_positions=previous_positions,
+            maximum_positions=maximum_positions,
         )
 
-        costs = self.get_costs_per_contract_as_proportion_of_capital_all_instruments(
-            relevant_date
-        )
+    def _get_optimal_positions_objective_instance_given_inputs(
+        self,
+        inputs: inputsForOptimisationOnDate,
+        previous_positions: portfolioWeights = arg_not_supplied,
+        maximum_positions: portfolioWeights = arg_not_supplied,
+    ) -> objectiveFunctionForGreedy:
+
         speed_control = self.get_speed_control()
         constraints = self.get_constraints()
 
         obj_instance = objectiveFunctionForGreedy(
-            contracts_optimal=contracts_optimal,
-            covariance_matrix=covariance_matrix,
-            per_contract_value=per_contract_value,
+            contracts_optimal=inputs.contracts_optimal,
+            covariance_matrix=inputs.covariance_matrix,
+            per_contract_value=inputs.per_contract_value,
             previous_positions=previous_positions,
-            costs=costs,
+            costs=inputs.costs,
             constraints=constraints,
             maximum_positions=maximum_positions,
             speed_control=speed_control,
@@ -168,6 +332,24 @@ class optimisedPositions(SystemStage):
 
         return costs
 
+    @diagnostic()
+    def get_costs_per_contract_as_proportion_of_capital_df(self) -> pd.DataFrame:
+        instrument_list = self.instrument_list()
+        costs_as_dict = dict(
+            [
+                (
+                    instrument_code,
+                    self.get_cost_per_contract_as_proportion_of_capital(
+                        instrument_code
+                    )
+                    * self.get_cost_deflator(instrument_code),
+                )
+                for instrument_code in instrument_list
+            ]
+        )
+
+        return pd.DataFrame(costs_as_dict, index=self.common_index())
+
     def get_cost_per_contract_as_proportion_of_capital_on_date(
         self, instrument_code, relevant_date: datetime.datetime = arg_not_supplied
     ) -> float:
@@ -264,6 +446,9 @@ class optimisedPositions(SystemStage):
             relevant_date
         )
 
+    def get_original_position_contracts_df(self) -> pd.DataFrame:
+        return self.portfolio_weights_stage.get_position_contracts_as_df()
+
     def get_raw_cost_data(self, instrument_code: str):
         return self.accounts_stage().get_raw_cost_data(instrument_code)
 
@@ -306,3 +491,38 @@ class optimisedPositions(SystemStage):
     @property
     def config(self):
         return self.parent.config
+
+
+def _split_into_chunks(list_of_dates: list, number_of_chunks: int) -> list:
+    chunk_size = int(np.ceil(len(list_of_dates) / number_of_chunks))
+
+    return [
+        list_of_dates[chunk_start : chunk_start + chunk_size]
+        for chunk_start in range(0, len(list_of_dates), chunk_size)
+    ]
+
+
+def _rows_of_df_as_dicts(df: pd.DataFrame, list_of_dates: list) -> list:
+    # as get_row_of_df_aligned_to_weights_as_dict for each date
+    try:
+        rows = df.loc[list_of_dates]
+    except KeyError:
+        raise Exception("Dates %s not all found in data" % str(list_of_dates))
+    columns = list(df.columns)
+
+    return [dict(zip(columns, row)) for row in rows.values.tolist()]
+
+
+# set in each worker process by get_inputs_for_optimisation_on_dates
+_stage_for_inputs = None
+
+
+def _set_stage_for_inputs(stage: optimisedPositions):
+    global _stage_for_inputs
+    _stage_for_inputs = stage
+
+
+def _inputs_for_optimisation_on_dates(list_of_dates: list) -> list:
+    stage = _stage_for_inputs
+
+    return stage._calculate_inputs_for_optimisation_on_dates(list_of_dates)
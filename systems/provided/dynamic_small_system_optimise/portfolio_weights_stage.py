@@ -16,6 +16,7 @@ from sysquant.estimators.covariance import (
     covarianceEstimate,
     covariance_from_stdev_and_correlation,
 )
+from sysquant.estimators.covariance_tensor import covarianceTensor
 from sysquant.estimators.stdev_estimator import stdevEstimates
 from sysquant.optimisation.weights import portfolioWeights
 
@@ -44,6 +45,29 @@ class portfolioWeightsStage(SystemStage):
     def get_covariance_matrix(
         self, relevant_date: datetime.datetime = arg_not_supplied
     ) -> covarianceEstimate:
+        if relevant_date is arg_not_supplied:
+            return self.calculate_covariance_matrix()
+
+        covariance_tensor = self.get_covariance_tensor()
+
+        return covariance_tensor.covariance_on_date(relevant_date)
+
+    @diagnostic(not_pickable=True)
+    def get_covariance_tensor(self) -> covarianceTensor:
+        """
+        Covariance on every date, calculated all at once; for backtests which need
+        the covariance on each date in turn
+        """
+        df_of_vol = self.get_df_of_perc_vol()
+        list_of_correlations = self.get_list_of_instrument_returns_correlations()
+
+        return covarianceTensor.from_stdev_and_correlations(
+            stdev=df_of_vol, correlation_list=list_of_correlations
+        )
+
+    def calculate_covariance_matrix(
+        self, relevant_date: datetime.datetime = arg_not_supplied
+    ) -> covarianceEstimate:
 
         correlation_estimate = self.get_correlation_matrix(relevant_date=relevant_date)
         stdev_estimate = self.get_stdev_estimate(relevant_date=relevant_date)
@@ -0,0 +1,122 @@
+"""
+Checkpoints of the position path of the dynamic optimisation backtest
+
+Each day of the optimisation depends on the positions of the day before, so the
+backtest has to walk through the dates in order, which can take hours. With
+checkpointing switched on, the dates done so far and their positions are saved to
+disk after each block of dates. If the run is interrupted, the next run of the same
+system (same config and data) carries on from the last checkpoint.
+
+Switched on in config:
+
+dynamic_optimisation_backtest:
+  checkpoint: True
+  checkpoint_directory: '/home/me/checkpoints'  # empty string for the default in the home directory
+
+The checkpoint is deleted once the whole position path has been calculated.
+"""
+
+import os
+import pickle
+
+from syscore.fileutils import file_in_home_dir, get_resolved_pathname
+from syscore.objects import arg_not_supplied
+from sysquant.optimisation.weights import portfolioWeights
+from systems.persistent_cache import (
+    system_fingerprint,
+    CONFIG_ELEMENT_NAME as SYSTEM_CACHE_CONFIG_ELEMENT_NAME,
+)
+
+DEFAULT_CHECKPOINT_DIRECTORY = file_in_home_dir(
+    "pysystemtrade_optimisation_checkpoints"
+)
+CHECKPOINT_FILE_EXTENSION = ".pck"
+CONFIG_ELEMENT_NAME = "dynamic_optimisation_backtest"
+
+
+class positionPathCheckpoint(object):
+    def __init__(self, filename: str):
+        self._filename = filename
+
+    @classmethod
+    def for_system(positionPathCheckpoint, system, config_dict: dict):
+        if not config_dict.get("checkpoint", False):
+            return noPositionPathCheckpoint()
+
+        directory = config_dict.get("checkpoint_directory", "")
+        if directory == "" or directory is None:
+            directory = DEFAULT_CHECKPOINT_DIRECTORY
+        directory = get_resolved_pathname(directory)
+
+        # how the backtest is run and cached doesn't change the positions
+        fingerprint = system_fingerprint(
+            system,
+            config_elements_to_ignore=[
+                SYSTEM_CACHE_CONFIG_ELEMENT_NAME,
+                CONFIG_ELEMENT_NAME,
+            ],
+        )
+        filename = os.path.join(directory, fingerprint + CHECKPOINT_FILE_EXTENSION)
+
+        return positionPathCheckpoint(filename)
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def load(self, list_of_dates: list) -> list:
+        """
+        Positions saved for the first dates in list_of_dates
+
+        :param list_of_dates: all the dates of the backtest, in order
+        :return: list of portfolioWeights, one for each date done; empty if none are
+        """
+        try:
+            with open(self.filename, "rb") as fhandle:
+                saved_dates, saved_positions = pickle.load(fhandle)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return []
+
+        # should always match, since the dates are part of the data fingerprint
+        if saved_dates != list_of_dates[: len(saved_dates)]:
+            return []
+
+        return [portfolioWeights(positions) for positions in saved_positions]
+
+    def save(self, list_of_dates: list, position_list: list):
+        """
+        :param list_of_dates: the dates done so far, in order
+        :param position_list: list of portfolioWeights, one for each date
+        """
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        saved_positions = [dict(positions) for positions in position_list]
+
+        # write then rename, so an interrupted save doesn't lose the last checkpoint
+        temp_filename = "%s.%d.tmp" % (self.filename, os.getpid())
+        with open(temp_filename, "wb") as fhandle:
+            pickle.dump((list(list_of_dates), saved_positions), fhandle)
+        os.replace(temp_filename, self.filename)
+
+    def delete(self):
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+
+class noPositionPathCheckpoint(positionPathCheckpoint):
+    """
+    When checkpointing is switched off
+    """
+
+    def __init__(self):
+        super().__init__(filename=arg_not_supplied)
+
+    def load(self, list_of_dates: list) -> list:
+        return []
+
+    def save(self, list_of_dates: list, position_list: list):
+        pass
+
+    def delete(self):
+        pass
@@ -0,0 +1,125 @@
+"""
+Online versions of trading rules, which can be updated one daily price at a time
+
+They give identical results to the batch rules:
+
+onlineEWMAC: futures_chapter15.rules.ewmac
+onlineEWMACCalcVol: futures_chapter15.rules.ewmac_calc_vol
+onlineCarry: futures_chapter15.rules.carry2 (and rob_system.rules.carry)
+onlineBreakout: rob_system.rules.breakout
+
+Warm them up on the history with update_with_series, then call update with each new
+price. See sysquant.estimators.online for the estimators they use.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from sysquant.estimators.online import (
+    onlineEstimator,
+    onlineEWMAMean,
+    onlineRobustVol,
+)
+
+
+class onlineEWMAC(onlineEstimator):
+    """
+    Updated with a price, and the daily price volatility (eg from onlineRobustVol)
+    """
+
+    def __init__(self, Lfast: int, Lslow: int):
+        super().__init__()
+        self._fast_ewma = onlineEWMAMean(span=Lfast)
+        self._slow_ewma = onlineEWMAMean(span=Lslow)
+        self._vol = np.nan
+
+    def update(self, price: float, vol: float) -> float:
+        raw_ewmac = self._fast_ewma.update(price) - self._slow_ewma.update(price)
+
+        # vol is forward filled
+        if vol == vol:
+            self._vol = vol
+
+        self._value = _divide(raw_ewmac, self._vol)
+
+        return self._value
+
+
+class onlineEWMACCalcVol(onlineEstimator):
+    """
+    Updated with a price; vol is calculated as in ewmac_calc_vol
+    """
+
+    def __init__(self, Lfast: int, Lslow: int, vol_days: int = 35):
+        super().__init__()
+        self._ewmac = onlineEWMAC(Lfast=Lfast, Lslow=Lslow)
+        # as the batch version, which passes the price to robust_vol_calc
+        self._vol = onlineRobustVol(days=vol_days)
+
+    def update(self, price: float) -> float:
+        vol = self._vol.update(price)
+        self._value = self._ewmac.update(price, vol)
+
+        return self._value
+
+
+class onlineCarry(onlineEstimator):
+    """
+    Updated with the raw carry
+    """
+
+    def __init__(self, smooth_days: int = 90):
+        super().__init__()
+        self._smooth_carry = onlineEWMAMean(com=smooth_days)
+
+    def update(self, raw_carry: float) -> float:
+        self._value = self._smooth_carry.update(raw_carry)
+
+        return self._value
+
+
+class onlineBreakout(onlineEstimator):
+    """
+    Updated with a price. State is the last lookback prices.
+
+    The batch version reduces min_periods for histories shorter than lookback / 2,
+    so results are identical once at least that many prices have been seen.
+    """
+
+    def __init__(self, lookback: int = 10, smooth: int = None):
+        super().__init__()
+        if smooth is None:
+            smooth = max(int(lookback / 4.0), 1)
+
+        assert smooth < lookback
+
+        self._prices = deque(maxlen=lookback)
+        self._min_periods = int(np.ceil(lookback / 2.0))
+        self._smoothed_output = onlineEWMAMean(
+            span=smooth, min_periods=np.ceil(smooth / 2.0)
+        )
+
+    def update(self, price: float) -> float:
+        self._prices.append(price)
+        prices_in_window = [
+            window_price for window_price in self._prices if window_price == window_price
+        ]
+        if len(prices_in_window) >= self._min_periods:
+            roll_max = max(prices_in_window)
+            roll_min = min(prices_in_window)
+            roll_mean = (roll_max + roll_min) / 2.0
+            # gives a nice natural scaling
+            output = 40.0 * _divide(price - roll_mean, roll_max - roll_min)
+        else:
+            output = np.nan
+
+        self._value = self._smoothed_output.update(output)
+
+        return self._value
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    # as pandas, without raising an exception for zero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(numerator) / np.float64(denominator))
@@ -10,12 +10,37 @@ There are 3 kinds of things in a cache with different levels of persistence:
   - things that have an 'all' key -
   - _protected - that wouldn't normally be deleted
 
+Per (stage, method) statistics - calls, hit ratio, time spent calculating and
+size of results - are available from system.cache.stats()
+
+The cache keeps track of the (approximate) size of each element. If
+system_cache: max_memory_mb is set in config, then once the cache is larger than
+that, unprotected elements are evicted; either least recently used first ('lru'),
+or those that were quickest to calculate per byte first ('cost').
+
 """
 
 from syscore.fileutils import get_filename_for_package
+from syscore.objects import missing_data
+from systems.persistent_cache import (
+    persistentCacheStore,
+    cacheDependencies,
+    recordingConfig,
+    dependencies_key,
+    item_fingerprint,
+    persistent_cache_key,
+    CONFIG_ELEMENT_NAME as SYSTEM_CACHE_CONFIG_ELEMENT_NAME,
+)
+import copyreg
 import pickle
+import sys
+import time
+from collections import OrderedDict
 from functools import wraps
 
+import numpy as np
+import pandas as pd
+
 """
 This is used for items which affect an entire system, not just one instrument
 """
@@ -25,22 +50,72 @@ ALL_KEYNAME = "All_instruments"
 EMPTY_KEYNAME = object()
 MISSING_FROM_CACHE = object()
 
+# how a call to a cached method was answered
+CACHE_HIT = "hits"
+PERSISTENT_CACHE_HIT = "persistent_hits"
+CACHE_MISS = "misses"
+
+LRU_EVICTION = "lru"
+COST_EVICTION = "cost"
+BYTES_PER_MB = 1024 * 1024
+# once over the memory budget, evict down to this fraction of it, so we aren't
+# evicting again on every new item
+EVICT_TO_FRACTION_OF_MEMORY_BUDGET = 0.9
+
 
 class cacheRef(object):
     """
     References to use within caches
 
+    These are dict keys, looked up on every cached call, so they are immutable
+    and the hash is worked out once when they are created
+
     """
 
+    __slots__ = (
+        "stage_name",
+        "itemname",
+        "instrument_code",
+        "flags",
+        "keyname",
+        "_key",
+        "_hash",
+    )
+
     def __init__(
         self, stage_name, itemname, instrument_code=ALL_KEYNAME, flags="", keyname=""
     ):
-
-        self.stage_name = stage_name
-        self.itemname = itemname
-        self.instrument_code = instrument_code
-        self.flags = flags
-        self.keyname = keyname
+        key = (stage_name, itemname, instrument_code, flags, keyname)
+
+        set_attribute = object.__setattr__
+        set_attribute(self, "stage_name", stage_name)
+        set_attribute(self, "itemname", itemname)
+        set_attribute(self, "instrument_code", instrument_code)
+        set_attribute(self, "flags", flags)
+        set_attribute(self, "keyname", keyname)
+        set_attribute(self, "_key", key)
+        set_attribute(self, "_hash", hash(key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("cacheRef is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("cacheRef is immutable")
+
+    def __reduce__(self):
+        # hashes of strings differ between processes, so recalculate on unpickling
+        return (cacheRef, self._key)
+
+    def __setstate__(self, state: dict):
+        # caches pickled before cacheRef had slots
+        cacheRef.__init__(
+            self,
+            state["stage_name"],
+            state["itemname"],
+            instrument_code=state["instrument_code"],
+            flags=state["flags"],
+            keyname=state["keyname"],
+        )
 
     def __repr__(self):
         if self.keyname == "":
@@ -56,15 +131,18 @@ class cacheRef(object):
             self.flags,
         )
 
-    # following code is to make keys hashable and suitable for dict keys
-    def __key(self):
-        return tuple(v for k, v in sorted(self.__dict__.items()))
-
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.__key() == other.__key()
+        if self is other:
+            return True
+
+        return (
+            isinstance(other, cacheRef)
+            and self._hash == other._hash
+            and self._key == other._key
+        )
 
     def __hash__(self):
-        return hash(self.__key())
+        return self._hash
 
 
 class listOfCacheRefs(list):
@@ -118,12 +196,16 @@ class listOfCacheRefs(list):
 class cacheElement(object):
     """
     Each cache element consists of a value, and some bool values telling us what we can do with it
+
+    We also keep the approximate size of the value, and how long it took to calculate
     """
 
-    def __init__(self, value, protected=False, not_pickable=False):
+    def __init__(self, value, protected=False, not_pickable=False, compute_time=0.0):
         self._value = value
         self._protected = protected
         self._not_pickable = not_pickable
+        self._compute_time = compute_time
+        self._size_bytes = size_in_bytes(value)
 
     def __repr__(self):
         return str(self._value)
@@ -140,6 +222,46 @@ class cacheElement(object):
     def can_be_pickled(self):
         return not self._not_pickable
 
+    def size_bytes(self) -> int:
+        # elements pickled by older versions won't have this
+        size_bytes = getattr(self, "_size_bytes", None)
+        if size_bytes is None:
+            size_bytes = self._size_bytes = size_in_bytes(self._value)
+
+        return size_bytes
+
+    def compute_time(self) -> float:
+        return getattr(self, "_compute_time", 0.0)
+
+
+def _remove_from_index(index: dict, index_key, cache_ref):
+    cache_refs = index.get(index_key, None)
+    if cache_refs is None:
+        return None
+    cache_refs.pop(cache_ref, None)
+    if len(cache_refs) == 0:
+        del index[index_key]
+
+
+def size_in_bytes(value) -> int:
+    """
+    Approximate size of a cached value; pandas object columns count pointers only
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    elif isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    elif isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    elif isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            [size_in_bytes(element) for element in value.values()]
+        )
+    elif isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum([size_in_bytes(element) for element in value])
+
+    return sys.getsizeof(value)
+
 
 class systemCache(dict):
     def __init__(self, parent_system):
@@ -147,6 +269,255 @@ class systemCache(dict):
         super().__init__()
         self._parent = parent_system  # so we can access the instrument list
         self.set_caching_on()
+        self._recently_used = OrderedDict()
+        self._total_size_bytes = 0
+        self._clear_indices()
+        self._clear_dependencies()
+        self.reset_counts()
+
+    def __reduce__(self):
+        # a dict subclass is normally unpickled (or copied) by adding its items
+        # before its attributes, which __setitem__ needs; so restore both together
+        return (copyreg.__newobj__, (self.__class__,), (self.__dict__, dict(self)))
+
+    def __setstate__(self, state: tuple):
+        attributes, cache_items = state
+        self.__dict__.update(attributes)
+        # the sizes, indices and usage order came with the attributes
+        super().update(cache_items)
+
+    def __setitem__(self, cache_ref, cache_element):
+        if cache_ref in self:
+            self._total_size_bytes -= self[cache_ref].size_bytes()
+        else:
+            self._add_to_indices(cache_ref)
+        super().__setitem__(cache_ref, cache_element)
+        self._total_size_bytes += cache_element.size_bytes()
+        self._mark_as_recently_used(cache_ref, cache_element)
+
+        self._evict_if_over_memory_budget(cache_ref_to_keep=cache_ref)
+
+    def __delitem__(self, cache_ref):
+        self._total_size_bytes -= self[cache_ref].size_bytes()
+        self._recently_used.pop(cache_ref, None)
+        self._remove_from_indices(cache_ref)
+        super().__delitem__(cache_ref)
+
+    def clear(self):
+        super().clear()
+        self._recently_used.clear()
+        self._total_size_bytes = 0
+        self._clear_indices()
+
+    # indices of cache refs by stage and instrument, so we don't have to look
+    # at every key to find or delete them. Inner dicts are used as ordered sets.
+    def _clear_indices(self):
+        self._cache_refs_by_stage_name = dict()
+        self._cache_refs_by_instrument_code = dict()
+
+    def _add_to_indices(self, cache_ref):
+        self._cache_refs_by_stage_name.setdefault(cache_ref.stage_name, dict())[
+            cache_ref
+        ] = None
+        self._cache_refs_by_instrument_code.setdefault(
+            cache_ref.instrument_code, dict()
+        )[cache_ref] = None
+
+    def _remove_from_indices(self, cache_ref):
+        _remove_from_index(
+            self._cache_refs_by_stage_name, cache_ref.stage_name, cache_ref
+        )
+        _remove_from_index(
+            self._cache_refs_by_instrument_code, cache_ref.instrument_code, cache_ref
+        )
+
+    @property
+    def total_size_bytes(self) -> int:
+        return self._total_size_bytes
+
+    def reset_counts(self):
+        self._counts = dict(hits=0, persistent_hits=0, misses=0, evictions=0)
+        self._stats_by_method = dict()
+        self._child_time_stack = []
+
+    def get_counts(self) -> dict:
+        """
+        Cache hits, persistent_hits (loaded from the persistent store), misses and
+        evictions since the cache was created (or reset_counts) with the current and
+        maximum size
+
+        :returns: dict
+        """
+        counts = dict(self._counts)
+        counts["size_bytes"] = self.total_size_bytes
+        counts["max_memory_bytes"] = self.max_memory_bytes
+
+        return counts
+
+    def stats(self) -> pd.DataFrame:
+        """
+        Statistics for each (stage, method) since the cache was created (or reset_counts)
+
+        Columns are: calls, hits, persistent_hits (loaded from the persistent store),
+        misses, hit_ratio (of either kind); total_time (seconds calculating,
+        including time in other cached methods called from this one), self_time
+        (excluding those), and result_bytes (total size of the calculated results).
+        Sorted with the most expensive (by self_time) first.
+
+        :returns: pd.DataFrame, indexed by stage and method
+        """
+        columns = [
+            "calls",
+            "hits",
+            "persistent_hits",
+            "misses",
+            "hit_ratio",
+            "total_time",
+            "self_time",
+            "result_bytes",
+        ]
+        stats_by_method = self._stats_by_method
+        index = pd.MultiIndex.from_tuples(
+            list(stats_by_method.keys()), names=["stage", "method"]
+        )
+        stats = pd.DataFrame(
+            list(stats_by_method.values()), index=index, columns=columns
+        )
+        stats["hit_ratio"] = (stats.hits + stats.persistent_hits) / stats.calls.where(
+            stats.calls > 0
+        )
+
+        return stats.sort_values("self_time", ascending=False)
+
+    def _stats_for_method(self, cache_ref) -> dict:
+        key = (cache_ref.stage_name, cache_ref.itemname)
+        stats_for_method = self._stats_by_method.get(key, None)
+        if stats_for_method is None:
+            stats_for_method = self._stats_by_method[key] = dict(
+                calls=0,
+                hits=0,
+                persistent_hits=0,
+                misses=0,
+                hit_ratio=np.nan,
+                total_time=0.0,
+                self_time=0.0,
+                result_bytes=0,
+            )
+
+        return stats_for_method
+
+    def _record_call(self, cache_ref, call_result: str):
+        # call_result is one of CACHE_HIT, PERSISTENT_CACHE_HIT, CACHE_MISS
+        stats_for_method = self._stats_for_method(cache_ref)
+        stats_for_method["calls"] += 1
+        stats_for_method[call_result] += 1
+        self._counts[call_result] += 1
+
+    def _record_result_size(self, cache_ref):
+        stats_for_method = self._stats_for_method(cache_ref)
+        stats_for_method["result_bytes"] += self[cache_ref].size_bytes()
+
+    def _calculate_and_record_time(self, cache_ref, func, this_stage, *args, **kwargs):
+        # time spent in nested cached calls is added to the level above, so it
+        # can be taken away to give the time spent in this method alone
+        self._child_time_stack.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            value = func(this_stage, *args, **kwargs)
+        finally:
+            compute_time = time.perf_counter() - start_time
+            child_time = self._child_time_stack.pop()
+            if len(self._child_time_stack) > 0:
+                self._child_time_stack[-1] += compute_time
+
+        stats_for_method = self._stats_for_method(cache_ref)
+        stats_for_method["total_time"] += compute_time
+        stats_for_method["self_time"] += compute_time - child_time
+
+        return value, compute_time
+
+    @property
+    def max_memory_bytes(self):
+        """
+        Memory budget from config, or None if unlimited
+        """
+        self._read_memory_budget_config_if_required()
+
+        return self._max_memory_bytes
+
+    @property
+    def eviction_policy(self) -> str:
+        self._read_memory_budget_config_if_required()
+
+        return self._eviction_policy
+
+    def _read_memory_budget_config_if_required(self):
+        if getattr(self, "_memory_budget_config_read", False):
+            return None
+
+        config_dict = self.parent.config.get_element_or_missing_data(
+            SYSTEM_CACHE_CONFIG_ELEMENT_NAME
+        )
+        if config_dict is missing_data:
+            config_dict = dict()
+
+        max_memory_mb = config_dict.get("max_memory_mb", None)
+        if max_memory_mb is None or max_memory_mb <= 0:
+            self._max_memory_bytes = None
+        else:
+            self._max_memory_bytes = int(float(max_memory_mb) * BYTES_PER_MB)
+
+        eviction_policy = config_dict.get("eviction_policy", LRU_EVICTION)
+        if eviction_policy not in [LRU_EVICTION, COST_EVICTION]:
+            raise Exception(
+                "system_cache eviction_policy %s should be one of %s, %s"
+                % (eviction_policy, LRU_EVICTION, COST_EVICTION)
+            )
+        self._eviction_policy = eviction_policy
+        self._memory_budget_config_read = True
+
+    def _mark_as_recently_used(self, cache_ref, cache_element):
+        # protected items are pinned, so they aren't kept in the usage order
+        if cache_element.protected():
+            self._recently_used.pop(cache_ref, None)
+        else:
+            self._recently_used[cache_ref] = None
+            self._recently_used.move_to_end(cache_ref)
+
+    def _evict_if_over_memory_budget(self, cache_ref_to_keep=None):
+        max_memory_bytes = self.max_memory_bytes
+        if max_memory_bytes is None:
+            return None
+        if self.total_size_bytes <= max_memory_bytes:
+            return None
+
+        bytes_to_free = self.total_size_bytes - (
+            max_memory_bytes * EVICT_TO_FRACTION_OF_MEMORY_BUDGET
+        )
+        cache_refs_to_evict = []
+        for cache_ref in self._cache_refs_in_eviction_order():
+            if bytes_to_free <= 0:
+                break
+            if cache_ref == cache_ref_to_keep:
+                continue
+            cache_refs_to_evict.append(cache_ref)
+            bytes_to_free -= self[cache_ref].size_bytes()
+
+        for cache_ref in cache_refs_to_evict:
+            self._delete_single_element_from_cache_dangerous(cache_ref)
+            self._counts["evictions"] += 1
+
+    def _cache_refs_in_eviction_order(self):
+        # only unprotected items are in the usage order, least recently used first
+        if self.eviction_policy == LRU_EVICTION:
+            return self._recently_used.keys()
+
+        # cheapest to recalculate per byte goes first; ties least recently used first
+        return sorted(
+            self._recently_used.keys(),
+            key=lambda cache_ref: self[cache_ref].compute_time()
+            / max(self[cache_ref].size_bytes(), 1),
+        )
 
     @property
     def parent(self):
@@ -287,6 +658,38 @@ class systemCache(dict):
 
         return pickable_cache_refs
 
+    def get_pickable_items_not_in(self, cache_refs_to_exclude: set) -> dict:
+        """
+        Return pickable cache elements, except those in cache_refs_to_exclude
+
+        Used to send newly calculated items back from a worker process
+
+        :param cache_refs_to_exclude: set of cache refs
+        :returns: dict of cache elements, keys are cache refs
+        """
+
+        new_items = dict(
+            [
+                (cache_ref, self[cache_ref])
+                for cache_ref in self._get_pickable_items()
+                if cache_ref not in cache_refs_to_exclude
+            ]
+        )
+
+        return new_items
+
+    def add_items_not_already_in_cache(self, cache_items: dict):
+        """
+        Add cache elements, without overwriting anything already in the cache
+
+        :param cache_items: dict of cache elements, keys are cache refs
+        :returns: None
+        """
+
+        for cache_ref, cache_element in cache_items.items():
+            if cache_ref not in self:
+                self[cache_ref] = cache_element
+
     def get_cache_refs_for_instrument(self, instrument_code):
         """
         return cache refs for a particular instrument code
@@ -295,10 +698,9 @@ class systemCache(dict):
         :return: list of cache refs
         """
 
-        cache_ref_list = self.get_items_with_data()
-        cache_ref_list = cache_ref_list.filter_by_instrument_code(instrument_code)
+        cache_refs = self._cache_refs_by_instrument_code.get(instrument_code, dict())
 
-        return cache_ref_list
+        return listOfCacheRefs(cache_refs.keys())
 
     def get_cacherefs_for_stage(self, stage_name):
         """
@@ -311,10 +713,9 @@ class systemCache(dict):
 
         """
 
-        cache_ref_list = self.get_items_with_data()
-        cache_ref_list = cache_ref_list.filter_by_stage_name(stage_name)
+        cache_refs = self._cache_refs_by_stage_name.get(stage_name, dict())
 
-        return cache_ref_list
+        return listOfCacheRefs(cache_refs.keys())
 
     def get_itemnames_for_stage(self, stage_name):
         """
@@ -476,7 +877,9 @@ class systemCache(dict):
         if cache_ref in self:
             del self[cache_ref]
 
-    def set_item_in_cache(self, value, cache_ref, protected=False, not_pickable=False):
+    def set_item_in_cache(
+        self, value, cache_ref, protected=False, not_pickable=False, compute_time=0.0
+    ):
         """
         Set an item in a cache to a specific value.
 
@@ -485,6 +888,7 @@ class systemCache(dict):
 
         :param protected: is the item protected from deletion?
         :param nopickle: is the item not capable of pickling?
+        :param compute_time: how long the value took to calculate, in seconds
 
         :param cache_ref: The item to set
         :type cache_ref: cacheRef
@@ -494,7 +898,10 @@ class systemCache(dict):
         """
 
         self[cache_ref] = cacheElement(
-            value, protected=protected, not_pickable=not_pickable
+            value,
+            protected=protected,
+            not_pickable=not_pickable,
+            compute_time=compute_time,
         )
 
     def _get_item_from_cache(self, cache_ref):
@@ -512,11 +919,156 @@ class systemCache(dict):
         if cache_element is MISSING_FROM_CACHE:
             return MISSING_FROM_CACHE
 
+        self._mark_as_recently_used(cache_ref, cache_element)
+
         return cache_element.value()
 
     def get_instrument_list(self):
         return self.parent.get_instrument_list()
 
+    @property
+    def persistent_store(self):
+        """
+        Persistent store shared between runs, or missing_data if not switched on in config
+        """
+        persistent_store = getattr(self, "_persistent_store", None)
+        if persistent_store is None:
+            persistent_store = self._persistent_store = self._get_persistent_store()
+
+        return persistent_store
+
+    def _get_persistent_store(self):
+        config_dict = self.parent.config.get_element_or_missing_data(
+            SYSTEM_CACHE_CONFIG_ELEMENT_NAME
+        )
+        if config_dict is missing_data:
+            return missing_data
+        if not config_dict.get("persistent", False):
+            return missing_data
+
+        return persistentCacheStore.from_config_dict(config_dict)
+
+    @property
+    def recording_dependencies(self) -> bool:
+        # only needed to key items in the persistent store
+        return self.persistent_store is not missing_data
+
+    # what each item calculated in this run depends on; a stack, since working out
+    # one item calculates the items it uses. Each entry is the item's
+    # cacheDependencies, and the config elements read by the item itself
+    def _clear_dependencies(self):
+        self._dependency_stack = []
+        self._dependencies_by_ref = dict()
+        self._config_elements_read_by_stage = dict()
+        self._instrument_fingerprints = dict()
+
+    def _start_recording_dependencies(self):
+        config_elements_read = set()
+        self._dependency_stack.append((cacheDependencies(), config_elements_read))
+        self._record_config_reads(config_elements_read)
+
+    def _finish_recording_dependencies(self, cache_ref, instrument_classify=True):
+        dependencies, config_elements_read = self._dependency_stack.pop()
+        self._resume_recording_config_for_item_above()
+
+        # stages can read config once and keep it, so an item depends on everything
+        # its stage has read so far, not just what it read itself
+        config_elements_read_by_stage = self._config_elements_read_by_stage.setdefault(
+            cache_ref.stage_name, set()
+        )
+        config_elements_read_by_stage.update(config_elements_read)
+        dependencies.config_element_names.update(config_elements_read_by_stage)
+
+        # base system items (instrument_classify False) only depend on config
+        if instrument_classify:
+            if cache_ref.instrument_code == ALL_KEYNAME:
+                dependencies.all_instruments = True
+            else:
+                dependencies.instrument_codes.add(cache_ref.instrument_code)
+
+        self._dependencies_by_ref[cache_ref] = dependencies
+
+    def _resume_recording_config_for_item_above(self):
+        if len(self._dependency_stack) == 0:
+            self._record_config_reads(None)
+        else:
+            _, config_elements_read = self._dependency_stack[-1]
+            self._record_config_reads(config_elements_read)
+
+    def _record_config_reads(self, config_elements_read: set = None):
+        # stages get their config from the system, which hands them a recordingConfig
+        if config_elements_read is None:
+            self.parent.set_recording_config(None)
+        else:
+            self.parent.set_recording_config(
+                recordingConfig(self.parent.unrecorded_config, config_elements_read)
+            )
+
+    def _add_to_dependencies_of_item_above(self, cache_ref):
+        if len(self._dependency_stack) == 0:
+            return None
+
+        # we don't know what items added from elsewhere (eg precompute) depend on
+        dependencies = self._dependencies_by_ref.get(cache_ref, None)
+        if dependencies is None:
+            dependencies = cacheDependencies.unknown()
+
+        dependencies_of_item_above, _ = self._dependency_stack[-1]
+        dependencies_of_item_above.add(dependencies)
+
+    def _item_fingerprint(self, dependencies: cacheDependencies) -> str:
+        # nothing read while working this out is a dependency of the item above
+        dependency_stack = self._dependency_stack
+        self._dependency_stack = []
+        self._record_config_reads(None)
+        try:
+            fingerprint = item_fingerprint(
+                self.parent, dependencies, self._instrument_fingerprints
+            )
+        finally:
+            self._dependency_stack = dependency_stack
+            self._resume_recording_config_for_item_above()
+
+        return fingerprint
+
+    def _get_item_from_persistent_store(self, cache_ref, protected=False):
+        """
+        Get the value of an item from the persistent store, and add it to the cache
+
+        :param cache_ref: The item to get
+        :type cache_ref: cacheRef
+
+        :returns: MISSING_FROM_CACHE or item value
+        """
+        persistent_store = self.persistent_store
+        if persistent_store is missing_data:
+            return MISSING_FROM_CACHE
+
+        dependencies = persistent_store.read(dependencies_key(cache_ref))
+        if dependencies is missing_data:
+            return MISSING_FROM_CACHE
+
+        key = persistent_cache_key(cache_ref, self._item_fingerprint(dependencies))
+        cache_element = persistent_store.read(key)
+        if cache_element is missing_data:
+            return MISSING_FROM_CACHE
+
+        value = cache_element.value()
+        self.set_item_in_cache(value, cache_ref, protected=protected)
+        self._dependencies_by_ref[cache_ref] = dependencies
+
+        return value
+
+    def _set_item_in_persistent_store(self, cache_ref):
+        persistent_store = self.persistent_store
+        if persistent_store is missing_data:
+            return None
+
+        dependencies = self._dependencies_by_ref[cache_ref]
+        key = persistent_cache_key(cache_ref, self._item_fingerprint(dependencies))
+        persistent_store.write(key, self[cache_ref])
+        persistent_store.write(dependencies_key(cache_ref), dependencies)
+
     def calc_or_cache(
         self,
         func,
@@ -562,14 +1114,48 @@ class systemCache(dict):
         )
 
         value = self._get_item_from_cache(cache_ref)
+        if value is not MISSING_FROM_CACHE:
+            self._record_call(cache_ref, CACHE_HIT)
+
+        # base system items (instrument_classify False) are needed to work out
+        # the persistent fingerprint, so never go to the persistent store
+        recording_dependencies = self.recording_dependencies
+        use_persistent_store = (
+            recording_dependencies and instrument_classify and not not_pickable
+        )
+        if value is MISSING_FROM_CACHE and use_persistent_store:
+            value = self._get_item_from_persistent_store(cache_ref, protected=protected)
+            if value is not MISSING_FROM_CACHE:
+                self._record_call(cache_ref, PERSISTENT_CACHE_HIT)
 
         if value is MISSING_FROM_CACHE:
+            self._record_call(cache_ref, CACHE_MISS)
             # call the function. Note in the original function 'this_stage' was
             # 'self'
-            value = func(this_stage, *args, **kwargs)
+            if recording_dependencies:
+                self._start_recording_dependencies()
+            try:
+                value, compute_time = self._calculate_and_record_time(
+                    cache_ref, func, this_stage, *args, **kwargs
+                )
+            finally:
+                if recording_dependencies:
+                    self._finish_recording_dependencies(
+                        cache_ref, instrument_classify=instrument_classify
+                    )
             self.set_item_in_cache(
-                value, cache_ref, protected=protected, not_pickable=not_pickable
+                value,
+                cache_ref,
+                protected=protected,
+                not_pickable=not_pickable,
+                compute_time=compute_time,
             )
+            self._record_result_size(cache_ref)
+            if use_persistent_store:
+                self._set_item_in_persistent_store(cache_ref)
+
+        if recording_dependencies:
+            self._add_to_dependencies_of_item_above(cache_ref)
 
         return value
 
@@ -605,7 +1191,7 @@ class systemCache(dict):
             # recursion
             list_of_codes = []
 
-        (instrument_code, keyname) = resolve_args_to_code_and_key(
+        instrument_code, keyname = resolve_args_to_code_and_key(
             args, list_of_codes
         )  # instrument involved, and/or other keys eg rule name
         flags = resolve_kwargs_to_str(
@@ -628,6 +1214,9 @@ def resolve_args_to_code_and_key(args, list_of_codes):
     :param list_of_codes:
     :return: (instrument_code, keyname)
     """
+    if len(args) == 0:
+        return (ALL_KEYNAME, "")
+
     keyname_list = []
     args_to_process = list(args)
     instrument_code = None
@@ -668,6 +1257,9 @@ def resolve_kwargs_to_str(kwargs):
     :return: str
     """
 
+    if len(kwargs) == 0:
+        return ""
+
     def resolve_individual_flag(single_flag, kwargs):
         argvalue = str(kwargs[single_flag])
         return "%s=%s" % (single_flag, str(argvalue))
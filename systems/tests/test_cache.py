@@ -1,8 +1,13 @@
+import copy
+import pickle
 import unittest
 
+import numpy as np
+
+from systems import basesystem
 from systems.stage import SystemStage
 from systems.basesystem import System
-from systems.system_cache import input, diagnostic, output, ALL_KEYNAME
+from systems.system_cache import input, diagnostic, output, ALL_KEYNAME, cacheRef
 from sysdata.sim.sim_data import simData
 from sysdata.config.configdata import Config
 
@@ -316,6 +321,185 @@ class TestCache(unittest.TestCase):
         stage_names.sort()
         self.assertEqual(["base_system", "test_stage1", "test_stage2"], stage_names)
 
+    def test_precompute_in_worker_processes(self):
+        self.system.precompute(
+            "test_stage1.single_instrument_with_keywords",
+            workers=2,
+            other_args_list=["a_rule", "another_rule"],
+        )
+
+        cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage1")
+        self.assertEqual(4, len(cache_refs))
+        self.assertEqual(
+            ["a_rule", "another_rule"], sorted(cache_refs.unique_list_of_keynames())
+        )
+        self.assertEqual(6, self.system.cache[cache_refs[0]].value())
+
+        self.system.precompute(
+            self.system.test_stage2.single2_instrument_no_keywords,
+            instrument_list=["code"],
+            workers=2,
+        )
+        cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage2")
+        self.assertEqual(1, len(cache_refs))
+        self.assertEqual("code", cache_refs[0].instrument_code)
+        # one instrument runs serially, in this process
+        self.assertIsNone(basesystem._system_for_precompute)
+
+    def test_memory_budget_eviction(self):
+        system = System(
+            [testStage3()],
+            simData(),
+            Config(
+                dict(
+                    instruments=["code", "another_code"],
+                    system_cache=dict(max_memory_mb=28000 / (1024 * 1024)),
+                )
+            ),
+        )
+        system.test_stage3.big_protected_item()
+        system.test_stage3.big_item("code")
+        system.test_stage3.big_item("another_code")
+        system.test_stage3.big_item("code")  # now most recently used
+        system.test_stage3.big_item("third")
+
+        cache_refs = system.cache.get_cacherefs_for_stage("test_stage3")
+        keynames = sorted(cache_refs.unique_list_of_keynames())
+        self.assertEqual(["", "third"], keynames)
+        self.assertEqual(
+            ["All_instruments", "code"],
+            sorted(cache_refs.unique_list_of_instrument_codes()),
+        )
+
+        counts = system.cache.get_counts()
+        # includes base system items such as the instrument list
+        self.assertTrue(counts["hits"] >= 1)
+        self.assertTrue(counts["misses"] >= 4)
+        self.assertTrue(counts["evictions"] >= 1)
+        self.assertTrue(counts["size_bytes"] <= counts["max_memory_bytes"])
+
+    def test_cost_eviction_goes_below_memory_budget(self):
+        system = System(
+            [testStage3()],
+            simData(),
+            Config(
+                dict(
+                    instruments=["code"],
+                    system_cache=dict(
+                        max_memory_mb=28000 / (1024 * 1024), eviction_policy="cost"
+                    ),
+                )
+            ),
+        )
+        for some_arg in ["a", "b", "c", "d"]:
+            system.test_stage3.big_item(some_arg)
+
+        counts = system.cache.get_counts()
+        self.assertTrue(counts["evictions"] >= 1)
+        # evicted down to 90% of the budget, not just below it
+        self.assertTrue(counts["size_bytes"] <= 0.9 * counts["max_memory_bytes"])
+
+    def test_cache_ref_is_immutable_key(self):
+        cache_ref = cacheRef("stage", "item", "code", flags="x=1", keyname="key")
+        same_cache_ref = cacheRef("stage", "item", "code", flags="x=1", keyname="key")
+        self.assertEqual(cache_ref, same_cache_ref)
+        self.assertEqual(hash(cache_ref), hash(same_cache_ref))
+        self.assertNotEqual(cache_ref, cacheRef("stage", "item", "code"))
+
+        with self.assertRaises(AttributeError):
+            cache_ref.instrument_code = "another_code"
+
+        unpickled_cache_ref = pickle.loads(pickle.dumps(cache_ref))
+        self.assertEqual(cache_ref, unpickled_cache_ref)
+        self.assertEqual("key", unpickled_cache_ref.keyname)
+
+    def test_indices_follow_deletions(self):
+        system = System(
+            [testStage3()],
+            simData(),
+            Config(dict(instruments=["code", "another_code"])),
+        )
+        system.test_stage3.big_item("code")
+        system.test_stage3.big_item("another_code")
+        self.assertEqual(2, len(system.cache.get_cacherefs_for_stage("test_stage3")))
+
+        system.cache.delete_items_for_instrument("code")
+        self.assertEqual(0, len(system.cache.get_cache_refs_for_instrument("code")))
+        cache_refs = system.cache.get_cacherefs_for_stage("test_stage3")
+        self.assertEqual(["another_code"], cache_refs.unique_list_of_instrument_codes())
+
+        system.cache.delete_all_items(delete_protected=True)
+        self.assertEqual(0, len(system.cache.get_cacherefs_for_stage("test_stage3")))
+
+    def test_stats_by_method(self):
+        system = System(
+            [testStage3()],
+            simData(),
+            Config(dict(instruments=["code", "another_code"])),
+        )
+        system.test_stage3.big_item("code")
+        system.test_stage3.big_item("code")
+        system.test_stage3.big_item("another_code")
+        system.test_stage3.sum_of_big_items()
+
+        stats = system.cache.stats()
+        big_item_stats = stats.loc[("test_stage3", "big_item")]
+        # two calls from sum_of_big_items, both hits
+        self.assertEqual(5, big_item_stats.calls)
+        self.assertEqual(3, big_item_stats.hits)
+        self.assertEqual(2, big_item_stats.misses)
+        self.assertAlmostEqual(0.6, big_item_stats.hit_ratio)
+        self.assertEqual(2 * 8000, big_item_stats.result_bytes)
+
+        sum_stats = stats.loc[("test_stage3", "sum_of_big_items")]
+        self.assertEqual(1, sum_stats.misses)
+        self.assertTrue(sum_stats.self_time <= sum_stats.total_time)
+
+        system.cache.reset_counts()
+        self.assertEqual(0, len(system.cache.stats()))
+
+    def test_pickle_and_copy_cache(self):
+        system = System([testStage1()], simData(), Config(dict(instruments=["code"])))
+        system.test_stage1.single_instrument_no_keywords("code")
+        system.test_stage1.across_markets_no_keywords()
+
+        for cache_copy in [
+            pickle.loads(pickle.dumps(system.cache)),
+            copy.deepcopy(system.cache),
+        ]:
+            self.assertEqual(
+                sorted(repr(cache_ref) for cache_ref in system.cache.keys()),
+                sorted(repr(cache_ref) for cache_ref in cache_copy.keys()),
+            )
+            self.assertEqual(system.cache.total_size_bytes, cache_copy.total_size_bytes)
+            cache_refs = cache_copy.get_cacherefs_for_stage("test_stage1")
+            self.assertEqual(2, len(cache_refs))
+
+            # still works
+            cache_copy.delete_items_for_stage("test_stage1")
+            self.assertEqual(0, len(cache_copy.get_cacherefs_for_stage("test_stage1")))
+            self.assertEqual(
+                2, len(system.cache.get_cacherefs_for_stage("test_stage1"))
+            )
+
+
+class testStage3(SystemStage):
+    @property
+    def name(self):
+        return "test_stage3"
+
+    @diagnostic()
+    def big_item(self, some_arg):
+        return np.zeros(1000)
+
+    @diagnostic(protected=True)
+    def big_protected_item(self):
+        return np.zeros(1000)
+
+    @diagnostic()
+    def sum_of_big_items(self):
+        return self.big_item("code").sum() + self.big_item("another_code").sum()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+import pandas as pd
+
+from systems.basesystem import System
+from systems.forecast_combine import forecastEstimationGroup
+from systems.tests.testdata import (
+    get_test_object_futures_with_pos_sizing_estimates,
+)
+
+
+def _system(use_pooled_costs: bool) -> System:
+    (
+        accounts,
+        posobject,
+        combobject,
+        capobject,
+        rules,
+        rawdata,
+        data,
+        config,
+    ) = get_test_object_futures_with_pos_sizing_estimates()
+    # no data for BUND
+    config.instruments = ["EDOLLAR", "US10"]
+    system = System(
+        [accounts, posobject, combobject, capobject, rules, rawdata], data, config
+    )
+    system.config.forecast_weight_estimate["method"] = "shrinkage"
+    system.config.forecast_cost_estimates["use_pooled_costs"] = use_pooled_costs
+    system.config.forecast_cost_estimates["use_pooled_turnover"] = False
+
+    return system
+
+
+def test_group_is_canonical():
+    group = forecastEstimationGroup.from_lists(["US10", "EDOLLAR"], ["ewmac8", "carry"])
+
+    assert group == forecastEstimationGroup.from_lists(
+        ["EDOLLAR", "US10"], ["carry", "ewmac8"]
+    )
+    assert str(group) == "EDOLLAR/US10: carry/ewmac8"
+
+
+def test_pooled_estimates_shared_across_group():
+    system = _system(use_pooled_costs=True)
+    combForecast = system.combForecast
+
+    weights = dict(
+        [
+            (code, combForecast.get_monthly_raw_forecast_weights_estimated(code))
+            for code in ["EDOLLAR", "US10"]
+        ]
+    )
+    correlations = dict(
+        [
+            (code, combForecast.get_forecast_correlation_matrices(code))
+            for code in ["EDOLLAR", "US10"]
+        ]
+    )
+
+    stats = system.cache.stats()
+    weight_stats = stats.loc[
+        ("combForecast", "get_raw_estimated_monthly_forecast_weights_for_group")
+    ]
+    correlation_stats = stats.loc[
+        ("combForecast", "get_forecast_correlation_matrices_for_group")
+    ]
+    assert (weight_stats.misses, weight_stats.hits) == (1, 1)
+    assert (correlation_stats.misses, correlation_stats.hits) == (1, 1)
+    assert correlations["EDOLLAR"] is correlations["US10"]
+
+    # same as estimating each instrument on its own
+    for code in ["EDOLLAR", "US10"]:
+        optimiser = combForecast.calculation_of_raw_estimated_monthly_forecast_weights(
+            code
+        )
+        expected = optimiser.weights()[weights[code].columns]
+        pd.testing.assert_frame_equal(weights[code], expected)
+
+
+def test_unpooled_costs_estimated_by_instrument():
+    system = _system(use_pooled_costs=False)
+    system.combForecast.get_monthly_raw_forecast_weights_estimated("EDOLLAR")
+
+    assert (
+        "combForecast",
+        "get_raw_estimated_monthly_forecast_weights_for_group",
+    ) not in system.cache.stats().index
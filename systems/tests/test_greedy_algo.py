@@ -0,0 +1,66 @@
+import numpy as np
+
+from syscore.objects import arg_not_supplied
+
+from sysquant.estimators.covariance import covarianceEstimate
+from sysquant.estimators.mean_estimator import meanEstimates
+from sysquant.optimisation.weights import portfolioWeights
+from systems.provided.dynamic_small_system_optimise.buffering import (
+    speedControlForDynamicOpt,
+)
+from systems.provided.dynamic_small_system_optimise.greedy_algo import (
+    greedy_algo_across_integer_values,
+    greedy_algo_across_integer_values_with_loop,
+)
+from systems.provided.dynamic_small_system_optimise.optimisation import (
+    objectiveFunctionForGreedy,
+)
+
+
+def _random_objective(
+    seed: int, count_assets: int = 30, with_prior_positions: bool = True
+) -> objectiveFunctionForGreedy:
+    random = np.random.default_rng(seed)
+    keys = ["asset%d" % i for i in range(count_assets)]
+
+    stdev = random.uniform(0.05, 0.5, count_assets)
+    factors = random.normal(size=(count_assets, 3))
+    corr = factors.dot(factors.T) + np.diag(random.uniform(0.5, 2.0, count_assets))
+    corr = corr / np.sqrt(np.outer(np.diag(corr), np.diag(corr)))
+    covariance = covarianceEstimate(np.outer(stdev, stdev) * corr, columns=keys)
+
+    def _weights(values) -> portfolioWeights:
+        return portfolioWeights.from_weights_and_keys(
+            list_of_keys=keys, list_of_weights=list(values)
+        )
+
+    if with_prior_positions:
+        previous_positions = _weights(random.integers(-3, 4, count_assets))
+    else:
+        previous_positions = arg_not_supplied
+
+    return objectiveFunctionForGreedy(
+        contracts_optimal=_weights(random.normal(0, 2, count_assets)),
+        covariance_matrix=covariance,
+        per_contract_value=_weights(random.uniform(0.01, 0.2, count_assets)),
+        costs=meanEstimates(zip(keys, random.uniform(0.0001, 0.002, count_assets))),
+        speed_control=speedControlForDynamicOpt(
+            trade_shadow_cost=10, tracking_error_buffer=0.0
+        ),
+        previous_positions=previous_positions,
+    )
+
+
+def test_same_solution_as_full_evaluation():
+    for seed in range(20):
+        for with_prior_positions in [True, False]:
+            objective = _random_objective(
+                seed, with_prior_positions=with_prior_positions
+            )
+            solution = greedy_algo_across_integer_values(objective)
+            solution_with_loop = greedy_algo_across_integer_values_with_loop(
+                objective
+            )
+
+            assert np.array_equal(solution, solution_with_loop)
+            assert not np.all(solution == 0)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from syscore.dateutils import Frequency
+from systems.accounts.pandl_calculators.pandl_calculation import (
+    pandlCalculation,
+    last_value_in_each_business_day,
+)
+
+
+def _prices() -> pd.Series:
+    random_state = np.random.RandomState(7)
+    # intraday, and some weekend, timestamps
+    dates = pd.date_range("2020-01-01", periods=400, freq="7h")
+    prices = pd.Series(
+        100 + random_state.normal(size=len(dates)).cumsum(), index=dates, name="price"
+    )
+    prices[random_state.rand(len(dates)) < 0.1] = np.nan
+
+    return prices
+
+
+def _positions() -> pd.Series:
+    dates = pd.bdate_range("2019-12-30", periods=20, freq="4B")
+    positions = pd.Series(np.arange(20.0) - 10.0, index=dates)
+    # two positions on the same date
+    positions = pd.concat([positions, positions[5:6] * 2]).sort_index()
+
+    return positions
+
+
+def test_last_value_in_each_business_day():
+    prices = _prices()
+    prices[:3] = np.nan
+    expected = prices.resample("B").last()
+    result = last_value_in_each_business_day(prices)
+
+    pd.testing.assert_series_equal(result, expected, check_freq=False)
+
+
+def test_pandl_same_as_pandas():
+    prices = _prices()
+    positions = _positions()
+    fx = pd.Series(1.2, index=pd.bdate_range("2019-12-01", periods=100, freq="W"))
+    capital = pd.Series(1000.0, index=prices.index[::50])
+    calculator = pandlCalculation(
+        prices, positions=positions, fx=fx, capital=capital, value_per_point=5.0
+    )
+
+    price_returns = prices.ffill().diff()
+    pos_series = positions.groupby(positions.index).last()
+    pos_series = pos_series.reindex(price_returns.index, method="ffill")
+    expected_points = pos_series.shift(1) * price_returns
+    expected_points[expected_points.isna()] = 0.0
+    expected_base = 5.0 * expected_points * fx.reindex(prices.index, method="ffill")
+    expected_percent = (
+        100.0 * expected_base / capital.reindex(prices.index, method="ffill")
+    )
+
+    pd.testing.assert_series_equal(calculator.pandl_in_points(), expected_points)
+    pd.testing.assert_series_equal(calculator.pandl_in_base_currency(), expected_base)
+    pd.testing.assert_series_equal(calculator.percentage_pandl(), expected_percent)
+
+    weighted = calculator.weight(pd.Series(0.5, index=positions.index.unique()))
+    pd.testing.assert_series_equal(
+        weighted.pandl_in_base_currency(), expected_base * 0.5
+    )
+
+    daily = calculator.as_pd_series_for_frequency(Frequency.BDay, percent=True)
+    expected_daily = expected_percent.cumsum().resample("B").last().ffill().diff()
+    expected_daily[expected_percent.cumsum().resample("B").last().isna()] = np.nan
+    pd.testing.assert_series_equal(daily, expected_daily, check_freq=False)
@@ -0,0 +1,197 @@
+import os
+import shutil
+
+import pandas as pd
+
+from syscore.fileutils import get_filename_for_package
+from systems.stage import SystemStage
+from systems.basesystem import System
+from systems.forecasting import Rules
+from systems.rawdata import RawData
+from systems.system_cache import diagnostic, cacheElement
+from systems.persistent_cache import persistentCacheStore
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from sysdata.config.configdata import Config
+
+
+class countingStage(SystemStage):
+    def __init__(self):
+        self.call_count = 0
+        self._capital = None
+
+    @property
+    def name(self):
+        return "counting_stage"
+
+    @diagnostic()
+    def price_length(self, instrument_code):
+        self.call_count += 1
+        return len(self.parent.data.get_raw_price(instrument_code))
+
+    @diagnostic()
+    def vol_target_times_length(self, instrument_code):
+        return self.parent.config.percentage_vol_target * self.price_length(
+            instrument_code
+        )
+
+    @property
+    def capital(self):
+        # read once and kept, as stages often do
+        if self._capital is None:
+            self._capital = self.parent.config.notional_trading_capital
+
+        return self._capital
+
+    @diagnostic()
+    def capital_times_length(self, instrument_code):
+        return self.capital * self.price_length(instrument_code)
+
+
+RULE_CALLS = []
+
+
+def counting_rule(price):
+    RULE_CALLS.append(price.name)
+    return price.diff()
+
+
+def _system_with_persistent_cache(directory: str, persistent: bool = True):
+    config = Config(
+        dict(
+            instruments=["EDOLLAR", "US10"],
+            system_cache=dict(persistent=persistent, directory=directory),
+        )
+    )
+
+    return System([countingStage()], csvFuturesSimData(), config)
+
+
+def _system_with_counting_rule(directory: str, adjusted_prices_path: str):
+    config = Config(
+        dict(
+            instruments=["EDOLLAR", "US10"],
+            trading_rules=dict(
+                counting=dict(
+                    function="systems.tests.test_persistent_cache.counting_rule",
+                    data=["rawdata.get_daily_prices"],
+                )
+            ),
+            system_cache=dict(persistent=True, directory=directory),
+        )
+    )
+    data = csvFuturesSimData(
+        csv_data_paths=dict(csvFuturesAdjustedPricesData=adjusted_prices_path)
+    )
+
+    return System([RawData(), Rules()], data, config)
+
+
+def _copy_adjusted_prices(adjusted_prices_path: str):
+    os.makedirs(adjusted_prices_path)
+    for instrument_code in ["EDOLLAR", "US10"]:
+        filename = instrument_code + ".csv"
+        shutil.copy(
+            get_filename_for_package("data.futures.adjusted_prices_csv", filename),
+            os.path.join(adjusted_prices_path, filename),
+        )
+
+
+def _drop_last_price(adjusted_prices_path: str, instrument_code: str):
+    filename = os.path.join(adjusted_prices_path, instrument_code + ".csv")
+    prices = pd.read_csv(filename)
+    prices[:-1].to_csv(filename, index=False)
+
+
+class TestPersistentCache:
+    def test_items_loaded_in_later_run(self, tmp_path):
+        directory = str(tmp_path)
+
+        first_system = _system_with_persistent_cache(directory)
+        first_length = first_system.counting_stage.price_length("US10")
+        assert first_system.counting_stage.call_count == 1
+
+        second_system = _system_with_persistent_cache(directory)
+        assert second_system.counting_stage.price_length("US10") == first_length
+        assert second_system.counting_stage.call_count == 0
+        assert second_system.cache.get_counts()["persistent_hits"] == 1
+        price_length_stats = second_system.cache.stats().loc[
+            ("counting_stage", "price_length")
+        ]
+        assert (price_length_stats.persistent_hits, price_length_stats.misses) == (1, 0)
+
+        second_system.counting_stage.price_length("EDOLLAR")
+        assert second_system.counting_stage.call_count == 1
+
+    def test_config_change_invalidates(self, tmp_path):
+        directory = str(tmp_path)
+
+        first_system = _system_with_persistent_cache(directory)
+        first_system.counting_stage.vol_target_times_length("US10")
+
+        changed_system = _system_with_persistent_cache(directory)
+        changed_system.config.percentage_vol_target = 25.0
+        assert changed_system.counting_stage.vol_target_times_length("US10") == (
+            25.0 * first_system.counting_stage.price_length("US10")
+        )
+        # price_length doesn't read percentage_vol_target, so is loaded from disk
+        assert changed_system.counting_stage.call_count == 0
+
+    def test_config_kept_by_stage_change_invalidates(self, tmp_path):
+        directory = str(tmp_path)
+
+        first_system = _system_with_persistent_cache(directory)
+        first_system.counting_stage.capital_times_length("EDOLLAR")
+        # doesn't read notional_trading_capital from the config again
+        first_system.counting_stage.capital_times_length("US10")
+
+        changed_system = _system_with_persistent_cache(directory)
+        changed_system.config.notional_trading_capital = 1000.0
+        assert changed_system.counting_stage.capital_times_length("US10") == (
+            1000.0 * first_system.counting_stage.price_length("US10")
+        )
+
+    def test_new_data_only_invalidates_that_instrument(self, tmp_path):
+        directory = str(tmp_path / "cache")
+        adjusted_prices_path = str(tmp_path / "adjusted_prices")
+        _copy_adjusted_prices(adjusted_prices_path)
+
+        first_system = _system_with_counting_rule(directory, adjusted_prices_path)
+        for instrument_code in ["EDOLLAR", "US10"]:
+            first_system.rules.get_raw_forecast(instrument_code, "counting")
+        assert len(RULE_CALLS) == 2
+
+        _drop_last_price(adjusted_prices_path, "US10")
+        del RULE_CALLS[:]
+
+        second_system = _system_with_counting_rule(directory, adjusted_prices_path)
+        edollar_forecast = second_system.rules.get_raw_forecast("EDOLLAR", "counting")
+        us10_forecast = second_system.rules.get_raw_forecast("US10", "counting")
+
+        # only the US10 forecast is calculated again
+        assert len(RULE_CALLS) == 1
+        pd.testing.assert_series_equal(
+            edollar_forecast, first_system.rules.get_raw_forecast("EDOLLAR", "counting")
+        )
+        assert not us10_forecast.equals(
+            first_system.rules.get_raw_forecast("US10", "counting")
+        )
+
+    def test_switched_off(self, tmp_path):
+        directory = str(tmp_path)
+
+        system = _system_with_persistent_cache(directory, persistent=False)
+        system.counting_stage.price_length("US10")
+
+        assert os.listdir(directory) == []
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        store = persistentCacheStore(str(tmp_path), max_size_bytes=3500)
+        for key in ["a", "b", "c"]:
+            store.write(key, cacheElement("x" * 1000))
+            os.utime(store._filename(key), (0, dict(a=1, b=2, c=3)[key]))
+        store.read("a")
+
+        store.write("d", cacheElement("x" * 1000))
+
+        remaining = sorted(os.listdir(str(tmp_path)))
+        assert remaining == ["a.pck", "c.pck", "d.pck"]
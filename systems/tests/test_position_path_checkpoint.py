@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+
+from sysquant.optimisation.weights import portfolioWeights
+from systems.provided.dynamic_small_system_optimise.position_path_checkpoint import (
+    positionPathCheckpoint,
+    noPositionPathCheckpoint,
+)
+
+
+def _dates(count: int) -> list:
+    return list(pd.bdate_range("2020-01-01", periods=count))
+
+
+def _positions(count: int) -> list:
+    return [portfolioWeights(dict(US10=float(i), EDOLLAR=-float(i))) for i in range(count)]
+
+
+class TestPositionPathCheckpoint:
+    def test_save_and_resume(self, tmp_path):
+        filename = os.path.join(str(tmp_path), "checkpoint.pck")
+        checkpoint = positionPathCheckpoint(filename)
+        all_dates = _dates(10)
+
+        assert checkpoint.load(all_dates) == []
+
+        checkpoint.save(all_dates[:4], _positions(4))
+        loaded_positions = checkpoint.load(all_dates)
+        assert loaded_positions == _positions(4)
+        assert isinstance(loaded_positions[-1], portfolioWeights)
+
+        checkpoint.delete()
+        assert not os.path.exists(filename)
+        assert checkpoint.load(all_dates) == []
+
+    def test_ignored_if_dates_dont_match(self, tmp_path):
+        checkpoint = positionPathCheckpoint(
+            os.path.join(str(tmp_path), "checkpoint.pck")
+        )
+        checkpoint.save(_dates(12)[2:6], _positions(4))
+
+        assert checkpoint.load(_dates(10)) == []
+
+    def test_switched_off(self):
+        checkpoint = noPositionPathCheckpoint()
+        checkpoint.save(_dates(4), _positions(4))
+
+        assert checkpoint.load(_dates(4)) == []
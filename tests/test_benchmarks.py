@@ -0,0 +1,151 @@
+"""
+Benchmarks of vectorised code paths against the original implementations
+
+These are slow, and will be skipped unless run with 'pytest --runslow'
+"""
+
+import timeit
+
+import pytest
+
+from syscore.algos import apply_buffer_to_list_of_positions, _apply_buffer_with_loop
+from syscore.merge_data import (
+    merge_newer_data,
+    merge_newer_data_given_spike_check_state,
+    spikeCheckState,
+)
+from syscore.tests.test_buffering import _position_and_buffers
+from syscore.tests.test_spike_check import _prices
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysobjects.adjusted_prices import _panama_stitch, _panama_stitch_with_loop
+from systems.provided.dynamic_small_system_optimise.greedy_algo import (
+    greedy_algo_across_integer_values,
+    greedy_algo_across_integer_values_with_loop,
+)
+from systems.tests.test_greedy_algo import _random_objective
+
+
+def _print_benchmark(name: str, original_time: float, new_time: float):
+    print(
+        "%s: original %.4fs, new %.4fs, speedup %.1fx"
+        % (name, original_time, new_time, original_time / new_time)
+    )
+
+
+class TestBenchmarks:
+    @pytest.mark.slow
+    def test_benchmark_panama_stitch(self):
+        multiple_prices = csvFuturesMultiplePricesData().get_multiple_prices("US10")
+
+        loop_time = timeit.timeit(
+            lambda: _panama_stitch_with_loop(multiple_prices), number=1
+        )
+        vectorised_time = timeit.timeit(
+            lambda: _panama_stitch(multiple_prices), number=1
+        )
+
+        _print_benchmark(
+            "Panama stitch of %d rows" % len(multiple_prices),
+            original_time=loop_time,
+            new_time=vectorised_time,
+        )
+        assert vectorised_time < loop_time
+
+    @pytest.mark.slow
+    def test_benchmark_greedy_algo(self):
+        objective = _random_objective(seed=0, count_assets=150)
+
+        loop_time = timeit.timeit(
+            lambda: greedy_algo_across_integer_values_with_loop(objective), number=1
+        )
+        incremental_time = timeit.timeit(
+            lambda: greedy_algo_across_integer_values(objective), number=1
+        )
+
+        _print_benchmark(
+            "Greedy optimisation of 150 assets",
+            original_time=loop_time,
+            new_time=incremental_time,
+        )
+        assert incremental_time < loop_time
+
+    @pytest.mark.slow
+    def test_benchmark_apply_buffer(self):
+        list_of_inputs = [_position_and_buffers(seed, 8000) for seed in range(50)]
+        list_of_optimal_positions = [inputs[0] for inputs in list_of_inputs]
+        list_of_pos_buffers = [inputs[1] for inputs in list_of_inputs]
+
+        loop_time = timeit.timeit(
+            lambda: [
+                _apply_buffer_with_loop(
+                    optimal_position, pos_buffers, roundpositions=True
+                )
+                for optimal_position, pos_buffers in list_of_inputs
+            ],
+            number=1,
+        )
+        array_time = timeit.timeit(
+            lambda: apply_buffer_to_list_of_positions(
+                list_of_optimal_positions, list_of_pos_buffers, roundpositions=True
+            ),
+            number=1,
+        )
+
+        _print_benchmark(
+            "Buffering 50 instruments over 8000 days",
+            original_time=loop_time,
+            new_time=array_time,
+        )
+        assert array_time < loop_time
+
+    @pytest.mark.slow
+    def test_benchmark_spike_check(self):
+        prices = _prices(50000)
+        old_prices = prices.iloc[:-24]
+        new_prices = prices.iloc[-48:]
+        spike_check_state = spikeCheckState.from_data(old_prices.FINAL)
+
+        full_history_time = timeit.timeit(
+            lambda: merge_newer_data(old_prices, new_prices, column_to_check="FINAL"),
+            number=1,
+        )
+        state_time = timeit.timeit(
+            lambda: merge_newer_data_given_spike_check_state(
+                new_prices, spike_check_state, column_to_check="FINAL"
+            ),
+            number=1,
+        )
+
+        _print_benchmark(
+            "Spike check of 24 new rows after 50000 rows",
+            original_time=full_history_time,
+            new_time=state_time,
+        )
+        assert state_time < full_history_time
+
+    @pytest.mark.slow
+    def test_benchmark_parquet_multiple_prices(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        from sysdata.parquet.parquet_multiple_prices import (
+            parquetFuturesMultiplePricesData,
+        )
+
+        csv_multiple_prices = csvFuturesMultiplePricesData()
+        parquet_multiple_prices = parquetFuturesMultiplePricesData(str(tmp_path))
+        parquet_multiple_prices.add_multiple_prices(
+            "US10", csv_multiple_prices.get_multiple_prices("US10")
+        )
+
+        csv_time = timeit.timeit(
+            lambda: csv_multiple_prices.get_multiple_prices("US10"), number=10
+        )
+        parquet_time = timeit.timeit(
+            lambda: parquet_multiple_prices.get_multiple_prices("US10"), number=10
+        )
+
+        _print_benchmark(
+            "Reading multiple prices 10 times from .csv and Parquet",
+            original_time=csv_time,
+            new_time=parquet_time,
+        )
+        assert parquet_time < csv_time